@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark news page extraction: BeautifulSoup html.parser vs lxml.
+
+Usage:
+    python benchmarks/extract_bench.py [page.html ...]
+
+Without arguments a synthetic index and article page are generated.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tweeter.extract import extract_article, extract_post_links
+
+SITE_URL = "https://kingston-herald.legitreal.com"
+
+
+def legacy_post_links(content: bytes) -> list:
+    """The original QueryAgent index parsing."""
+    soup = BeautifulSoup(content, "html.parser")
+    return [SITE_URL + link.get("href") for link in soup.select('a[href^="/post"]')]
+
+
+def legacy_article(content: bytes) -> str:
+    """The original QueryAgent article parsing."""
+    soup = BeautifulSoup(content, "html.parser")
+    article = ""
+    for paragraph in soup.select("p"):
+        article += "\n" + paragraph.get_text()
+    return article
+
+
+def synthetic_page(links: int = 500, paragraphs: int = 500) -> bytes:
+    """A large page with navigation, article links and body paragraphs."""
+    nav = "".join(
+        f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(links // 5)
+    )
+    posts = "".join(
+        f'<div class="card"><a href="/post/{i}.html"><h2>Headline {i}</h2></a>'
+        f"<span>by Staff</span></div>"
+        for i in range(links)
+    )
+    body = "".join(
+        f"<p>Paragraph {i} about the <b>election</b>, tourism and the "
+        f"<a href='/tag/{i}'>coast guard</a> budget in Kingston.</p>"
+        for i in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Kingston Herald</title></head><body>"
+        f"<nav><ul>{nav}</ul></nav><main>{posts}<article>{body}</article></main>"
+        f"</body></html>"
+    ).encode()
+
+
+def bench(name: str, content: bytes, number: int = 20) -> None:
+    cases = [
+        ("post links", legacy_post_links, lambda c: extract_post_links(c, SITE_URL)),
+        ("article", legacy_article, extract_article),
+    ]
+    print(f"{name} ({len(content) / 1024:.0f} KiB)")
+    for label, legacy, current in cases:
+        if legacy(content) != current(content):
+            print(f"  {label}: WARNING outputs differ")
+        legacy_time = min(timeit.repeat(lambda: legacy(content), number=number, repeat=3))
+        current_time = min(timeit.repeat(lambda: current(content), number=number, repeat=3))
+        print(
+            f"  {label:<10} bs4 {legacy_time / number * 1000:8.2f} ms   "
+            f"lxml {current_time / number * 1000:8.2f} ms   "
+            f"{legacy_time / current_time:5.1f}x"
+        )
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            bench(path, Path(path).read_bytes())
+    else:
+        bench("synthetic page", synthetic_page())
+
+
+if __name__ == "__main__":
+    main()
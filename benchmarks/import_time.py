@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Profile the cold-start import cost of the bot.
+
+Usage:
+    python benchmarks/import_time.py [module ...] [--runs N] [--top N]
+
+Each module (default: main) is imported in a fresh interpreter with
+``-X importtime``. Prints the median wall time, the slowest imports by
+cumulative time, and which heavy dependencies were loaded eagerly.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies that should only load once they are used
+HEAVY = [
+    "langchain",
+    "langchain_google_genai",
+    "twooter",
+    "bs4",
+    "requests",
+    "aiohttp",
+    "numpy",
+    "lxml",
+    "cryptography",
+]
+
+
+def profile(module: str) -> tuple:
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        (total microseconds, [(cumulative us, name)], heavy modules loaded)
+    """
+    code = (
+        f"import sys; sys.path[:0] = [{str(ROOT)!r}, {str(ROOT / 'src')!r}]; "
+        f"import {module}; "
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    # The requested module is the last import to finish
+    total = next(us for us, name in reversed(imports) if name.strip() == module)
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return total, imports, heavy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["main"])
+    parser.add_argument("--runs", type=int, default=5, help="imports to take the median of")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [profile(module) for _ in range(args.runs)]
+        totals = [total for total, _, _ in runs]
+        _, imports, heavy = runs[-1]
+
+        print(f"{module}: median {statistics.median(totals) / 1000:.1f} ms "
+              f"over {args.runs} runs (min {min(totals) / 1000:.1f} ms)")
+        print(f"  heavy dependencies loaded: {', '.join(heavy) or 'none'}")
+        print("  slowest imports (cumulative):")
+        for cumulative, name in sorted(imports, reverse=True)[: args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Simple runner script for rubber-duckers."""
 
+import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -9,9 +11,24 @@ src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
 # Import and run
-from main import run_bot
+from main import run_bot, run_worker
 import asyncio
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(run_bot())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes to shard bots.json accounts across (default: 1)",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from src.scheduling import Supervisor
+
+        logging.basicConfig(level=logging.INFO)
+        exit_code = Supervisor(run_worker, workers=args.workers).run()
+    else:
+        exit_code = asyncio.run(run_bot())
     sys.exit(exit_code)
@@ -1,5 +1,7 @@
 """For providing tweeter accounts for sign in and usage"""
 
-from .loader import AccountProvider
+from .account import Account
+from .loader import AccountProvider, NoAccountAvailable
+from .session_store import SessionStore
 
-__all__ = ["AccountProvider"]
+__all__ = ["Account", "AccountProvider", "NoAccountAvailable", "SessionStore"]
@@ -0,0 +1,39 @@
+"""A single bot account and its login state"""
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from src.config.schemas import BotAccount
+
+if TYPE_CHECKING:
+    from twooter import Twooter
+
+
+@dataclass
+class Account:
+    """A bot account from bots.json, with its client once logged in."""
+
+    username: str
+    bot: BotAccount
+    tweeter: Optional["Twooter"] = None
+    in_use: bool = False
+    healthy: bool = True
+    lease_count: int = 0
+    busy_seconds: float = 0.0
+    leased_at: Optional[float] = None
+    registered_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the account has logged in."""
+        return self.tweeter is not None
+
+    def utilisation(self) -> float:
+        """Fraction of time since registration spent leased out."""
+        now = time.monotonic()
+        busy = self.busy_seconds
+        if self.in_use and self.leased_at is not None:
+            busy += now - self.leased_at
+        elapsed = now - self.registered_at
+        return busy / elapsed if elapsed > 0 else 0.0
@@ -1,140 +1,468 @@
 """Loads keys form the json"""
 
-import json
 import asyncio
-from typing import Optional, List
-from pathlib import Path
-import twooter.sdk
-from twooter import Twooter
-from time import sleep
+import functools
+import itertools
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Collection, Dict, Optional, List, Sequence
+import time
 import random
+from src.config.schemas import BotAccount
+from .account import Account
+from .session_store import SessionStore
+
+if TYPE_CHECKING:
+    from twooter import Twooter
+
+
+class NoAccountAvailable(RuntimeError):
+    """No account can be leased, now or after waiting, e.g. all are excluded."""
 
 
 class AccountProvider:
-    def __init__(self):
+    def __init__(
+        self,
+        bot_accounts: Sequence[BotAccount] = (),
+        invite_code: Optional[str] = None,
+        session_store: Optional[SessionStore] = None,
+        session_expiry_margin: int = 300,
+        login_concurrency: int = 8,
+        login_max_attempts: int = 5,
+        login_backoff_base: float = 2.0,
+        login_backoff_max: float = 60.0,
+        lazy: bool = False,
+        warm_accounts: int = 2,
+        fanout_activations: int = 2,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ):
+        """
+        Args:
+            bot_accounts: Accounts from bots.json
+            invite_code: Invite code from .env the accounts sign up with
+            session_store: Where sessions are persisted for reuse across restarts
+            session_expiry_margin: Seconds before expiry at which a stored session
+                is no longer trusted
+            login_concurrency: Maximum logins running at the same time
+            login_max_attempts: Login attempts before an account is quarantined
+            login_backoff_base: Delay in seconds after the first failed login,
+                doubled on each further failure
+            login_backoff_max: Upper bound on the delay between login attempts
+            lazy: Only log in the warm accounts at startup, the rest on first use
+            warm_accounts: Accounts logged in at startup in lazy mode
+            fanout_activations: Accounts not yet active that each like/repost
+                fan-out logs in, so logins are spread over time in lazy mode
+            shard_index: This worker's shard when accounts are split across processes
+            shard_count: Number of worker processes sharing bots.json
+        """
         # loads bots
-        self.person_index = 0
         self._bots = []
+        self._accounts: List[Account] = []
+        self._activation_locks: Dict[str, asyncio.Lock] = {}
+        # Idle accounts by username, least recently released first
+        self._idle: "OrderedDict[str, Account]" = OrderedDict()
+        self._pool_condition = asyncio.Condition()
+        # Background re-logins for accounts whose session was rejected
+        self._relogin_tasks: Dict[str, asyncio.Task] = {}
+        self._bot_accounts = tuple(bot_accounts)
+        self._invite_code = invite_code
+        self.lazy = lazy
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.warm_accounts = warm_accounts
+        self.fanout_activations = fanout_activations
+        self.session_store = session_store
+        self.session_expiry_margin = session_expiry_margin
+        self.login_max_attempts = login_max_attempts
+        self.login_backoff_base = login_backoff_base
+        self.login_backoff_max = login_backoff_max
+        # Accounts that never logged in, by username, with the last error
+        self.quarantined: Dict[str, str] = {}
+        # The SDK is blocking, so logins run here to actually overlap
+        self._login_executor = ThreadPoolExecutor(
+            max_workers=login_concurrency, thread_name_prefix="account-login"
+        )
+        # The SDK only reads tokens from its own sqlite file, which it writes
+        # in plaintext. With sessions kept encrypted in the session store,
+        # that file lives in a private directory, memory-backed where
+        # possible, that is deleted on close or exit.
+        self._tokens_dir: Optional[str] = None
+        if session_store is not None:
+            self._tokens_dir = tempfile.mkdtemp(
+                prefix="twooter-tokens-",
+                dir="/dev/shm" if os.path.isdir("/dev/shm") else None,
+            )
+            self._remove_tokens_dir = weakref.finalize(
+                self, shutil.rmtree, self._tokens_dir, True
+            )
 
     async def initialize(self):
-        """Async initialization method that loads and logs in all bots."""
-        # Load bot accounts from bots.json
-        with open("bots.json", "r") as f:
-            data = json.load(f)
-
-        # Load invite code from .env
-        invite_code = self._load_invite_code_from_env()
-        if not invite_code:
+        """Async initialization method that logs in all bots."""
+        if not self._invite_code:
             raise ValueError("No INVITE_CODE found in .env file")
 
-        # Create bot instances from bots.json data
-        bots_data = data["bots"]
         print("logging into accounts")
-        
-        # Create list of valid bot data
-        valid_bot_data = []
-        for bot_data in bots_data:
-            if all(
-                key in bot_data for key in ["user_name", "password", "display_name"]
-            ):
-                valid_bot_data.append(bot_data)
-            else:
-                print(
-                    f"Warning: Bot entry missing required fields (user_name, password, display_name): {bot_data}"
-                )
-
-        if not valid_bot_data:
+        bot_accounts = self._bot_accounts
+        if not bot_accounts:
             raise ValueError("No valid bot entries found in bots.json")
 
-        # Login to all bots concurrently
-        login_tasks = [
-            self._login_bot(bot_data, invite_code) for bot_data in valid_bot_data
-        ]
-        self._bots = await asyncio.gather(*login_tasks)
+        # Each worker process owns every shard_count-th account
+        if self.shard_count > 1:
+            bot_accounts = bot_accounts[self.shard_index :: self.shard_count]
+            if not bot_accounts:
+                raise ValueError(f"No bot accounts left for shard {self.shard_index}")
+            print(
+                f"shard {self.shard_index}/{self.shard_count} owns "
+                f"{len(bot_accounts)} accounts"
+            )
+
+        # Register every account, but in lazy mode only log in the warm subset
+        self._accounts = [Account(username=bot.user_name, bot=bot) for bot in bot_accounts]
+        self._activation_locks = {
+            account.username: asyncio.Lock() for account in self._accounts
+        }
+        self._idle = OrderedDict(
+            (account.username, account) for account in self._accounts
+        )
+        startup_accounts = (
+            self._accounts[: self.warm_accounts] if self.lazy else self._accounts
+        )
+
+        # Login concurrently, bounded by the login executor
+        start_time = time.perf_counter()
+        await asyncio.gather(*(self._activate(account) for account in startup_accounts))
+        elapsed = time.perf_counter() - start_time
+
+        if self.quarantined:
+            print(
+                f"Quarantined {len(self.quarantined)} accounts that failed to log in: "
+                f"{', '.join(self.quarantined)}"
+            )
+        if not self._bots:
+            raise ValueError("No bot accounts could be logged in")
 
         print(
-            f"Loaded {len(self._bots)} bot accounts from bots.json with invite code from .env"
+            f"Loaded {len(self._bots)} of {len(self._accounts)} bot accounts from bots.json "
+            f"with invite code from .env (ready in {elapsed:.1f}s)"
         )
 
-    async def _login_bot(self, bot_data: dict, invite_code: str) -> Twooter:
-        """Login to a single bot account with retry logic."""
-        tweeter = twooter.sdk.new()
+    async def _activate(self, account: Account) -> bool:
+        """Log an account in unless it already is; concurrent callers share one login.
+
+        Returns:
+            True if the account is logged in, False if it is quarantined
+        """
+        async with self._activation_locks[account.username]:
+            if account.is_active:
+                return True
+            if account.username in self.quarantined:
+                return False
+
+            tweeter = await self._login_bot(account.bot, self._invite_code)
+            if tweeter is None:
+                return False
+            account.tweeter = tweeter
+            self._bots.append(tweeter)
+            return True
+
+    async def lease(self, exclude: Collection[str] = ()) -> Account:
+        """Take the least recently used idle account, waiting if all are in use.
+
+        The account is logged in first if it hasn't been yet. It stays out of
+        the pool until passed to release().
+
+        Args:
+            exclude: Usernames that must not be leased, e.g. ones already
+                used in the same thread
+
+        Raises:
+            NoAccountAvailable: If no account can ever become available
+        """
         while True:
-            try:
-                login_result = tweeter.login(
-                    username=bot_data["user_name"],
-                    password=bot_data["password"],
-                    display_name=bot_data["display_name"],
-                    invite_code=invite_code,
+            async with self._pool_condition:
+                while True:
+                    username = next((name for name in self._idle if name not in exclude), None)
+                    if username is not None:
+                        break
+                    if not any(name not in exclude for name in self._relogin_tasks) and not any(
+                        account.in_use
+                        for account in self._accounts
+                        if account.username not in exclude
+                    ):
+                        raise NoAccountAvailable("No bot accounts available to lease")
+                    await self._pool_condition.wait()
+                account = self._idle.pop(username)
+                account.in_use = True
+
+            if await self._activate(account) and account.healthy:
+                account.lease_count += 1
+                account.leased_at = time.monotonic()
+                return account
+
+            # Quarantined, so it never goes back in the pool, or its session
+            # was rejected while it logged in, so the re-login puts it back
+            async with self._pool_condition:
+                account.in_use = False
+                self._pool_condition.notify_all()
+
+    async def release(self, account: Account) -> None:
+        """Return a leased account to the pool as the most recently used."""
+        async with self._pool_condition:
+            if not account.in_use:
+                return
+            if account.leased_at is not None:
+                account.busy_seconds += time.monotonic() - account.leased_at
+                account.leased_at = None
+            account.in_use = False
+            # Unhealthy accounts rejoin the pool once re-logged in
+            if account.healthy:
+                self._idle[account.username] = account
+                # Every waiter, since some may exclude this account
+                self._pool_condition.notify_all()
+
+    @asynccontextmanager
+    async def leased(self, exclude: Collection[str] = ()) -> AsyncIterator[Account]:
+        """Lease an account for the duration of an async with block."""
+        account = await self.lease(exclude)
+        try:
+            yield account
+        finally:
+            await self.release(account)
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-account lease counts and utilisation for monitoring."""
+        return {
+            account.username: {
+                "active": account.is_active,
+                "in_use": account.in_use,
+                "healthy": account.healthy,
+                "lease_count": account.lease_count,
+                "utilisation": round(account.utilisation(), 3),
+            }
+            for account in self._accounts
+        }
+
+    async def fanout_accounts(self) -> List[Account]:
+        """Usable accounts for a like/repost fan-out.
+
+        Up to fanout_activations accounts not yet active are logged in
+        first, so a lazy provider brings in the rest a few at a time instead
+        of all on the first fan-out.
+        """
+        inactive = [
+            account
+            for account in self._accounts
+            if not account.is_active and account.username not in self.quarantined
+        ][: self.fanout_activations]
+        if inactive:
+            await asyncio.gather(*(self._activate(account) for account in inactive))
+        return self._available_accounts()
+
+    def _available_accounts(self) -> List[Account]:
+        """Accounts that are logged in and not waiting on a re-login."""
+        return [
+            account for account in self._accounts if account.is_active and account.healthy
+        ]
+
+    async def report_auth_failure(self, account: Account) -> None:
+        """Take an account out of rotation and re-login in the background.
+
+        Only one re-login runs per account, however many calls fail with it.
+        """
+        async with self._pool_condition:
+            if account.username in self._relogin_tasks:
+                return
+            print(f"Session for {account.username} was rejected, logging in again")
+            account.healthy = False
+            self._idle.pop(account.username, None)
+            self._relogin_tasks[account.username] = asyncio.create_task(
+                self._relogin(account)
+            )
+            # Waiters re-check whether anything can still become available
+            self._pool_condition.notify_all()
+
+    async def _relogin(self, account: Account) -> None:
+        """Replace a rejected session with a fresh login.
+
+        Each round makes up to login_max_attempts attempts. Failed rounds are
+        retried with the same capped exponential backoff as those attempts,
+        since an account that was logged in before is worth getting back.
+        """
+        try:
+            if self.session_store is not None:
+                self.session_store.delete(account.username)
+            for round_number in itertools.count(1):
+                try:
+                    async with self._activation_locks[account.username]:
+                        tweeter = await self._login_bot(account.bot, self._invite_code)
+                        if tweeter is not None:
+                            self._bots = [
+                                tweeter if bot is account.tweeter else bot for bot in self._bots
+                            ]
+                            account.tweeter = tweeter
+                            account.healthy = True
+                            print(f"Re-logged in {account.username}")
+                            return
+                except Exception as e:
+                    print(f"Re-login failed for {account.username}: {e}")
+                # _login_bot quarantines after its last attempt; that is only
+                # for accounts that never logged in
+                self.quarantined.pop(account.username, None)
+                delay = min(
+                    self.login_backoff_base * 2 ** (round_number - 1), self.login_backoff_max
                 )
+                print(f"Retrying re-login for {account.username} in {delay:.0f} seconds")
+                await asyncio.sleep(delay)
+        finally:
+            del self._relogin_tasks[account.username]
+            async with self._pool_condition:
+                if account.healthy and not account.in_use:
+                    self._idle[account.username] = account
+                self._pool_condition.notify_all()
+
+    async def _login_bot(self, bot: BotAccount, invite_code: str) -> Optional["Twooter"]:
+        """Login to a single bot account with retry logic.
+
+        Returns:
+            The logged in client, or None if the account was quarantined
+        """
+        import twooter.sdk
+
+        loop = asyncio.get_running_loop()
+        username = bot.user_name
+
+        new_client = (
+            functools.partial(
+                twooter.sdk.new, tokens_db=os.path.join(self._tokens_dir, "tokens.db")
+            )
+            if self._tokens_dir is not None
+            else twooter.sdk.new
+        )
+        tweeter = await loop.run_in_executor(self._login_executor, new_client)
+        restored = await loop.run_in_executor(
+            self._login_executor, self._restore_session, tweeter, username
+        )
+        if restored:
+            return tweeter
+
+        login_func = functools.partial(
+            tweeter.login,
+            username=username,
+            password=bot.password,
+            display_name=bot.display_name,
+            invite_code=invite_code,
+        )
+        for attempt in range(1, self.login_max_attempts + 1):
+            try:
+                login_result = await loop.run_in_executor(self._login_executor, login_func)
                 break
             except Exception as e:
-                print(f"Login failed for {bot_data['user_name']}, retrying in 10 seconds: {e}")
-                await asyncio.sleep(20)
-        
+                if attempt == self.login_max_attempts:
+                    print(f"Login failed for {username} after {attempt} attempts, quarantining: {e}")
+                    self.quarantined[username] = str(e)
+                    return None
+                delay = min(
+                    self.login_backoff_base * 2 ** (attempt - 1), self.login_backoff_max
+                )
+                print(
+                    f"Login failed for {username} (attempt {attempt}/{self.login_max_attempts}), "
+                    f"retrying in {delay:.0f} seconds: {e}"
+                )
+                await asyncio.sleep(delay)
+
+        self._save_session(username, login_result)
         return tweeter
 
-    def _load_invite_code_from_env(self) -> Optional[str]:
-        """Load invite code from .env file."""
-        env_file = Path(".env")
-        if not env_file.exists():
-            return None
+    def _restore_session(self, tweeter: "Twooter", username: str) -> bool:
+        """Reuse a stored session instead of logging in, if it is still valid."""
+        if self.session_store is None:
+            return False
 
-        try:
-            with open(env_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Remove surrounding quotes if present
-                    if (value.startswith('"') and value.endswith('"')) or (
-                        value.startswith("'") and value.endswith("'")
-                    ):
-                        value = value[1:-1]
+        session = self.session_store.load(username)
+        if session is None:
+            return False
+        if (
+            session.expires_at is not None
+            and session.expires_at - self.session_expiry_margin <= time.time()
+        ):
+            return False
 
-                    if key == "INVITE_CODE":
-                        return value
-        except Exception as e:
-            print(f"Error reading .env file: {e}")
+        if not self._seed_token(tweeter, session):
+            return False
+        tweeter.use_agent(username)
 
-        return None
+        # Without a known expiry the only way to know is to ask
+        if session.expires_at is None:
+            try:
+                tweeter.user_me()
+            except Exception as e:
+                print(f"Stored session for {username} rejected, logging in: {e}")
+                self.session_store.delete(username)
+                return False
+
+        print(f"Reused stored session for {username}")
+        return True
 
-    def get_account(self) -> Twooter:
-        """Very basic key rotation for now"""
-        if self.person_index >= len(self._bots) - 1:
-            self.person_index = 0
-        else:
-            self.person_index += 1
+    @staticmethod
+    def _seed_token(tweeter: "Twooter", session) -> bool:
+        """Hand a stored token to the SDK, which builds its auth headers from its token store.
 
-        return self._bots[self.person_index]
+        The SDK has no public way to set a token, so this is the one place
+        relying on its internals; if they change, accounts log in instead.
+        The token store is in the private tokens directory, not tokens.db.
+        """
+        tokens = getattr(getattr(tweeter, "_client", None), "tokens", None)
+        if tokens is None or not hasattr(tokens, "save"):
+            print("Twooter SDK has no token store to restore into, logging in instead")
+            return False
+        tokens.save(session.username, session.token, session.token_type, session.expires_at, {})
+        return True
 
-    def get_random_accounts(self, num_acc: int = 1) -> List[Twooter]:
-        """Gets multiple unique random accounts, excluding the current one."""
+    def close(self) -> None:
+        """Stop re-logins and the login threads, and delete the SDK's token files."""
+        for task in self._relogin_tasks.values():
+            task.cancel()
+        self._login_executor.shutdown(wait=False)
+        if self._tokens_dir is not None:
+            self._remove_tokens_dir()
+
+    def _save_session(self, username: str, login_result: dict) -> None:
+        """Persist the session from a fresh login for the next startup."""
+        if self.session_store is None or not login_result.get("token"):
+            return
+        try:
+            self.session_store.save(
+                username,
+                login_result["token"],
+                login_result.get("token_type"),
+                login_result.get("expires_at"),
+            )
+        except Exception as e:
+            print(f"Failed to persist session for {username}: {e}")
+
+    def get_random_accounts(self, num_acc: int = 1) -> List["Twooter"]:
+        """Gets multiple unique random accounts, excluding any currently leased."""
         if num_acc <= 0:
             return []
 
         available_bots = [
-            bot for i, bot in enumerate(self._bots) if i != self.person_index
+            account.tweeter
+            for account in self._available_accounts()
+            if not account.in_use
         ]
 
         num_to_sample = min(num_acc, len(available_bots))
         return random.sample(available_bots, k=num_to_sample)
 
-    def get_all_accounts(self) -> List[Twooter]:
-        """Returns all of them"""
-        return self._bots
-
-    def get_current_account_info(self) -> str:
-        """Get info about current account for logging."""
-        current_index = self.person_index
-        if current_index < len(self._bots):
-            return f"Bot account #{current_index + 1}"
-        return "No active account"
+    def get_all_accounts(self) -> List["Twooter"]:
+        """Returns all of them, apart from any being re-logged in"""
+        return [account.tweeter for account in self._available_accounts()]
 
     def get_total_accounts(self) -> int:
         """Get total number of available accounts."""
@@ -0,0 +1,131 @@
+"""Encrypted-at-rest store for Twooter login sessions"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredSession:
+    """A session token captured after a successful login."""
+
+    username: str
+    token: str
+    token_type: Optional[str]
+    expires_at: Optional[int]
+
+
+class SessionStore:
+    """Keeps session tokens in sqlite, encrypted with a local Fernet key.
+
+    The key comes from the SESSION_KEY environment variable, or is generated
+    once into a key file readable only by the current user.
+    """
+
+    def __init__(self, db_path: str = "personas.db", key_path: str = ".session_key"):
+        """
+        Args:
+            db_path: sqlite database holding the sessions table
+            key_path: File holding the encryption key, created if missing
+        """
+        # Imported here so cryptography only loads once sessions are used
+        from cryptography.fernet import Fernet
+
+        self._fernet = Fernet(self._load_key(Path(key_path)))
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                username   TEXT PRIMARY KEY,
+                token      BLOB NOT NULL,
+                token_type TEXT,
+                expires_at INTEGER,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_key(key_path: Path) -> bytes:
+        from cryptography.fernet import Fernet
+
+        env_key = os.environ.get("SESSION_KEY")
+        if env_key:
+            return env_key.encode()
+        if key_path.exists():
+            return key_path.read_bytes().strip()
+
+        key = Fernet.generate_key()
+        # Written aside then linked into place, so a worker process racing
+        # this one either creates the key or reads a complete one
+        temp_path = key_path.with_name(f"{key_path.name}.{os.getpid()}")
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        try:
+            os.link(temp_path, key_path)
+        except FileExistsError:
+            return key_path.read_bytes().strip()
+        finally:
+            temp_path.unlink()
+        logger.info(f"Generated new session encryption key at {key_path}")
+        return key
+
+    def load(self, username: str) -> Optional[StoredSession]:
+        """Get the stored session for an account, if one can be decrypted."""
+        from cryptography.fernet import InvalidToken
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT token, token_type, expires_at FROM sessions WHERE username = ?",
+                (username,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        token, token_type, expires_at = row
+        try:
+            decrypted = self._fernet.decrypt(token).decode()
+        except InvalidToken:
+            # Written under a different key; treat as missing
+            logger.warning(f"Discarding undecryptable session for {username}")
+            self.delete(username)
+            return None
+        return StoredSession(username, decrypted, token_type, expires_at)
+
+    def save(
+        self,
+        username: str,
+        token: str,
+        token_type: Optional[str],
+        expires_at: Optional[int],
+    ) -> None:
+        """Store (or replace) the session for an account."""
+        encrypted = self._fernet.encrypt(token.encode())
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO sessions (username, token, token_type, expires_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(username) DO UPDATE SET
+                    token = excluded.token,
+                    token_type = excluded.token_type,
+                    expires_at = excluded.expires_at,
+                    updated_at = excluded.updated_at
+                """,
+                (username, encrypted, token_type, expires_at, time.time()),
+            )
+
+    def delete(self, username: str) -> None:
+        """Forget the session for an account, e.g. after it is rejected."""
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE username = ?", (username,))
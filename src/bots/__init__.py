@@ -1,10 +1,22 @@
-"""A list of bots, register them at the container's registry"""
+"""A list of bots, register them at the container's registry
+
+Bots are imported on first access, so importing the package doesn't pull in
+langchain until a bot is actually used.
+"""
+
+from src.lazy import lazy_exports
+
+_EXPORTS = {
+    "Bot": ".base",
+    "BasicBot": ".basic_bot",
+    "ViralBot": ".viral_bot",
+    "NewsBot": ".news_bot",
+    "ResponseBot": ".response_bot",
+    "ReplyThreadOrchestrator": ".reply_thread",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
-from .base import Bot
-from .basic_bot import BasicBot
-from .viral_bot import ViralBot
-from .news_bot import NewsBot
-from .response_bot import ResponseBot
 
 __all__ = [
     "Bot",
@@ -12,4 +24,5 @@ __all__ = [
     "ViralBot",
     "NewsBot",
     "ResponseBot",
+    "ReplyThreadOrchestrator",
 ]
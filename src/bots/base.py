@@ -22,3 +22,9 @@ class Bot(ABC):
             LLM response as a string
         """
         pass
+
+    def post_queued(self, content: str) -> None:
+        """Called once a response from run_bot is safely in the outbox."""
+
+    def post_dropped(self, content: str) -> None:
+        """Called when a response from run_bot won't be posted, e.g. as a duplicate."""
@@ -1,7 +1,5 @@
 from .base import Bot
 from src.providers import LLMProvider
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
 from textwrap import dedent
 
 
@@ -13,6 +11,8 @@ class BasicBot(Bot):
         Args:
             LLM Provider interface for llms
         """
+        from langchain.prompts import PromptTemplate
+
         self.llm_provider = llm_provider
         self.prompt = PromptTemplate(
             template=dedent(
@@ -157,6 +157,8 @@ class BasicBot(Bot):
         Returns:
             LLM response as a string
         """
+        from langchain.schema import HumanMessage
+
         message = HumanMessage(content=self.prompt.format())
         response = await self.llm_provider.invoke([message])
         if len(response.strip()) < 255:
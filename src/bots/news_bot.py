@@ -1,22 +1,43 @@
 from .base import Bot
+from .topics import ELECTION_TOPICS
 from src.providers import LLMProvider
-from src.tweeter import QueryAgent
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
+from src.tweeter import QueryAgent, NewsStore, ArticleCondenser
+from src.tweeter.news_store import StoredArticle, match_any
 from textwrap import dedent
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from src.tweeter import ArticleRanker
 
 
 class NewsBot(Bot):
     """A basic bot that generates pro republican posts, will make it using trending topics WIP"""
 
-    def __init__(self, llm_provider: LLMProvider, query_agent: QueryAgent):
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        query_agent: QueryAgent,
+        news_store: Optional[NewsStore] = None,
+        ranker: Optional["ArticleRanker"] = None,
+        condenser: Optional[ArticleCondenser] = None,
+    ):
         """
         Args:
             LLM Provider interface for llms
+            Query agent for live news scraping
+            News store of ingested articles, used before scraping
+            Ranker choosing the stored articles most relevant to the election
+            Condenser trimming articles to a token budget before prompting
         """
+        from langchain.prompts import PromptTemplate
 
         self.llm_provider = llm_provider
         self.query_agent = query_agent
+        self.news_store = news_store
+        self.ranker = ranker
+        self.condenser = condenser
+        # Stored article each generated post was written from, by post text
+        self._claims: Dict[str, int] = {}
         self.prompt = PromptTemplate(
             template=dedent(
                 """
@@ -166,11 +187,63 @@ class NewsBot(Bot):
         Returns:
             LLM response as a string
         """
-        article = self.query_agent.get_random_news_article()
-        message = HumanMessage(content=self.prompt.format(news=article))
-        response = await self.llm_provider.invoke([message])
-        if len(response.strip()) < 255:
-            return response.strip()
+        from langchain.schema import HumanMessage
+
+        stored = self._claim_article()
+        if stored is not None:
+            article = stored.body
         else:
-            print("bot did a too long response, remaking")
-            return await self.run_bot()
+            # Nothing ingested yet, so scrape one live
+            article = await self.query_agent.get_random_news_article()
+        if self.condenser is not None:
+            article = self.condenser.condense(article).text
+        message = HumanMessage(content=self.prompt.format(news=article))
+        try:
+            while True:
+                response = (await self.llm_provider.invoke([message])).strip()
+                if len(response) < 255:
+                    break
+                print("bot did a too long response, remaking")
+        except BaseException:
+            if stored is not None:
+                self.news_store.release(stored.id)
+            raise
+
+        if stored is not None:
+            self._claims[response] = stored.id
+        return response
+
+    def post_queued(self, content: str) -> None:
+        """The article behind a queued post is used up."""
+        article_id = self._claims.pop(content, None)
+        if article_id is not None:
+            self.news_store.mark_used(article_id)
+            if self.ranker is not None:
+                self.ranker.discard(article_id)
+
+    def post_dropped(self, content: str) -> None:
+        """The article behind a dropped post can be picked again."""
+        article_id = self._claims.pop(content, None)
+        if article_id is not None:
+            self.news_store.release(article_id)
+
+    def _claim_article(self) -> Optional[StoredArticle]:
+        """Claim an unused ingested article, or None if the store has none."""
+        if self.news_store is None:
+            return None
+        while True:
+            if self.ranker is not None:
+                stored = self.ranker.pick()
+            else:
+                # Without the ranker, the full-text index still prefers on-topic articles
+                matches = self.news_store.search(
+                    match_any(ELECTION_TOPICS), limit=1, available_only=True
+                )
+                stored = matches[0] if matches else None
+            if stored is None:
+                stored = self.news_store.pick_unused()
+            if stored is None:
+                return None
+            # Lost the race if another worker process claimed it first
+            if self.news_store.claim(stored.id):
+                return stored
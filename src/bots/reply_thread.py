@@ -0,0 +1,134 @@
+"""Generating and publishing the replies under a post"""
+
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from src.account_providers import NoAccountAvailable
+from src.tweeter import Outbox, OutboxPublisher, PostDeduplicator
+from src.tweeter.errors import backoff_delay, classify_error, is_retryable
+from .response_bot import ResponseBot
+
+logger = logging.getLogger(__name__)
+
+
+class ReplyThreadOrchestrator:
+    """Builds the reply thread under a post.
+
+    All replies are generated concurrently up front and queued in the
+    outbox, then published one at a time at a fixed cadence, each from an
+    account that hasn't yet posted in the thread.
+    """
+
+    def __init__(
+        self,
+        response_bot: ResponseBot,
+        outbox: Outbox,
+        publisher: OutboxPublisher,
+        dedup: Optional[PostDeduplicator] = None,
+        replies_per_post: int = 2,
+        cadence: float = 20.0,
+        max_attempts: int = 3,
+        base_backoff: float = 10.0,
+        max_backoff: float = 120.0,
+    ):
+        """
+        Args:
+            response_bot: Bot that writes each reply
+            outbox: Where replies are queued before publishing
+            publisher: Publishes queued replies
+            dedup: Rejects replies too similar to recent posts, if given
+            replies_per_post: Replies generated for each post
+            cadence: Seconds to wait before publishing each reply
+            max_attempts: Attempts at generating a reply before giving up on it
+            base_backoff: Delay in seconds after the first failed attempt, doubled each time
+            max_backoff: Upper bound on the retry delay in seconds
+        """
+        self.response_bot = response_bot
+        self.outbox = outbox
+        self.publisher = publisher
+        self.dedup = dedup
+        self.replies_per_post = replies_per_post
+        self.cadence = cadence
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    async def run(self, content: str, post_id: int, username: str) -> List[Tuple[int, str]]:
+        """Reply to a post.
+
+        Args:
+            content: Text of the post being replied to
+            post_id: The post being replied to
+            username: Account that made the post
+
+        Returns:
+            (post_id, username) of each reply published
+        """
+        replies = await asyncio.gather(
+            *(self._generate(content) for _ in range(self.replies_per_post))
+        )
+        entry_ids = []
+        for reply in replies:
+            if reply is None:
+                continue
+            # The check takes a sqlite write lock, so off the event loop
+            if self.dedup is not None and not await asyncio.to_thread(
+                self.dedup.check_and_add, reply
+            ):
+                logger.info(f"Reply to post {post_id} too similar to a recent one, skipping")
+                continue
+            # Kept with the entry, so a retry by the outbox drain never
+            # sends it from the account that made the post either
+            entry_ids.append(
+                self.outbox.enqueue("reply", reply, parent_id=post_id, exclude_accounts={username})
+            )
+
+        published = []
+        used_accounts = {username}
+        for entry_id in entry_ids:
+            logger.info(f"Publishing next reply to post {post_id} in {self.cadence} seconds...")
+            await asyncio.sleep(self.cadence)
+            result = await self._publish(entry_id, post_id, username, used_accounts)
+            if result is not None:
+                published.append(result)
+                used_accounts.add(result[1])
+        return published
+
+    async def _generate(self, content: str) -> Optional[str]:
+        """Generate one reply, retrying transient failures with backoff."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await self.response_bot.run_bot(content)
+            except Exception as e:
+                error_class = classify_error(e)
+                if not is_retryable(e) or attempt == self.max_attempts:
+                    logger.error(
+                        f"Reply generation failed ({error_class}) after {attempt} attempts: {e}"
+                    )
+                    return None
+                delay = backoff_delay(attempt, self.base_backoff, self.max_backoff)
+                logger.warning(
+                    f"Reply generation failed ({error_class}), retrying in {delay:.0f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+        return None
+
+    async def _publish(
+        self, entry_id: int, post_id: int, username: str, used_accounts: set
+    ) -> Optional[Tuple[int, str]]:
+        """Publish a queued reply, leaving it to the outbox worker if that fails."""
+        try:
+            try:
+                return await self.publisher.publish(entry_id, exclude_accounts=used_accounts)
+            except NoAccountAvailable as e:
+                # Fewer accounts than replies; better a repeat than no reply,
+                # but never one from the account that made the post
+                logger.warning(f"No unused account for reply to post {post_id}: {e}")
+                return await self.publisher.publish(entry_id, exclude_accounts={username})
+        except Exception as e:
+            logger.warning(
+                f"Reply to post {post_id} left in the outbox for retry "
+                f"({classify_error(e)}): {e}"
+            )
+            return None
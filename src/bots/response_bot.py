@@ -1,7 +1,5 @@
 from .base import Bot
 from src.providers import LLMProvider
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
 from textwrap import dedent
 import time
 
@@ -14,6 +12,8 @@ class ResponseBot(Bot):
         Args:
             LLM Provider interface for llms
         """
+        from langchain.prompts import PromptTemplate
+
         self.llm_provider = llm_provider
         self.prompt = PromptTemplate(
             template=dedent(
@@ -163,6 +163,8 @@ class ResponseBot(Bot):
         Returns:
             LLM response as a string
         """
+        from langchain.schema import HumanMessage
+
         message = HumanMessage(content=self.prompt.format(post=post))
         response = await self.llm_provider.invoke([message])
 
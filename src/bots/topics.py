@@ -0,0 +1,14 @@
+"""Topics covered by the bot prompts, used to rank news articles for relevance"""
+
+ELECTION_TOPICS = [
+    "Marina Castillo Democratic-Republican candidate President of Kingston election",
+    "Victor Hawthorne People's Alliance candidate career politician",
+    "President Gregory Brotherston incumbent",
+    "economy jobs tourism resort investment small business tax cuts",
+    "progressive taxes higher taxes free college job training",
+    "public safety defence police coast guard crime law enforcement military funding",
+    "immigration borders regulation local services",
+    "culture tradition maritime identity",
+    "environment offshore drilling carbon tax energy costs transport prices",
+    "socialism socialist free market oligarchic power structures",
+]
@@ -1,7 +1,25 @@
 """Configuration management for rubber-duckers."""
 
-from .schemas import AppConfig, LLMConfig, UserConfig
-from .loader import load_config, load_config_from_json
+from .schemas import (
+    AccountsConfig,
+    AppConfig,
+    BotAccount,
+    ConfigSnapshot,
+    LLMConfig,
+    NewsConfig,
+    OutboxConfig,
+    PostingConfig,
+    SchedulerConfig,
+    StorageConfig,
+    UserConfig,
+)
+from .loader import (
+    ConfigWatcher,
+    SnapshotLoader,
+    config_diff,
+    load_config,
+    load_config_from_json,
+)
 
 
 # Import Container lazily to avoid circular imports
@@ -13,9 +31,20 @@ def get_container():
 
 
 __all__ = [
+    "AccountsConfig",
     "AppConfig",
+    "BotAccount",
+    "ConfigSnapshot",
     "LLMConfig",
+    "NewsConfig",
+    "OutboxConfig",
+    "PostingConfig",
+    "SchedulerConfig",
+    "StorageConfig",
     "UserConfig",
+    "ConfigWatcher",
+    "SnapshotLoader",
+    "config_diff",
     "load_config",
     "load_config_from_json",
     "get_container",
@@ -1,29 +1,124 @@
-from src.providers import APIKeyManager, LLMProvider, LLMProviderFactory
-from . import AppConfig
-from typing import Dict, Any, Callable
-from src.bots import BasicBot, ViralBot, NewsBot, ResponseBot
-from src.tweeter import TweeterClient, QueryAgent
-from src.account_providers import AccountProvider
+from src.providers import (
+    APIKeyManager,
+    KeyUsageStore,
+    LLMProvider,
+    LLMProviderFactory,
+    LLMWarmup,
+)
+from . import AppConfig, ConfigSnapshot
+from .loader import config_diff
+import asyncio
+import inspect
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+from src.bots import BasicBot, ViralBot, NewsBot, ResponseBot, ReplyThreadOrchestrator
+from src.tweeter import (
+    TweeterClient,
+    QueryAgent,
+    ActionLedger,
+    EngagementQueue,
+    Outbox,
+    OutboxPublisher,
+    HttpCache,
+    NewsStore,
+    NewsPoller,
+    ArticleCondenser,
+    PostDeduplicator,
+)
+from src.bots.topics import ELECTION_TOPICS
+from src.scheduling import AccountRateLimiter, PostRateController
+from src.account_providers import AccountProvider, SessionStore
+
+logger = logging.getLogger(__name__)
+
+# The service being built, so the services it resolves can be recorded as its dependencies
+_resolving: ContextVar[Any] = ContextVar("resolving", default=None)
+
+# Sections whose changes need a restart; accounts are kept so sessions survive
+_RESTART_SECTIONS = {"storage", "accounts"}
 
 
 class Container:
     """Dependency injection container using a registry of providers."""
 
-    def __init__(self):
-        self._config: AppConfig | None = None
+    def __init__(self, shard_index: int = 0, shard_count: int = 1):
+        """
+        Args:
+            shard_index: This worker's shard when run under the supervisor
+            shard_count: Number of worker processes, 1 when not supervised
+        """
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self._snapshot: ConfigSnapshot | None = None
         self._instances: Dict[Any, Any] = {}
         self._providers: Dict[Any, Callable[["Container"], Any]] = {}
+        # Services needing async setup, and what must be set up before them
+        self._async_initialisers: Dict[Any, Callable[["Container"], Awaitable[Any]]] = {
+            AccountProvider: lambda c: c._create_account_provider(c),
+        }
+        self._async_dependencies: Dict[Any, Tuple[Any, ...]] = {
+            TweeterClient: (AccountProvider,),
+            QueryAgent: (AccountProvider,),
+            NewsBot: (QueryAgent,),
+            NewsPoller: (QueryAgent,),
+            OutboxPublisher: (TweeterClient,),
+            ReplyThreadOrchestrator: (TweeterClient,),
+        }
+        self._pending: Dict[Any, asyncio.Future] = {}
+        # Background closes of services replaced by a reload
+        self._retiring: Set[asyncio.Task] = set()
+        # Seconds each service took to initialise, excluding its dependencies
+        self.startup_times: Dict[str, float] = {}
+        # Services built using each service, recorded as they are resolved
+        self._dependents: Dict[Any, Set[Any]] = {}
+        # Services reading each config section, rebuilt along with their
+        # dependents when it changes on reload
+        self._config_readers: Dict[str, Set[Any]] = {
+            "llm": {LLMWarmup},
+            "news": {QueryAgent, HttpCache, ArticleCondenser},
+            "outbox": {OutboxPublisher, PostDeduplicator, ReplyThreadOrchestrator},
+            "scheduler": {ReplyThreadOrchestrator},
+        }
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """The loaded env.json, .env and bots.json the providers were registered with."""
+        if self._snapshot is None:
+            raise RuntimeError("Container has no config. Call set_snapshot() first.")
+        return self._snapshot
+
+    @property
+    def config(self) -> AppConfig:
+        """The app config the providers were registered with."""
+        return self.snapshot.app
 
     async def set_config(self, config: AppConfig) -> None:
-        """Set the app config and register providers."""
-        self._config = config
+        """Set the app config, without any .env values or bot accounts, and register providers."""
+        await self.set_snapshot(ConfigSnapshot(app=config))
+
+    async def set_snapshot(self, snapshot: ConfigSnapshot) -> None:
+        """Set the loaded config snapshot and register providers."""
+        self._snapshot = snapshot
+        config = snapshot.app
         self._instances.clear()
+        self._dependents.clear()
+        self.startup_times.clear()
+        self._register_providers(config)
+
+    def _register_providers(self, config: AppConfig) -> None:
         self._providers.clear()
 
         # Core providers
         self._providers[APIKeyManager] = lambda c: APIKeyManager(
             api_keys=config.llm.api_keys,
             max_usage_per_key=config.llm.max_requests_per_key,
+            # Worker processes balance the keys between them through sqlite
+            usage_store=c.get(KeyUsageStore) if c.shard_count > 1 else None,
+        )
+        self._providers[KeyUsageStore] = lambda c: KeyUsageStore(
+            db_path=config.storage.database_path
         )
 
         # Use factory to create the appropriate LLM provider based on config
@@ -31,6 +126,32 @@ class Container:
             config=config.llm,
             api_key_manager=c.get(APIKeyManager),
         )
+        # Checks the provider works without holding up startup
+        self._providers[LLMWarmup] = lambda c: LLMWarmup(
+            provider=c.get(LLMProvider),
+            model=f"{config.llm.provider_type}:{config.llm.model_name}",
+            db_path=config.storage.database_path,
+            ttl=config.llm.warmup_ttl_seconds,
+        )
+
+        # Durable record of likes/reposts so restarts don't repeat them
+        self._providers[ActionLedger] = lambda c: ActionLedger(
+            db_path=config.storage.database_path,
+            batch_size=config.storage.ledger_batch_size,
+            flush_interval=config.storage.ledger_flush_interval,
+        )
+
+        # Posts shared between supervised workers, so every shard's
+        # accounts like and repost them
+        self._providers[EngagementQueue] = lambda c: EngagementQueue(
+            db_path=config.storage.database_path, shard_index=c.shard_index
+        )
+
+        # Encrypted sessions so restarts can skip logging in again
+        self._providers[SessionStore] = lambda c: SessionStore(
+            db_path=config.storage.database_path,
+            key_path=config.accounts.session_key_path,
+        )
 
         # Account provider for managing multiple bot accounts (async initialization)
         self._providers[AccountProvider] = lambda c: self._create_account_provider_sync(c)
@@ -41,7 +162,11 @@ class Container:
         self._providers[ViralBot] = lambda c: ViralBot(llm_provider=c.get(LLMProvider))
 
         self._providers[NewsBot] = lambda c: NewsBot(
-            llm_provider=c.get(LLMProvider), query_agent=c.get(QueryAgent)
+            llm_provider=c.get(LLMProvider),
+            query_agent=c.get(QueryAgent),
+            news_store=c.get(NewsStore) if config.news.store_enabled else None,
+            ranker=c._get_article_ranker(),
+            condenser=c.get(ArticleCondenser) if config.news.condense_enabled else None,
         )
 
         self._providers[ResponseBot] = lambda c: ResponseBot(
@@ -52,9 +177,105 @@ class Container:
         self._providers[TweeterClient] = lambda c: self._create_tweeter_client_sync(c)
         self._providers[QueryAgent] = lambda c: self._create_query_agent_sync(c)
 
+        # Cache for news pages so most generations skip the network
+        self._providers[HttpCache] = lambda c: HttpCache(
+            db_path=config.news.cache_path, max_bytes=config.news.cache_max_bytes
+        )
+
+        # Articles ingested in the background so NewsBot needn't scrape
+        self._providers[NewsStore] = lambda c: NewsStore(db_path=config.storage.database_path)
+        self._providers[NewsPoller] = lambda c: NewsPoller(
+            query_agent=c.get(QueryAgent),
+            news_store=c.get(NewsStore),
+        )
+        # Ranks stored articles against the prompt topics for NewsBot
+        if config.news.store_enabled and config.news.rank_enabled:
+            # Imported here so numpy is only loaded when ranking is enabled
+            from src.tweeter import ArticleRanker
+
+            self._config_readers["news"].add(ArticleRanker)
+            self._providers[ArticleRanker] = lambda c: ArticleRanker(
+                news_store=c.get(NewsStore),
+                topics=ELECTION_TOPICS,
+                dim=config.news.rank_dimensions,
+                top_k=config.news.rank_top_k,
+            )
+        # Trims articles to a token budget before they reach the prompt
+        self._providers[ArticleCondenser] = lambda c: ArticleCondenser(
+            max_tokens=config.news.article_token_budget,
+            cache_size=config.news.condense_cache_size,
+        )
+
+        # Generated content is queued before publishing so it survives failures
+        self._providers[Outbox] = lambda c: Outbox(
+            db_path=config.storage.database_path, worker_id=f"shard-{c.shard_index}"
+        )
+        self._providers[OutboxPublisher] = lambda c: OutboxPublisher(
+            outbox=c.get(Outbox),
+            tweeter_client=c.get(TweeterClient),
+            max_attempts=config.outbox.max_attempts,
+            base_backoff=config.outbox.base_backoff_seconds,
+            max_backoff=config.outbox.max_backoff_seconds,
+        )
+        # Generates and publishes the replies under each post
+        self._providers[ReplyThreadOrchestrator] = lambda c: ReplyThreadOrchestrator(
+            response_bot=c.get(ResponseBot),
+            outbox=c.get(Outbox),
+            publisher=c.get(OutboxPublisher),
+            dedup=c.get(PostDeduplicator) if config.outbox.dedup_enabled else None,
+            replies_per_post=config.scheduler.replies_per_post,
+            cadence=config.scheduler.reply_interval_seconds,
+            max_attempts=config.scheduler.response_max_attempts,
+            base_backoff=config.scheduler.response_retry_delay_seconds,
+            max_backoff=config.scheduler.response_max_retry_delay_seconds,
+        )
+        # Paces posting to the configured rate and per-account limits
+        # The rates in config are totals, so supervised workers split them
+        self._providers[PostRateController] = lambda c: PostRateController(
+            target_per_hour=config.posting.target_posts_per_hour / c.shard_count,
+            max_per_hour=config.posting.max_posts_per_hour / c.shard_count,
+            burst=config.posting.burst,
+        )
+        self._providers[AccountRateLimiter] = lambda c: AccountRateLimiter(
+            rate=config.posting.account_posts_per_hour / 3600.0,
+            capacity=config.posting.account_burst,
+        )
+        # Near-duplicate posts are dropped before they reach the outbox
+        self._providers[PostDeduplicator] = lambda c: PostDeduplicator(
+            db_path=config.storage.database_path,
+            max_distance=config.outbox.dedup_max_distance,
+            capacity=config.outbox.dedup_capacity,
+        )
+
+    def _get_article_ranker(self):
+        """The ArticleRanker, or None when stored articles aren't ranked."""
+        news_config = self.config.news
+        if news_config.store_enabled and news_config.rank_enabled:
+            from src.tweeter import ArticleRanker
+
+            return self.get(ArticleRanker)
+        return None
+
     async def _create_account_provider(self, container):
         """Create AccountProvider and initialize it asynchronously."""
-        account_provider = AccountProvider()
+        accounts_config = self.config.accounts
+        account_provider = AccountProvider(
+            bot_accounts=self.snapshot.bots,
+            invite_code=self.snapshot.invite_code,
+            session_store=(
+                container.get(SessionStore) if accounts_config.reuse_sessions else None
+            ),
+            session_expiry_margin=accounts_config.session_expiry_margin_seconds,
+            login_concurrency=accounts_config.login_concurrency,
+            login_max_attempts=accounts_config.login_max_attempts,
+            login_backoff_base=accounts_config.login_backoff_base_seconds,
+            login_backoff_max=accounts_config.login_backoff_max_seconds,
+            lazy=accounts_config.lazy_login,
+            warm_accounts=accounts_config.warm_accounts,
+            fanout_activations=accounts_config.fanout_activations,
+            shard_index=self.shard_index,
+            shard_count=self.shard_count,
+        )
         await account_provider.initialize()
         return account_provider
 
@@ -71,7 +292,11 @@ class Container:
             if AccountProvider not in self._instances:
                 raise RuntimeError("AccountProvider must be initialized before TweeterClient. Use get_async(AccountProvider) first.")
         account_provider = self._instances[AccountProvider]
-        return TweeterClient(account_provider=account_provider)
+        return TweeterClient(
+            account_provider=account_provider,
+            action_ledger=container.get(ActionLedger),
+            account_limiter=container.get(AccountRateLimiter),
+        )
 
     def _create_query_agent_sync(self, container):
         """Sync wrapper for creating QueryAgent."""
@@ -80,57 +305,252 @@ class Container:
             if AccountProvider not in self._instances:
                 raise RuntimeError("AccountProvider must be initialized before QueryAgent. Use get_async(AccountProvider) first.")
         account_provider = self._instances[AccountProvider]
-        return QueryAgent(account_provider=account_provider)
+        return self._build_query_agent(account_provider)
 
-    async def _create_tweeter_client(self, container):
-        """Create TweeterClient with AccountProvider."""
-        account_provider = await container.get_async(AccountProvider)
-        return TweeterClient(account_provider=account_provider)
+    def _build_query_agent(self, account_provider):
+        """Build the QueryAgent from the news config."""
+        news_config = self.config.news
+        return QueryAgent(
+            account_provider=account_provider,
+            site_url=news_config.site_url,
+            index_path=news_config.index_path,
+            request_timeout=news_config.request_timeout_seconds,
+            max_connections=news_config.max_connections,
+            crawl_concurrency=news_config.crawl_concurrency,
+            http_cache=self.get(HttpCache) if news_config.cache_enabled else None,
+            index_ttl=news_config.index_ttl_seconds,
+        )
 
-    async def _create_query_agent(self, container):
-        """Create QueryAgent with AccountProvider."""
-        account_provider = await container.get_async(AccountProvider)
-        return QueryAgent(account_provider=account_provider)
+    def _record_dependent(self, key: Any) -> None:
+        parent = _resolving.get()
+        if parent is not None and parent is not key:
+            self._dependents.setdefault(key, set()).add(parent)
 
     def get(self, key: Any):
         """Generic resolver with caching."""
+        self._record_dependent(key)
         if key in self._instances:
             return self._instances[key]
         if key not in self._providers:
             raise ValueError(f"No provider registered for {key}")
-        instance = self._providers[key](self)
+        token = _resolving.set(key)
+        try:
+            instance = self._providers[key](self)
+        finally:
+            _resolving.reset(token)
         self._instances[key] = instance
         return instance
 
     async def get_async(self, key: Any):
-        """Async resolver for services that require async initialization."""
+        """Async resolver for services that require async initialization.
+
+        Concurrent callers for the same key share a single initialisation,
+        and a service's async dependencies are resolved concurrently first.
+        """
+        self._record_dependent(key)
         if key in self._instances:
             return self._instances[key]
         if key not in self._providers:
             raise ValueError(f"No provider registered for {key}")
-        
-        if key == AccountProvider:
-            instance = await self._create_account_provider(self)
-        elif key == TweeterClient:
-            # Ensure AccountProvider is initialized first
-            await self.get_async(AccountProvider)
-            instance = await self._create_tweeter_client(self)
-        elif key == QueryAgent:
-            # Ensure AccountProvider is initialized first
-            await self.get_async(AccountProvider)
-            instance = await self._create_query_agent(self)
-        elif key == NewsBot:
-            # NewsBot requires QueryAgent which needs async initialization
-            query_agent = await self.get_async(QueryAgent)
-            instance = NewsBot(
-                llm_provider=self.get(LLMProvider), 
-                query_agent=query_agent
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._resolve(key))
+            self._pending[key] = pending
+        # Shielded so one caller being cancelled doesn't abort it for the rest
+        return await asyncio.shield(pending)
+
+    async def _resolve(self, key: Any):
+        # Runs in its own task, so this doesn't leak back to the caller
+        _resolving.set(key)
+        try:
+            dependencies = self._async_dependencies.get(key, ())
+            if dependencies:
+                await asyncio.gather(*(self.get_async(dep) for dep in dependencies))
+
+            start_time = time.perf_counter()
+            initialiser = self._async_initialisers.get(key)
+            instance = await initialiser(self) if initialiser else self._providers[key](self)
+            self.startup_times[key.__name__] = time.perf_counter() - start_time
+
+            self._instances[key] = instance
+            return instance
+        finally:
+            # A failed initialisation can be retried by the next caller
+            self._pending.pop(key, None)
+
+    async def initialize(self, keys: List[Any]) -> float:
+        """Resolve several services concurrently and report how long it took.
+
+        Returns:
+            Seconds until every service was ready
+        """
+        start_time = time.perf_counter()
+        await asyncio.gather(*(self.get_async(key) for key in keys))
+        elapsed = time.perf_counter() - start_time
+        breakdown = ", ".join(
+            f"{name} {seconds:.2f}s"
+            for name, seconds in sorted(self.startup_times.items(), key=lambda x: -x[1])
+            if seconds >= 0.01
+        )
+        logger.info(f"Initialised {len(keys)} services in {elapsed:.2f}s ({breakdown})")
+        return elapsed
+
+    async def apply_snapshot(self, snapshot: ConfigSnapshot) -> Set[str]:
+        """Switch to a reloaded snapshot, rebuilding only what the changes affect.
+
+        Bot accounts and .env values are only read at login, so changes to
+        them are logged and need a restart. The app config is applied as in
+        ``apply_config``.
+
+        Returns:
+            Dotted names of the settings that changed, e.g. ``llm.temperature``
+        """
+        current = self.snapshot
+        if snapshot.bots != current.bots or snapshot.env != current.env:
+            logger.warning("Changes to bots.json or .env need a restart to apply")
+        return await self.apply_config(snapshot.app)
+
+    async def apply_config(self, config: AppConfig) -> Set[str]:
+        """Switch to a reloaded config, rebuilding only what the changes affect.
+
+        API keys, model settings and posting rates are updated in place, so
+        key stats and rate limit state survive. Services reading a changed section are dropped along with
+        everything built from them, and rebuilt from the new config on next
+        use. Logged in accounts are always kept.
+
+        Returns:
+            Dotted names of the settings that changed, e.g. ``llm.temperature``
+        """
+        changed = config_diff(self.config, config)
+        deferred = sorted(name for name in changed if name.split(".")[0] in _RESTART_SECTIONS)
+        if deferred:
+            logger.warning(f"Config changes need a restart to apply: {', '.join(deferred)}")
+            # Keep the running values, so the config matches what is in use
+            config = config.model_copy(
+                update={section: getattr(self.config, section) for section in _RESTART_SECTIONS}
             )
-        else:
-            instance = self._providers[key](self)
-        
-        self._instances[key] = instance
-        return instance
+            changed -= set(deferred)
+        if not changed:
+            return changed
+
+        self._snapshot = self.snapshot.model_copy(update={"app": config})
+        self._register_providers(config)
+
+        stale: Set[Any] = set()
+        for section in {name.split(".")[0] for name in changed}:
+            stale |= self._config_readers.get(section, set())
+
+        llm_config = config.llm
+        if APIKeyManager in self._instances:
+            self._instances[APIKeyManager].update_keys(
+                llm_config.api_keys, llm_config.max_requests_per_key
+            )
+        # Rate limits are updated in place, so buckets and the achieved
+        # rate survive
+        posting = config.posting
+        if PostRateController in self._instances:
+            self._instances[PostRateController].update_rates(
+                target_per_hour=posting.target_posts_per_hour / self.shard_count,
+                max_per_hour=posting.max_posts_per_hour / self.shard_count,
+                burst=posting.burst,
+            )
+        if AccountRateLimiter in self._instances:
+            self._instances[AccountRateLimiter].update_rate(
+                rate=posting.account_posts_per_hour / 3600.0,
+                capacity=posting.account_burst,
+            )
+        model_settings = {"llm.model_name", "llm.temperature", "llm.max_tokens"}
+        if "llm.provider_type" in changed:
+            stale.add(LLMProvider)
+        elif changed & model_settings and LLMProvider in self._instances:
+            if not self._instances[LLMProvider].configure(
+                llm_config.model_name, llm_config.temperature, llm_config.max_tokens
+            ):
+                stale.add(LLMProvider)
+
+        rebuilt = {
+            key
+            for key in self._with_dependents(stale) - {AccountProvider}
+            if key in self._instances
+        }
+        self._retire({key: self._instances.pop(key) for key in rebuilt})
+
+        logger.info(
+            f"Applied config changes to {', '.join(sorted(changed))}; rebuilding "
+            f"{', '.join(sorted(key.__name__ for key in rebuilt)) or 'nothing'}"
+        )
+        return changed
+
+    def _retire(self, instances: Dict[Any, Any]) -> None:
+        """Close replaced services in the background, once work using them is done.
+
+        A NewsBot run or news poll that started before the reload still holds
+        the old instances, so they are only closed after
+        ``scheduler.retired_close_delay_seconds``.
+        """
+        if not instances:
+            return
+        dependents = {key: set(self._dependents.get(key, ())) for key in instances}
+        task = asyncio.create_task(
+            self._close_retired(
+                instances, dependents, self.config.scheduler.retired_close_delay_seconds
+            )
+        )
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _close_retired(
+        self, instances: Dict[Any, Any], dependents: Dict[Any, Set[Any]], delay: float
+    ) -> None:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Shutting down, so close them straight away
+            pass
+        remaining = dict(instances)
+        while remaining:
+            # Dependents first, e.g. the QueryAgent before its HttpCache
+            ready = [
+                key for key in remaining if not dependents[key] & remaining.keys()
+            ] or list(remaining)
+            for key in ready:
+                await self._close_instance(key, remaining.pop(key))
+
+    @staticmethod
+    async def _close_instance(key: Any, instance: Any) -> None:
+        """Close a service if it has anything to close, e.g. an HTTP session or database."""
+        close = getattr(instance, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Failed to close {key.__name__}: {e}")
+
+    async def close(self) -> None:
+        """Close every service on shutdown, including any replaced by a reload."""
+        for task in self._retiring:
+            task.cancel()
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+        instances = dict(self._instances)
+        self._instances.clear()
+        await self._close_retired(
+            instances, {key: set(self._dependents.get(key, ())) for key in instances}, 0
+        )
+
+    def _with_dependents(self, keys: Set[Any]) -> Set[Any]:
+        """The given services and everything built using them."""
+        found: Set[Any] = set()
+        stack = list(keys)
+        while stack:
+            key = stack.pop()
+            if key not in found:
+                found.add(key)
+                stack.extend(self._dependents.get(key, ()))
+        return found
 
     async def health_check(self):
         """Check health of core services."""
@@ -155,10 +575,10 @@ class Container:
     async def get_stats(self):
         """Get statistics for monitoring and debugging."""
         stats = {
-            "environment": self._config.environment,
+            "environment": self.config.environment,
             "config": {
-                "llm_model": self._config.llm.model_name,
-                "llm_temperature": self._config.llm.temperature,
+                "llm_model": self.config.llm.model_name,
+                "llm_temperature": self.config.llm.temperature,
                 # "max_feedback_loops": self._config.workflow.max_feedback_loops,  # commented out - not needed yet
             },
         }
@@ -169,9 +589,24 @@ class Container:
                 stats["api_key_manager"] = await provider.api_key_manager.get_stats()
             stats["llm_provider"] = {
                 "available_keys": await provider.get_available_keys_count(),
-                "provider_type": self._config.llm.provider_type,
+                "provider_type": self.config.llm.provider_type,
             }
         except Exception as e:
             stats["llm_provider_error"] = str(e)
 
+        if LLMWarmup in self._instances:
+            stats["llm_warmup"] = self._instances[LLMWarmup].get_stats()
+
+        if HttpCache in self._instances:
+            stats["http_cache"] = self._instances[HttpCache].get_stats()
+
+        if ArticleCondenser in self._instances:
+            stats["article_condenser"] = self._instances[ArticleCondenser].get_stats()
+
+        if PostDeduplicator in self._instances:
+            stats["post_dedup"] = self._instances[PostDeduplicator].get_stats()
+
+        if AccountProvider in self._instances:
+            stats["account_pool"] = self._instances[AccountProvider].get_pool_stats()
+
         return stats
@@ -1,11 +1,14 @@
 """Configuration loading utilities."""
 
 import json
+import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-from .schemas import AppConfig, LLMConfig, UserConfig
+from .schemas import AppConfig, BotAccount, ConfigSnapshot, LLMConfig, UserConfig
+
+logger = logging.getLogger(__name__)
 
 
 def load_env_file(file_path: Path) -> Dict[str, str]:
@@ -48,16 +51,8 @@ def load_env_file(file_path: Path) -> Dict[str, str]:
     return env_vars
 
 
-def load_user_config_from_env(workspace_path: Path) -> Optional[UserConfig]:
-    """Load user configuration from .env file."""
-    env_file = workspace_path / ".env"
-
-    if not env_file.exists():
-        print("No .env file found - user config will be None")
-        return None
-
-    env_vars = load_env_file(env_file)
-
+def user_config_from_env(env_vars: Dict[str, str]) -> Optional[UserConfig]:
+    """Build the user configuration from .env variables."""
     # Extract user info from environment variables
     user_data = {}
 
@@ -123,6 +118,113 @@ def load_config_from_json(config_path: str = "env.json") -> Dict[str, Any]:
         raise RuntimeError(f"Failed to load configuration: {e}")
 
 
+def load_bot_accounts(bots_path: Path) -> Tuple[BotAccount, ...]:
+    """Load and validate the bot accounts in bots.json, skipping invalid entries.
+
+    Raises:
+        ValueError: If the file isn't valid JSON, or isn't an object with a
+            list of bots
+    """
+    if not bots_path.exists():
+        print(f"No {bots_path} found - there are no bot accounts")
+        return ()
+
+    try:
+        with open(bots_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in {bots_path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("bots", []), list):
+        raise ValueError(f'{bots_path} must be an object with a "bots" list')
+
+    bots = []
+    for bot_data in data.get("bots", []):
+        try:
+            bots.append(BotAccount(**bot_data))
+        except (TypeError, ValueError):
+            print(
+                f"Warning: Bot entry missing required fields (user_name, password, display_name): {bot_data}"
+            )
+    return tuple(bots)
+
+
+class SnapshotLoader:
+    """Reads env.json, .env and bots.json together into one ConfigSnapshot.
+
+    The snapshot is cached against each file's modification time and size,
+    so loading again only touches the disk once something has changed.
+    """
+
+    def __init__(self, config_path: str = "env.json"):
+        """
+        Args:
+            config_path: Path to the main config JSON file, with .env beside it
+        """
+        self.config_path = config_path
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._signature: Optional[Tuple] = None
+
+    def paths(self) -> List[Path]:
+        """The files a snapshot is read from."""
+        bots_path = (
+            self._snapshot.app.accounts.bots_path if self._snapshot else "bots.json"
+        )
+        return [Path(self.config_path), Path(self.config_path).parent / ".env", Path(bots_path)]
+
+    def signature(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """Modification time and size of each file, None for a missing one."""
+        signature = []
+        for path in self.paths():
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def load(self) -> ConfigSnapshot:
+        """The current snapshot, read from disk only if a file changed since the last load.
+
+        Raises:
+            ValueError: If no valid configuration could be loaded
+        """
+        paths = self.paths()
+        signature = self.signature()
+        if self._snapshot is not None and signature == self._signature:
+            return self._snapshot
+
+        try:
+            # Load main config from JSON
+            json_data = load_config_from_json(self.config_path)
+
+            # .env holds the user config and the secrets, e.g. INVITE_CODE
+            env_file = Path(self.config_path).parent / ".env"
+            env_vars = load_env_file(env_file)
+            if not env_file.exists():
+                print("No .env file found - user config will be None")
+            user_config = user_config_from_env(env_vars) if env_vars else None
+
+            # Combine configurations
+            config_data = json_data.copy()
+            if user_config:
+                config_data["user"] = user_config.model_dump()
+
+            # Create and validate the complete configuration
+            app = AppConfig(**config_data)
+        except (FileNotFoundError, ValueError) as json_error:
+            raise ValueError(
+                f"Could not load config from file '{self.config_path}' ({json_error}). "
+                f"Please create a proper config file or set environment variables."
+            )
+
+        bots = load_bot_accounts(Path(app.accounts.bots_path))
+        self._snapshot = ConfigSnapshot(app=app, env=env_vars, bots=bots)
+        # Taken before reading, so an edit made while reading isn't missed,
+        # unless the config moved bots.json
+        self._signature = signature if self.paths() == paths else self.signature()
+        return self._snapshot
+
+
 def load_config(config_path: str = "env.json") -> AppConfig:
     """Load complete application configuration from JSON and .env files.
 
@@ -135,24 +237,75 @@ def load_config(config_path: str = "env.json") -> AppConfig:
     Raises:
         ValueError: If no valid configuration source is found
     """
-    try:
-        # Load main config from JSON
-        json_data = load_config_from_json(config_path)
+    return SnapshotLoader(config_path).load().app
 
-        # Load user config from .env file (if available)
-        workspace_path = Path(config_path).parent
-        user_config = load_user_config_from_env(workspace_path)
 
-        # Combine configurations
-        config_data = json_data.copy()
-        if user_config:
-            config_data["user"] = user_config.model_dump()
+def config_diff(old: AppConfig, new: AppConfig) -> Set[str]:
+    """Settings that differ between two configs.
 
-        # Create and validate the complete configuration
-        return AppConfig(**config_data)
+    Returns:
+        Dotted names such as ``llm.temperature``, or just the name for
+        top-level settings and sections added or removed as a whole
+    """
+    old_data, new_data = old.model_dump(), new.model_dump()
+    changed = set()
+    for name in old_data.keys() | new_data.keys():
+        before, after = old_data.get(name), new_data.get(name)
+        if isinstance(before, dict) and isinstance(after, dict):
+            changed.update(
+                f"{name}.{field}"
+                for field in before.keys() | after.keys()
+                if before.get(field) != after.get(field)
+            )
+        elif before != after:
+            changed.add(name)
+    return changed
 
-    except (FileNotFoundError, ValueError) as json_error:
-        raise ValueError(
-            f"Could not load config from file '{config_path}' ({json_error}). "
-            f"Please create a proper config file or set environment variables."
-        )
+
+class ConfigWatcher:
+    """Reloads the config snapshot when env.json, .env or bots.json change on disk.
+
+    Files are compared by modification time and size on each check, so it
+    can run as a cheap periodic job. A changed snapshot is only passed on
+    once it loads and validates; an invalid edit is logged and the running
+    config is kept.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[ConfigSnapshot], Awaitable[Any]],
+        loader: SnapshotLoader,
+    ):
+        """
+        Args:
+            on_change: Coroutine function called with each valid new snapshot
+            loader: Loader the running snapshot came from
+        """
+        self.on_change = on_change
+        self.loader = loader
+        self._signature = loader.signature()
+        self.reloads = 0
+
+    async def check(self) -> Optional[ConfigSnapshot]:
+        """Reload the snapshot if its files changed since the last check.
+
+        Returns:
+            The new snapshot if one was applied, otherwise None
+        """
+        signature = self.loader.signature()
+        if signature == self._signature:
+            return None
+        # Remembered even if loading fails, so a half-written file is
+        # retried on its next write rather than on every check
+        self._signature = signature
+
+        try:
+            snapshot = self.loader.load()
+        except (ValueError, RuntimeError) as e:
+            logger.error(f"Ignoring config change that failed to load: {e}")
+            return None
+
+        logger.info(f"Config files changed, reloaded {self.loader.config_path}")
+        await self.on_change(snapshot)
+        self.reloads += 1
+        return snapshot
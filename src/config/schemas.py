@@ -1,7 +1,7 @@
 """Configuration schemas with validation."""
 
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, List, Optional, Tuple
 
 
 class LLMConfig(BaseModel):
@@ -13,6 +13,10 @@ class LLMConfig(BaseModel):
     max_tokens: Optional[int] = Field(default=None)
     api_keys: List[str] = Field(min_items=1)
     max_requests_per_key: int = Field(default=15, ge=1, le=100)
+    # Self-test run alongside startup; a pass is trusted for the TTL, even across restarts
+    warmup_enabled: bool = Field(default=True)
+    warmup_ttl_seconds: float = Field(default=6 * 3600, gt=0.0)
+    warmup_retry_seconds: float = Field(default=60.0, gt=0.0)
 
     # TODO actually add these
     @field_validator("provider_type")
@@ -48,6 +52,149 @@ class LLMConfig(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class StorageConfig(BaseModel):
+    """Configuration for the local sqlite database."""
+
+    database_path: str = Field(default="personas.db")
+    ledger_batch_size: int = Field(default=50, ge=1)
+    ledger_flush_interval: float = Field(default=2.0, gt=0.0)
+
+    model_config = {"extra": "forbid"}
+
+
+class AccountsConfig(BaseModel):
+    """Configuration for logging in and managing bot accounts."""
+
+    reuse_sessions: bool = Field(default=True)
+    session_key_path: str = Field(default=".session_key")
+    session_expiry_margin_seconds: int = Field(default=300, ge=0)
+    login_concurrency: int = Field(default=8, ge=1)
+    login_max_attempts: int = Field(default=5, ge=1)
+    login_backoff_base_seconds: float = Field(default=2.0, ge=0.0)
+    login_backoff_max_seconds: float = Field(default=60.0, ge=0.0)
+    lazy_login: bool = Field(default=False)
+    warm_accounts: int = Field(default=2, ge=1)
+    fanout_activations: int = Field(default=2, ge=0)
+    bots_path: str = Field(default="bots.json")
+
+    model_config = {"extra": "forbid"}
+
+
+class OutboxConfig(BaseModel):
+    """Configuration for publishing queued posts and replies."""
+
+    max_attempts: int = Field(default=5, ge=1)
+    base_backoff_seconds: float = Field(default=5.0, gt=0.0)
+    max_backoff_seconds: float = Field(default=300.0, gt=0.0)
+    poll_interval_seconds: float = Field(default=5.0, gt=0.0)
+    dedup_enabled: bool = Field(default=True)
+    dedup_max_distance: int = Field(default=6, ge=0, le=15)
+    dedup_capacity: int = Field(default=10_000, ge=1)
+
+    model_config = {"extra": "forbid"}
+
+
+class SchedulerConfig(BaseModel):
+    """Configuration for the periodic jobs run by the main loop."""
+
+    post_retry_delay_seconds: float = Field(default=10.0, ge=0.0)
+    reply_interval_seconds: float = Field(default=20.0, ge=0.0)
+    replies_per_post: int = Field(default=2, ge=0)
+    response_retry_delay_seconds: float = Field(default=10.0, ge=0.0)
+    response_max_retry_delay_seconds: float = Field(default=120.0, ge=0.0)
+    response_max_attempts: int = Field(default=3, ge=1)
+    health_check_interval_seconds: float = Field(default=300.0, gt=0.0)
+    pipeline_queue_size: int = Field(default=2, ge=1)
+    generate_workers: int = Field(default=1, ge=1)
+    publish_workers: int = Field(default=1, ge=1)
+    reply_workers: int = Field(default=2, ge=1)
+    engage_workers: int = Field(default=1, ge=1)
+    # Under the supervisor, how often each worker engages with posts from the others
+    shared_engage_interval_seconds: float = Field(default=10.0, gt=0.0)
+    # env.json and .env are checked for edits and applied without a restart
+    config_reload_enabled: bool = Field(default=True)
+    config_check_interval_seconds: float = Field(default=5.0, gt=0.0)
+    # Services replaced on reload are closed this long after, so work
+    # already using them can finish first
+    retired_close_delay_seconds: float = Field(default=300.0, ge=0.0)
+
+    model_config = {"extra": "forbid"}
+
+
+class PostingConfig(BaseModel):
+    """Configuration for how often and by which bots posts are made."""
+
+    # The target and max rates pace top-level posts only; replies are sent
+    # as their threads need them, but count towards the per-account limit
+    target_posts_per_hour: float = Field(default=60.0, gt=0.0)
+    max_posts_per_hour: float = Field(default=120.0, gt=0.0)
+    burst: int = Field(default=3, ge=1)
+    account_posts_per_hour: float = Field(default=20.0, gt=0.0)
+    account_burst: int = Field(default=2, ge=1)
+    bot_weights: Dict[str, float] = Field(
+        default_factory=lambda: {"basic": 1.0, "viral": 1.0, "news": 1.0}
+    )
+    adapt_workers: bool = Field(default=True)
+    max_stage_workers: int = Field(default=8, ge=1)
+    report_interval_posts: int = Field(default=10, ge=1)
+
+    @field_validator("bot_weights")
+    def validate_bot_weights(cls, v):
+        allowed_bots = ["basic", "viral", "news"]
+        unknown = [name for name in v if name not in allowed_bots]
+        if unknown:
+            raise ValueError(f"Bot weights must be for: {allowed_bots}, got {unknown}")
+        if any(weight < 0 for weight in v.values()) or not any(v.values()):
+            raise ValueError("Bot weights must be non-negative with at least one positive")
+        return v
+
+    @model_validator(mode="after")
+    def validate_rates(self):
+        if self.max_posts_per_hour < self.target_posts_per_hour:
+            raise ValueError(
+                f"max_posts_per_hour ({self.max_posts_per_hour}) must be at least "
+                f"target_posts_per_hour ({self.target_posts_per_hour})"
+            )
+        return self
+
+    model_config = {"extra": "forbid"}
+
+
+class NewsConfig(BaseModel):
+    """Configuration for fetching news articles."""
+
+    site_url: str = Field(default="https://kingston-herald.legitreal.com")
+    index_path: str = Field(default="/index.html")
+    request_timeout_seconds: float = Field(default=10.0, gt=0.0)
+    max_connections: int = Field(default=10, ge=1)
+    crawl_concurrency: int = Field(default=5, ge=1)
+    cache_enabled: bool = Field(default=True)
+    cache_path: str = Field(default="news_cache.db")
+    cache_max_bytes: int = Field(default=50_000_000, ge=0)
+    index_ttl_seconds: float = Field(default=60.0, ge=0.0)
+    store_enabled: bool = Field(default=True)
+    poll_interval_seconds: float = Field(default=300.0, gt=0.0)
+    rank_enabled: bool = Field(default=True)
+    rank_top_k: int = Field(default=3, ge=1)
+    rank_dimensions: int = Field(default=512, ge=16)
+    condense_enabled: bool = Field(default=True)
+    article_token_budget: int = Field(default=300, ge=16)
+    condense_cache_size: int = Field(default=256, ge=1)
+
+    model_config = {"extra": "forbid"}
+
+
+class BotAccount(BaseModel):
+    """A bot account's login details (from bots.json)."""
+
+    user_name: str = Field(..., min_length=1)
+    password: str = Field(..., min_length=1, repr=False)
+    display_name: str = Field(..., min_length=1)
+
+    # Extra fields in bots.json are kept for whoever wants them
+    model_config = {"extra": "allow", "frozen": True}
+
+
 class UserConfig(BaseModel):
     """Configuration for the user account (from .env)."""
 
@@ -74,6 +221,12 @@ class AppConfig(BaseModel):
     # Core configurations - keep for rubber-duckers project
     llm: LLMConfig = Field(default_factory=LLMConfig)
     user: Optional[UserConfig] = Field(default=None)
+    storage: StorageConfig = Field(default_factory=StorageConfig)
+    outbox: OutboxConfig = Field(default_factory=OutboxConfig)
+    accounts: AccountsConfig = Field(default_factory=AccountsConfig)
+    news: NewsConfig = Field(default_factory=NewsConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
+    posting: PostingConfig = Field(default_factory=PostingConfig)
     # Note: Bot accounts are now managed by AccountProvider, not config
 
     @field_validator("log_level")
@@ -86,3 +239,19 @@ class AppConfig(BaseModel):
     model_config = {
         "extra": "ignore"
     }  # Allow extra fields for AccountProvider migration
+
+
+class ConfigSnapshot(BaseModel):
+    """env.json, .env and bots.json as read together at one point in time."""
+
+    app: AppConfig
+    # Variables from .env, secrets included
+    env: Dict[str, str] = Field(default_factory=dict)
+    bots: Tuple[BotAccount, ...] = Field(default=())
+
+    model_config = {"frozen": True}
+
+    @property
+    def invite_code(self) -> Optional[str]:
+        """Invite code the bot accounts sign up with."""
+        return self.env.get("INVITE_CODE")
@@ -0,0 +1,33 @@
+"""Package exports imported on first access"""
+
+import sys
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Module ``__getattr__`` and ``__dir__`` that import each export when first used.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Exported name to the relative module defining it
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package ``__init__``
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> object:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name], package), name)
+        # Cached, so later lookups don't come back through here
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -2,24 +2,55 @@
 
 import asyncio
 import logging
-from langchain.schema import HumanMessage
-import time
 import random
-from src.config import get_container, load_config
-from src.providers import LLMProvider
-from src.bots import BasicBot, Bot, ViralBot, NewsBot, ResponseBot
-from src.tweeter import TweeterClient, QueryAgent
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from src.config import ConfigSnapshot, ConfigWatcher, SnapshotLoader, get_container
+from src.scheduling import Job, Pipeline, PostRateController, Scheduler, Stage
+from src.providers import LLMWarmup
+from src.bots import BasicBot, Bot, ViralBot, NewsBot, ReplyThreadOrchestrator
+from src.tweeter import (
+    TweeterClient,
+    QueryAgent,
+    Outbox,
+    OutboxPublisher,
+    EngagementQueue,
+    NewsPoller,
+    PostDeduplicator,
+)
+
+
+@dataclass
+class PostThread:
+    """A post moving through the pipeline, with everything published for it."""
+
+    number: int = 0
+    content: str = ""
+    # (post_id, username) of the post, then of each reply
+    published: List[Tuple[int, str]] = field(default_factory=list)
+    # The bot that wrote the post
+    bot: Optional[Bot] = None
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def setup_container():
-    """Initialize the dependency injection container."""
+async def setup_container(loader: SnapshotLoader, shard_index: int = 0, shard_count: int = 1):
+    """Initialize the dependency injection container.
+
+    Args:
+        loader: Loader for env.json, .env and bots.json
+        shard_index: This worker's shard when run under the supervisor
+        shard_count: Number of worker processes
+    """
     try:
-        # Load configuration
-        config = load_config()
+        # Load env.json, .env and bots.json in one pass
+        snapshot = loader.load()
+        config = snapshot.app
         logger.info(f"Loaded config for environment: {config.environment}")
 
         # Set log level from config
@@ -27,8 +58,8 @@ async def setup_container():
 
         # Initialize container (lazy load to avoid circular imports)
         Container = get_container()
-        container = Container()
-        await container.set_config(config)
+        container = Container(shard_index=shard_index, shard_count=shard_count)
+        await container.set_snapshot(snapshot)
 
         logger.info("Container initialized successfully")
         return container
@@ -39,126 +70,275 @@ async def setup_container():
         raise
 
 
-async def test_llm_integration(container) -> None:
-    """Test the LLM integration with key rotation."""
-    logger.info("Testing LLM integration...")
-
-    try:
-        # Get the LLM provider (will be the appropriate one based on config)
-        llm_provider = container.get(LLMProvider)
-
-        # Check health
-        is_healthy = await llm_provider.health_check()
-        logger.info(f"LLM provider health: {is_healthy}")
-
-        if not is_healthy:
-            logger.error("LLM provider is not healthy")
-            return
-
-        # Test a simple invocation
-        test_messages = [HumanMessage(content="Say hello in exactly 5 words.")]
-        response = await llm_provider.invoke(test_messages)
-        logger.info(f"LLM response: {response}")
-
-        # Get stats
-        stats = await container.get_stats()
-        logger.info(f"Container stats: {stats}")
+async def run_bot(shard_index: int = 0, shard_count: int = 1):
+    """Main bot entry point.
 
-    except Exception as e:
-        logger.error(f"LLM integration test failed: {e}")
-        raise
-
-
-async def run_bot():
-    """Main bot entry point."""
+    Args:
+        shard_index: This worker's shard when run under the supervisor
+        shard_count: Number of worker processes
+    """
     logger.info("Starting bot...")
 
+    container = None
     try:
         # Setup dependency injection
-        container = await setup_container()
-        # Test the core LLM functionality
-        print("testing integration")
-        await test_llm_integration(container)
-        print("llm tested")
-
-        logger.info("Bot setup complete")
-
-        basic_bot: Bot = container.get(BasicBot)
-        viral_bot: Bot = container.get(ViralBot)
-        # NewsBot requires async initialization due to QueryAgent dependency
-        news_bot: Bot = await container.get_async(NewsBot)
-        response_bot: Bot = container.get(ResponseBot)
-        logger.info("Bot instance created successfully")
-        tweeter: TweeterClient = await container.get_async(TweeterClient)
-        logger.info("TweeterClient instance created successfully")
+        loader = SnapshotLoader()
+        container = await setup_container(loader, shard_index, shard_count)
+        # The only worker polling the shared news store also prefetches it
+        poll_news = container.config.news.store_enabled and shard_index == 0
 
-        post_count = 0
-        while True:
+        async def prefetch_news():
             try:
-                rand = random.randint(0, 2)
-                if rand == 0:
-                    print("running normal")
-                    bot = basic_bot
-                elif rand == 1:
-                    print("running viral")
-                    bot = viral_bot
-                else:
-                    print("running news bot")
-                    bot = news_bot
-
-                post_count += 1
-                logger.info(f"Starting post generation #{post_count}")
-
-                propaganda = await bot.run_bot()
-                logger.info(f"Content generated ({len(propaganda)} chars)")
-
-                all_post_tuples = []
-                post_id_tuple = await tweeter.make_post(propaganda)
-                logger.info(f"Post #{post_count} successful! Post ID: {post_id_tuple}")
-                all_post_tuples.append(post_id_tuple)
-
-                for i in range(2):
-                    sleep_time = 20
-                    logger.info(
-                        f"Sleeping for {sleep_time} seconds until next reply..."
-                    )
-                    time.sleep(sleep_time)
-                    print("making a reply")
-
-                    while True:
-                        try:
-                            response = await response_bot.run_bot(propaganda)
-                            reply_id_tuple = await tweeter.send_reply(reply=response, post_id=post_id_tuple[0])
-                            all_post_tuples.append(reply_id_tuple)
-                            break
-                        except:
-                            print("response failed, sleeping 10s")
-                            time.sleep(10)
-
-                    print("reply made")
-                
-                print("liking and retweeting whole chain")
-                for post_id_tuple in all_post_tuples:
-                    print(f"like+retweet {post_id_tuple[0]}")
-                    await tweeter.like_and_retweet_with_all_accounts(post_id=post_id_tuple[0], posting_account_username=post_id_tuple[1])
-                    print(f"finished like+retweeting of {post_id_tuple[0]}")
-
-
-                sleep_time = 20
-                logger.info(f"Sleeping for {sleep_time} seconds until next post...")
-                time.sleep(sleep_time)
-
+                news_poller = await container.get_async(NewsPoller)
+                await news_poller.poll_once()
             except Exception as e:
-                logger.error(f"Post #{post_count} failed: {e}")
-                logger.info("Retrying in 10 seconds...")
-                time.sleep(10)
+                logger.warning(f"News prefetch failed, the poll job will retry: {e}")
+
+        scheduler = Scheduler()
+        jobs: Dict[str, Job] = {}
+        # The LLM self-test only reports readiness, so it runs as a job from
+        # the start instead of holding up account logins
+        llm_config = container.config.llm
+        if llm_config.warmup_enabled:
+            jobs["llm_warmup"] = scheduler.add_job(
+                "llm_warmup",
+                lambda: container.get(LLMWarmup).run(),
+                interval=llm_config.warmup_ttl_seconds,
+                retry_delay=llm_config.warmup_retry_seconds,
+            )
+            scheduler.start()
+
+        # Account logins and the news prefetch don't depend on each other,
+        # so they run at once
+        start_time = time.perf_counter()
+        await asyncio.gather(
+            container.initialize(
+                [NewsBot, TweeterClient, OutboxPublisher, ReplyThreadOrchestrator]
+            ),
+            *([prefetch_news()] if poll_news else []),
+        )
+        logger.info(f"Bot setup complete in {time.perf_counter() - start_time:.2f}s")
+
+        # Services are fetched from the container on every use rather than
+        # held here, so any rebuilt by a config reload take effect at once
+        bot_classes = {"basic": BasicBot, "viral": ViralBot, "news": NewsBot}
+        post_count = 0
+
+        def min_workers() -> Dict[str, int]:
+            schedule = container.config.scheduler
+            return {
+                "generate": schedule.generate_workers,
+                "publish": schedule.publish_workers,
+                "reply": schedule.reply_workers,
+                "engage": schedule.engage_workers,
+            }
+
+        async def generate(thread: PostThread):
+            nonlocal post_count
+            weights = container.config.posting.bot_weights
+            bot_names = [name for name in bot_classes if weights.get(name, 0) > 0]
+            bot_name = random.choices(
+                bot_names, weights=[weights[name] for name in bot_names]
+            )[0]
+            bot: Bot = container.get(bot_classes[bot_name])
+
+            post_count += 1
+            thread.number = post_count
+            logger.info(f"Starting post generation #{thread.number} with the {bot_name} bot")
+
+            thread.content = await bot.run_bot()
+            thread.bot = bot
+            logger.info(f"Content generated ({len(thread.content)} chars)")
+            dedup: PostDeduplicator | None = (
+                container.get(PostDeduplicator)
+                if container.config.outbox.dedup_enabled
+                else None
+            )
+            # The check takes a sqlite write lock shared by every worker
+            # process, so it runs off the event loop
+            if dedup is not None and not await asyncio.to_thread(
+                dedup.check_and_add, thread.content
+            ):
+                logger.info("Post too similar to a recent one, dropping it")
+                bot.post_dropped(thread.content)
+                return None
+            return thread
+
+        async def publish(thread: PostThread):
+            # Queue before publishing so a failed post isn't regenerated
+            entry_id = container.get(Outbox).enqueue("post", thread.content)
+            thread.bot.post_queued(thread.content)
+            post_id_tuple = await container.get(OutboxPublisher).publish(entry_id)
+            logger.info(f"Post #{thread.number} successful! Post ID: {post_id_tuple}")
+            thread.published.append(post_id_tuple)
+            rate_controller: PostRateController = container.get(PostRateController)
+            rate_controller.record_published()
+            if thread.number % container.config.posting.report_interval_posts == 0:
+                stats = rate_controller.get_stats()
+                logger.info(
+                    f"Posting at {stats['achieved_per_hour']}/h "
+                    f"against a target of {stats['target_per_hour']}/h"
+                )
+            return thread
+
+        async def reply(thread: PostThread):
+            post_id, username = thread.published[0]
+            reply_threads: ReplyThreadOrchestrator = container.get(ReplyThreadOrchestrator)
+            thread.published.extend(
+                await reply_threads.run(thread.content, post_id, username)
+            )
+            return thread
+
+        async def engage(thread: PostThread):
+            logger.debug(f"Liking and retweeting {len(thread.published)} posts in the thread")
+            if shard_count > 1:
+                # The other workers engage with their own accounts
+                queue: EngagementQueue = container.get(EngagementQueue)
+                for post_id, username in thread.published:
+                    queue.add(post_id, username)
+            tweeter: TweeterClient = container.get(TweeterClient)
+            for post_id, username in thread.published:
+                logger.debug(f"Liking and retweeting {post_id}")
+                await tweeter.like_and_retweet_with_all_accounts(
+                    post_id=post_id, posting_account_username=username
+                )
+                logger.debug(f"Finished liking and retweeting {post_id}")
+            return None
+
+        # Each post moves through the stages on its own, so the next post is
+        # generated while the previous one is still collecting replies
+        schedule = container.config.scheduler
+        queue_size = schedule.pipeline_queue_size
+        pipeline = Pipeline(
+            [
+                Stage("generate", generate, schedule.generate_workers, queue_size),
+                Stage("publish", publish, schedule.publish_workers, queue_size),
+                Stage("reply", reply, schedule.reply_workers, queue_size),
+                Stage("engage", engage, schedule.engage_workers, queue_size),
+            ]
+        )
+
+        async def submit_post():
+            rate_controller: PostRateController = container.get(PostRateController)
+            await rate_controller.wait_turn()
+            posting = container.config.posting
+            if posting.adapt_workers:
+                rate_controller.adapt_workers(
+                    pipeline, min_workers(), posting.max_stage_workers
+                )
+            # Blocks while generation is backed up, so posts never pile up
+            await pipeline.submit(PostThread())
+
+        async def resume_published(entry, result):
+            # Published late by the outbox drain, so it picks up the pipeline
+            # where a post published on time would have: a post still needs
+            # its replies and likes, a reply just its likes
+            thread = PostThread(content=entry.content, published=[result])
+            await pipeline.submit(thread, stage="reply" if entry.kind == "post" else "engage")
+
+        async def engage_shared():
+            tweeter: TweeterClient = container.get(TweeterClient)
+            for post_id, username in container.get(EngagementQueue).take_new():
+                await tweeter.like_and_retweet_with_all_accounts(
+                    post_id=post_id, posting_account_username=username
+                )
+
+        async def report_health():
+            health = await container.health_check()
+            stats = await container.get_stats()
+            stats["jobs"] = scheduler.get_stats()
+            stats["pipeline"] = pipeline.get_stats()
+            stats["posting_rate"] = container.get(PostRateController).get_stats()
+            logger.info(f"Health: {health} Stats: {stats}")
+
+        async def reload_config(snapshot: ConfigSnapshot):
+            changed = await container.apply_snapshot(snapshot)
+            config = container.config
+            logging.getLogger().setLevel(getattr(logging, config.log_level))
+            # Jobs pick up a new interval after their current wait
+            intervals = {
+                "outbox": config.outbox.poll_interval_seconds,
+                "news_poll": config.news.poll_interval_seconds,
+                "health_check": config.scheduler.health_check_interval_seconds,
+                "llm_warmup": config.llm.warmup_ttl_seconds,
+                "config_reload": config.scheduler.config_check_interval_seconds,
+                "shared_engage": config.scheduler.shared_engage_interval_seconds,
+            }
+            for name, interval in intervals.items():
+                if name in jobs:
+                    jobs[name].interval = interval
+            if "llm_warmup" in jobs:
+                jobs["llm_warmup"].retry_delay = config.llm.warmup_retry_seconds
+            jobs["post"].retry_delay = config.scheduler.post_retry_delay_seconds
+            for stage in pipeline.stages:
+                if f"scheduler.{stage.name}_workers" in changed:
+                    stage.resize(min_workers()[stage.name])
+
+        pipeline.start()
+        jobs["post"] = scheduler.add_job(
+            "post",
+            submit_post,
+            # Pacing happens in wait_turn
+            interval=0,
+            retry_delay=schedule.post_retry_delay_seconds,
+        )
+        # Keeps retrying anything generated but not yet published, including
+        # entries left over from a previous run
+        jobs["outbox"] = scheduler.add_job(
+            "outbox",
+            lambda: container.get(OutboxPublisher).drain(on_published=resume_published),
+            interval=container.config.outbox.poll_interval_seconds,
+        )
+        # Ingests new articles in the background for NewsBot; the store is
+        # shared, so under the supervisor only the first worker polls
+        if poll_news:
+            # Already polled once by the prefetch
+            jobs["news_poll"] = scheduler.add_job(
+                "news_poll",
+                lambda: container.get(NewsPoller).poll_once(),
+                interval=container.config.news.poll_interval_seconds,
+                initial_delay=container.config.news.poll_interval_seconds,
+            )
+        # Posts from other workers get this shard's likes and reposts too
+        if shard_count > 1:
+            jobs["shared_engage"] = scheduler.add_job(
+                "shared_engage",
+                engage_shared,
+                interval=schedule.shared_engage_interval_seconds,
+            )
+        jobs["health_check"] = scheduler.add_job(
+            "health_check",
+            report_health,
+            interval=schedule.health_check_interval_seconds,
+            initial_delay=schedule.health_check_interval_seconds,
+        )
+        # Applies edits to env.json and .env without logging in again
+        if schedule.config_reload_enabled:
+            watcher = ConfigWatcher(reload_config, loader)
+            jobs["config_reload"] = scheduler.add_job(
+                "config_reload",
+                watcher.check,
+                interval=schedule.config_check_interval_seconds,
+                initial_delay=schedule.config_check_interval_seconds,
+            )
+
+        await scheduler.run_forever()
 
     except Exception as e:
         logger.error(f"Bot startup failed: {e}")
         return 1
+    finally:
+        # e.g. the QueryAgent's HTTP session and the ledger's pending writes
+        if container is not None:
+            await container.close()
 
     return 0
 
 
+def run_worker(shard_index: int, shard_count: int) -> None:
+    """Entry point for a worker process started by the supervisor."""
+    sys.exit(asyncio.run(run_bot(shard_index, shard_count)))
+
+
 if __name__ == "__main__":
     exit_code = asyncio.run(run_bot())
@@ -1,13 +1,28 @@
-"""Provider interfaces for external services."""
+"""Provider interfaces for external services.
+
+Providers are imported on first access; the LLM SDKs themselves are only
+loaded once a provider makes its first request.
+"""
+
+from src.lazy import lazy_exports
+
+_EXPORTS = {
+    "LLMProvider": ".base",
+    "GoogleLLMProvider": ".google_llm",
+    "APIKeyManager": ".api_key_manager",
+    "KeyUsageStore": ".key_usage",
+    "LLMProviderFactory": ".factory",
+    "LLMWarmup": ".warmup",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
-from .base import LLMProvider
-from .google_llm import GoogleLLMProvider
-from .api_key_manager import APIKeyManager
-from .factory import LLMProviderFactory
 
 __all__ = [
     "LLMProvider",
     "GoogleLLMProvider",
     "APIKeyManager",
+    "KeyUsageStore",
     "LLMProviderFactory",
+    "LLMWarmup",
 ]
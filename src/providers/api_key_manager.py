@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 import logging
-from langchain_google_genai import GoogleGenerativeAI
+from .key_usage import KeyUsageStore
 
 
 logger = logging.getLogger(__name__)
@@ -27,12 +27,18 @@ class APIKeyStats:
 class APIKeyManager:
     """Manages API key rotation, health checking, and usage tracking."""
 
-    def __init__(self, api_keys: List[str], max_usage_per_key: int = 15):
+    def __init__(
+        self,
+        api_keys: List[str],
+        max_usage_per_key: int = 15,
+        usage_store: Optional[KeyUsageStore] = None,
+    ):
         """Initialize the API key manager.
 
         Args:
             api_keys: List of API keys to manage
             max_usage_per_key: Maximum requests per key before rotation
+            usage_store: Usage counts shared with other worker processes, if any
         """
         if not api_keys:
             raise ValueError("At least one API key must be provided")
@@ -41,6 +47,7 @@ class APIKeyManager:
         self._max_usage = max_usage_per_key
         self._current_key_index = 0
         self._lock = asyncio.Lock()
+        self._usage_store = usage_store
 
     async def get_available_key(self) -> str:
         """Get the next available API key with load balancing.
@@ -52,6 +59,10 @@ class APIKeyManager:
             Exception: If no healthy keys are available
         """
         async with self._lock:
+            if self._usage_store is not None:
+                # The shared counts take a sqlite write lock, so off the event loop
+                return await asyncio.to_thread(self._acquire_shared_key)
+
             # Find healthy keys under usage limit
             available_keys = [
                 stats
@@ -81,6 +92,19 @@ class APIKeyManager:
 
             return selected_stats.key
 
+    def _acquire_shared_key(self) -> str:
+        """Pick a key by the usage counts shared across worker processes."""
+        healthy_keys = [key for key, stats in self._keys.items() if stats.is_healthy]
+        key = self._usage_store.acquire(healthy_keys, self._max_usage)
+        if key is None:
+            raise Exception("No healthy API keys available")
+
+        stats = self._keys[key]
+        stats.usage_count += 1
+        stats.last_used = datetime.now()
+        logger.debug(f"Selected shared API key ending in ...{key[-4:]}")
+        return key
+
     async def mark_key_error(self, api_key: str, error: Exception) -> None:
         """Mark an API key as having encountered an error.
 
@@ -132,6 +156,29 @@ class APIKeyManager:
         """
         return sum(1 for stats in self._keys.values() if stats.is_healthy)
 
+    def update_keys(self, api_keys: List[str], max_usage_per_key: int) -> None:
+        """Switch to a new set of keys, keeping the stats of keys already managed.
+
+        Args:
+            api_keys: The full new set of keys
+            max_usage_per_key: Maximum requests per key before rotation
+        """
+        if not api_keys:
+            raise ValueError("At least one API key must be provided")
+        added = [key for key in api_keys if key not in self._keys]
+        removed = [key for key in self._keys if key not in api_keys]
+        for key in removed:
+            del self._keys[key]
+        for key in added:
+            self._keys[key] = APIKeyStats(key=key)
+        self._max_usage = max_usage_per_key
+        if added or removed:
+            logger.info(f"Updated API keys: {len(added)} added, {len(removed)} removed")
+
+    def healthy_keys(self) -> List[str]:
+        """Keys not currently marked unhealthy."""
+        return [key for key, stats in self._keys.items() if stats.is_healthy]
+
     async def get_stats(self) -> Dict[str, Dict]:
         """Get statistics for all API keys.
 
@@ -161,6 +208,8 @@ class APIKeyManager:
         Args:
             api_key: The API key to health check
         """
+        from langchain_google_genai import GoogleGenerativeAI
+
         try:
             # Simple health check with a minimal request
             llm = GoogleGenerativeAI(
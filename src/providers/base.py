@@ -1,16 +1,18 @@
 """Abstract base class for LLM providers."""
 
 from abc import ABC, abstractmethod
-from typing import List
-from langchain.schema import BaseMessage
+from typing import TYPE_CHECKING, List, Optional
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from langchain.schema import BaseMessage
+
 
 class LLMProvider(ABC):
     """Abstract interface for LLM providers with automatic key rotation."""
 
     @abstractmethod
-    async def invoke(self, messages: List[BaseMessage]) -> str:
+    async def invoke(self, messages: List["BaseMessage"]) -> str:
         """Invoke the LLM with automatic key management.
 
         Args:
@@ -26,7 +28,7 @@ class LLMProvider(ABC):
 
     @abstractmethod
     async def schema_invoke(
-        self, messages: List[BaseMessage], schema: BaseModel
+        self, messages: List["BaseMessage"], schema: BaseModel
     ) -> BaseModel:
         """Invoke the LLM with automatic key management.
 
@@ -51,6 +53,20 @@ class LLMProvider(ABC):
         """
         pass
 
+    def configure(self, model_name: str, temperature: float, max_tokens: Optional[int]) -> bool:
+        """Change model settings in place, e.g. on a config reload.
+
+        Returns:
+            True if applied, False if the provider has to be rebuilt instead
+        """
+        return False
+
+    async def warm_up(self) -> None:
+        """Prepare for the first request, e.g. by creating clients ahead of time.
+
+        Does nothing unless a provider overrides it.
+        """
+
     @abstractmethod
     async def get_available_keys_count(self) -> int:
         """Get the number of available API keys.
@@ -1,14 +1,15 @@
 """Google LLM provider implementation with key rotation."""
 
 import asyncio
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import logging
-from langchain.schema import BaseMessage
-from langchain_google_genai import GoogleGenerativeAI, ChatGoogleGenerativeAI
 from pydantic import BaseModel
 from .base import LLMProvider
 from .api_key_manager import APIKeyManager
 
+if TYPE_CHECKING:
+    from langchain.schema import BaseMessage
+
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,50 @@ class GoogleLLMProvider(LLMProvider):
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
+        # Clients by (API key, chat), reused across requests
+        self._clients: Dict[Tuple[str, bool], Any] = {}
+
+    def _client(self, api_key: str, chat: bool = False) -> Any:
+        """The client for an API key, created on first use.
 
-    async def invoke(self, messages: List[BaseMessage]) -> str:
+        Args:
+            api_key: Key the client authenticates with
+            chat: Whether to use the chat model, which supports structured output
+        """
+        client = self._clients.get((api_key, chat))
+        if client is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAI
+
+            llm_kwargs = {
+                "model": self.model_name,
+                "temperature": self.temperature,
+                "google_api_key": api_key,
+            }
+            if self.max_tokens:
+                llm_kwargs["max_tokens"] = self.max_tokens
+            client_class = ChatGoogleGenerativeAI if chat else GoogleGenerativeAI
+            client = self._clients.setdefault((api_key, chat), client_class(**llm_kwargs))
+        return client
+
+    def configure(self, model_name: str, temperature: float, max_tokens: Optional[int]) -> bool:
+        """Switch model settings; clients are recreated with them on next use."""
+        self.model_name = model_name
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self._clients.clear()
+        logger.info(f"LLM settings now {model_name} at temperature {temperature}")
+        return True
+
+    async def warm_up(self) -> None:
+        """Import the SDK and create a client for every healthy key.
+
+        Runs in a thread, since importing the SDK alone takes a couple of
+        seconds that would otherwise block the event loop.
+        """
+        keys = self.api_key_manager.healthy_keys()
+        await asyncio.to_thread(lambda: [self._client(key) for key in keys])
+
+    async def invoke(self, messages: List["BaseMessage"]) -> str:
         """Invoke the Google LLM with automatic key rotation.
 
         Args:
@@ -56,16 +99,7 @@ class GoogleLLMProvider(LLMProvider):
                 # Get a fresh API key for this request
                 api_key = await self.api_key_manager.get_available_key()
 
-                # Create LLM instance with current key
-                llm_kwargs = {
-                    "model": self.model_name,
-                    "temperature": self.temperature,
-                    "google_api_key": api_key,
-                }
-                if self.max_tokens:
-                    llm_kwargs["max_tokens"] = self.max_tokens
-
-                llm = GoogleGenerativeAI(**llm_kwargs)
+                llm = self._client(api_key)
 
                 # Make the request in a thread to avoid blocking
                 response = await asyncio.to_thread(llm.invoke, messages)
@@ -94,7 +128,7 @@ class GoogleLLMProvider(LLMProvider):
         raise Exception(f"All API keys failed. Last error: {last_exception}")
 
     async def schema_invoke(
-        self, messages: List[BaseMessage], schema: BaseModel
+        self, messages: List["BaseMessage"], schema: BaseModel
     ) -> BaseModel:
         """Invoke the Google LLM with structured output and automatic key rotation.
 
@@ -116,17 +150,8 @@ class GoogleLLMProvider(LLMProvider):
                 # Get a fresh API key for this request
                 api_key = await self.api_key_manager.get_available_key()
 
-                # Create LLM instance with current key
-                llm_kwargs = {
-                    "model": self.model_name,
-                    "temperature": self.temperature,
-                    "google_api_key": api_key,
-                }
-                if self.max_tokens:
-                    llm_kwargs["max_tokens"] = self.max_tokens
-
                 # only chatgooglegenerativeai supports structured, generic doesn't
-                llm = ChatGoogleGenerativeAI(**llm_kwargs)
+                llm = self._client(api_key, chat=True)
 
                 # Create structured LLM with schema
                 structured_llm = llm.with_structured_output(schema)
@@ -0,0 +1,84 @@
+"""API key usage counts shared between worker processes"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(api_key: str) -> str:
+    """Keys are stored hashed so the database never holds a usable key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class KeyUsageStore:
+    """sqlite counters that let several processes balance one set of API keys."""
+
+    def __init__(self, db_path: str = "personas.db"):
+        """
+        Args:
+            db_path: sqlite database holding the usage table
+        """
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS api_key_usage (
+                fingerprint TEXT PRIMARY KEY,
+                usage_count INTEGER NOT NULL,
+                updated_at  REAL NOT NULL
+            )
+            """
+        )
+        self._lock = threading.Lock()
+
+    def acquire(self, api_keys: List[str], max_usage: int) -> Optional[str]:
+        """Count a use against the least used key, resetting all once every key is at the limit.
+
+        Args:
+            api_keys: Keys to choose between, e.g. the healthy ones
+            max_usage: Uses per key before rotation
+
+        Returns:
+            The chosen key, or None if api_keys is empty
+        """
+        if not api_keys:
+            return None
+        by_fingerprint = {_fingerprint(key): key for key in api_keys}
+        placeholders = ",".join("?" * len(by_fingerprint))
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two processes
+            # can't both read the same counts and pick the same key
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                counts: Dict[str, int] = dict.fromkeys(by_fingerprint, 0)
+                counts.update(
+                    self._conn.execute(
+                        "SELECT fingerprint, usage_count FROM api_key_usage "
+                        f"WHERE fingerprint IN ({placeholders})",
+                        list(by_fingerprint),
+                    ).fetchall()
+                )
+                if all(count >= max_usage for count in counts.values()):
+                    counts = dict.fromkeys(counts, 0)
+                    logger.info("Reset shared usage counters for all API keys")
+
+                chosen = min(counts, key=counts.get)
+                counts[chosen] += 1
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO api_key_usage (fingerprint, usage_count, updated_at) "
+                    "VALUES (?, ?, ?) ON CONFLICT(fingerprint) DO UPDATE SET "
+                    "usage_count = excluded.usage_count, updated_at = excluded.updated_at",
+                    [(fingerprint, count, now) for fingerprint, count in counts.items()],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        return by_fingerprint[chosen]
@@ -0,0 +1,127 @@
+"""Startup self-test of the LLM provider, run alongside everything else"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.storage import connect
+from .base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+class LLMWarmup:
+    """Warms up the LLM provider and checks it can generate, without gating startup.
+
+    A passing generation is recorded in sqlite per model, so restarts within
+    ``ttl`` seconds of it only warm the clients and skip the request. The
+    outcome is exposed as ``ready`` for health reports rather than holding
+    back account work.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str,
+        db_path: str = "personas.db",
+        ttl: float = 6 * 3600,
+        prompt: str = "Say hello in exactly 5 words.",
+    ):
+        """
+        Args:
+            provider: The LLM provider to warm up
+            model: Provider and model name the cached result belongs to
+            db_path: sqlite database holding the last passing result
+            ttl: Seconds a passing result is trusted for
+            prompt: Generation request made when there is no fresh result
+        """
+        self.provider = provider
+        self.model = model
+        self.ttl = ttl
+        self.prompt = prompt
+        self.ready = False
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_warmup (
+                model      TEXT PRIMARY KEY,
+                checked_at REAL NOT NULL,
+                latency    REAL NOT NULL
+            )
+            """
+        )
+
+    def _cached_age(self) -> Optional[float]:
+        """Seconds since the last passing check, or None if it has expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checked_at FROM llm_warmup WHERE model = ?", (self.model,)
+            ).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[0]
+        return age if age < self.ttl else None
+
+    def _record(self, latency: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO llm_warmup (model, checked_at, latency) VALUES (?, ?, ?)
+                ON CONFLICT (model) DO UPDATE
+                SET checked_at = excluded.checked_at, latency = excluded.latency
+                """,
+                (self.model, time.time(), latency),
+            )
+
+    async def run(self) -> None:
+        """Warm the provider's clients, then test a generation unless one passed recently.
+
+        Raises:
+            RuntimeError: If the provider has no healthy keys or the test failed
+        """
+        try:
+            await self.provider.warm_up()
+
+            # Checked even when the self-test is cached, as the keys may have
+            # been revoked or used up since it passed
+            if not await self.provider.health_check():
+                raise RuntimeError("LLM provider has no healthy API keys")
+
+            age = self._cached_age()
+            if age is not None:
+                logger.info(f"LLM self-test passed {age / 60:.0f} minutes ago, skipping it")
+                self.ready = True
+                self.last_error = None
+                return
+
+            from langchain.schema import HumanMessage
+
+            started = time.perf_counter()
+            response = await self.provider.invoke([HumanMessage(content=self.prompt)])
+            self.last_latency = time.perf_counter() - started
+            self._record(self.last_latency)
+            logger.info(f"LLM self-test passed in {self.last_latency:.2f}s: {response}")
+            self.ready = True
+            self.last_error = None
+        except Exception as e:
+            self.ready = False
+            self.last_error = str(e)
+            raise RuntimeError(f"LLM self-test failed: {e}") from e
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Readiness and the last self-test, for monitoring."""
+        return {
+            "ready": self.ready,
+            "last_latency": round(self.last_latency, 3) if self.last_latency is not None else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,17 @@
+"""Running periodic jobs on the asyncio event loop"""
+
+from .pipeline import Pipeline, Stage
+from .rate import AccountRateLimiter, PostRateController, TokenBucket
+from .scheduler import Job, Scheduler
+from .supervisor import Supervisor
+
+__all__ = [
+    "AccountRateLimiter",
+    "Job",
+    "Pipeline",
+    "PostRateController",
+    "Scheduler",
+    "Stage",
+    "Supervisor",
+    "TokenBucket",
+]
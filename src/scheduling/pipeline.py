@@ -0,0 +1,178 @@
+"""Staged producer/consumer pipeline over bounded asyncio queues"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """A pool of workers taking items from a bounded queue.
+
+    Each handler result is passed on to the next stage; returning None drops
+    the item. A full downstream queue blocks the worker, so a slow stage
+    holds back the stages before it instead of letting work pile up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        queue_size: int = 1,
+    ):
+        """
+        Args:
+            name: Stage name, used in logs and stats
+            handler: Coroutine function processing one item
+            workers: Items processed concurrently
+            queue_size: Items allowed to wait for this stage
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.next: Optional["Stage"] = None
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0
+        self.service_seconds = 0.0
+        self.last_service = 0.0
+        self.ewma_service = 0.0
+        self.blocked_seconds = 0.0
+        self._retiring = 0
+
+    def _spawn(self) -> None:
+        self._tasks.append(
+            asyncio.create_task(self._work(), name=f"{self.name}-{len(self._tasks)}")
+        )
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            self._spawn()
+
+    def resize(self, workers: int) -> None:
+        """Change the worker count; surplus workers retire after their current item."""
+        workers = max(1, workers)
+        self._tasks = [task for task in self._tasks if not task.done()]
+        running = len(self._tasks) - self._retiring
+        if workers > running:
+            cancelled_retirements = min(self._retiring, workers - running)
+            self._retiring -= cancelled_retirements
+            for _ in range(workers - running - cancelled_retirements):
+                self._spawn()
+        else:
+            self._retiring += running - workers
+        self.workers = workers
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            if self._retiring:
+                self._retiring -= 1
+                return
+            item = await self.queue.get()
+            try:
+                self.busy += 1
+                started = time.monotonic()
+                try:
+                    result = await self.handler(item)
+                    self.processed += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    result = None
+                    logger.error(f"Stage {self.name} failed: {e}")
+                finally:
+                    self.busy -= 1
+                    self.last_service = time.monotonic() - started
+                    self.service_seconds += self.last_service
+                    self.ewma_service = (
+                        self.last_service
+                        if self.ewma_service == 0
+                        else 0.8 * self.ewma_service + 0.2 * self.last_service
+                    )
+
+                if result is not None and self.next is not None:
+                    started = time.monotonic()
+                    await self.next.queue.put(result)
+                    self.blocked_seconds += time.monotonic() - started
+            finally:
+                # Only after handing on, so joining a stage covers its output
+                self.queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and service times, for monitoring."""
+        handled = self.processed + self.failed
+        return {
+            "queue_depth": self.queue.qsize(),
+            "busy_workers": self.busy,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "mean_service_seconds": round(self.service_seconds / handled, 3) if handled else 0.0,
+            "last_service_seconds": round(self.last_service, 3),
+            "ewma_service_seconds": round(self.ewma_service, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+
+class Pipeline:
+    """Stages chained in order, each feeding the next."""
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Args:
+            stages: Stages in processing order
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next = next_stage
+
+    async def submit(self, item: Any, stage: Optional[str] = None) -> None:
+        """Feed an item to a stage, waiting while its queue is full.
+
+        Args:
+            item: The item to process
+            stage: Name of the stage to start at, the first one by default
+        """
+        if stage is None:
+            await self.stages[0].queue.put(item)
+            return
+        for candidate in self.stages:
+            if candidate.name == stage:
+                await candidate.queue.put(item)
+                return
+        raise ValueError(f"No pipeline stage named {stage!r}")
+
+    def start(self) -> None:
+        for stage in self.stages:
+            stage.start()
+        logger.info(
+            "Pipeline started: "
+            + " -> ".join(f"{stage.name} x{stage.workers}" for stage in self.stages)
+        )
+
+    async def join(self) -> None:
+        """Wait until every submitted item has passed through every stage."""
+        for stage in self.stages:
+            await stage.queue.join()
+
+    async def stop(self) -> None:
+        for stage in self.stages:
+            await stage.stop()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage queue depth and service times."""
+        return {stage.name: stage.get_stats() for stage in self.stages}
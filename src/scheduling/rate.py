@@ -0,0 +1,232 @@
+"""Rate-targeted posting with token-bucket limits"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Collection, Deque, Dict, Optional, Set
+
+from .pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows ``rate`` events per second on average, in bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens the bucket holds, i.e. the largest burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        """Take tokens if there are enough, without waiting."""
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def update_rate(self, rate: float, capacity: float) -> None:
+        """Change the limit, keeping the tokens already in the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens the bucket holds
+        """
+        # Tokens earned so far are counted at the old rate
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until enough tokens will be available."""
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    async def consume(self, tokens: float = 1.0) -> None:
+        """Take tokens, waiting for them to refill if needed."""
+        while not self.try_consume(tokens):
+            await asyncio.sleep(self.wait_time(tokens))
+
+
+class AccountRateLimiter:
+    """A token bucket per account, created full the first time an account is seen."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Actions per second allowed for each account
+            capacity: Largest burst of actions for each account
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, username: str) -> TokenBucket:
+        if username not in self._buckets:
+            self._buckets[username] = TokenBucket(self.rate, self.capacity)
+        return self._buckets[username]
+
+    def update_rate(self, rate: float, capacity: float) -> None:
+        """Change the limit for every account, keeping what each has left.
+
+        Args:
+            rate: Actions per second allowed for each account
+            capacity: Largest burst of actions for each account
+        """
+        self.rate = rate
+        self.capacity = capacity
+        for bucket in self._buckets.values():
+            bucket.update_rate(rate, capacity)
+
+    def exhausted(self) -> Set[str]:
+        """Accounts with no token available right now."""
+        return {
+            username
+            for username, bucket in self._buckets.items()
+            if bucket.wait_time() > 0
+        }
+
+    def consume(self, username: str) -> None:
+        """Count an action against an account, even if it overdraws the bucket."""
+        bucket = self._bucket(username)
+        if not bucket.try_consume():
+            bucket.tokens -= 1
+
+    def wait_time(self, exclude: Collection[str] = ()) -> float:
+        """Seconds until the first exhausted account has a token again.
+
+        Args:
+            exclude: Accounts whose refill would not help, e.g. ones that
+                can't be leased anyway
+        """
+        waits = [
+            wait
+            for username, bucket in self._buckets.items()
+            if username not in exclude and (wait := bucket.wait_time()) > 0
+        ]
+        return min(waits, default=0.0)
+
+
+class PostRateController:
+    """Paces new posts to a target rate under a global token-bucket limit.
+
+    Posts are due on a fixed-rate schedule, so time spent waiting on a busy
+    pipeline is made up afterwards (up to a burst's worth) rather than
+    pushing every later post back. Stage worker counts can follow the
+    measured stage latency, using Little's law, so that slower LLM calls
+    run more generations in parallel instead of lowering the rate.
+    """
+
+    def __init__(
+        self,
+        target_per_hour: float,
+        max_per_hour: float,
+        burst: int = 3,
+        window: float = 3600.0,
+    ):
+        """
+        Args:
+            target_per_hour: Posts per hour to aim for
+            max_per_hour: Hard limit on posts per hour across all accounts
+            burst: Posts that may go out back to back when catching up
+            window: Seconds over which the achieved rate is measured
+        """
+        self.target_per_hour = target_per_hour
+        self.burst = burst
+        self.window = window
+        self.global_bucket = TokenBucket(max_per_hour / 3600.0, burst)
+        self._period = 3600.0 / target_per_hour
+        self._next_due: Optional[float] = None
+        self._started = time.monotonic()
+        self._published: Deque[float] = deque()
+
+    async def wait_turn(self) -> None:
+        """Wait until the next post is due and the global limit allows it."""
+        now = time.monotonic()
+        if self._next_due is None:
+            self._next_due = now
+        # Never try to make up more than a burst's worth of lost time
+        self._next_due = max(self._next_due, now - self._period * self.burst)
+        delay = self._next_due - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.global_bucket.consume()
+        self._next_due += self._period
+
+    def update_rates(self, target_per_hour: float, max_per_hour: float, burst: int) -> None:
+        """Change the target and limit, keeping the schedule and achieved rate.
+
+        Args:
+            target_per_hour: Posts per hour to aim for
+            max_per_hour: Hard limit on posts per hour across all accounts
+            burst: Posts that may go out back to back when catching up
+        """
+        self.target_per_hour = target_per_hour
+        self.burst = burst
+        self.global_bucket.update_rate(max_per_hour / 3600.0, burst)
+        self._period = 3600.0 / target_per_hour
+
+    def record_published(self) -> None:
+        """Count a published post towards the achieved rate."""
+        self._published.append(time.monotonic())
+        self._trim()
+
+    def _trim(self) -> None:
+        cutoff = time.monotonic() - self.window
+        while self._published and self._published[0] < cutoff:
+            self._published.popleft()
+
+    def achieved_per_hour(self) -> float:
+        """Posts per hour published over the measurement window."""
+        self._trim()
+        elapsed = min(self.window, time.monotonic() - self._started)
+        if elapsed <= 0:
+            return 0.0
+        return len(self._published) * 3600.0 / elapsed
+
+    def adapt_workers(self, pipeline: Pipeline, min_workers: Dict[str, int], max_workers: int) -> None:
+        """Size each stage for the target rate given its measured latency.
+
+        Args:
+            pipeline: The posting pipeline
+            min_workers: Configured worker count per stage, used as a floor
+            max_workers: Ceiling on workers for any stage
+        """
+        rate = self.target_per_hour / 3600.0
+        for stage in pipeline.stages:
+            if stage.ewma_service <= 0:
+                continue
+            # Little's law: items in service = arrival rate x time in service
+            needed = math.ceil(rate * stage.ewma_service * 1.2)
+            workers = max(min_workers.get(stage.name, 1), min(needed, max_workers))
+            if workers != stage.workers:
+                logger.info(
+                    f"Resizing stage {stage.name} from {stage.workers} to {workers} workers "
+                    f"({stage.ewma_service:.1f}s per item)"
+                )
+                stage.resize(workers)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Achieved against target rate, for monitoring."""
+        return {
+            "target_per_hour": self.target_per_hour,
+            "achieved_per_hour": round(self.achieved_per_hour(), 1),
+            "published_in_window": len(self._published),
+        }
@@ -0,0 +1,127 @@
+"""Asyncio scheduler for named periodic jobs"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """A coroutine run repeatedly, waiting between runs."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float
+    retry_delay: Optional[float] = None
+    initial_delay: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    last_duration: float = 0.0
+    last_error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    async def run(self) -> None:
+        """Run the job forever; the wait starts once the previous run finishes."""
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            started = time.monotonic()
+            try:
+                await self.func()
+                delay = self.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                delay = self.retry_delay if self.retry_delay is not None else self.interval
+                logger.error(f"Job {self.name} failed, next run in {delay:g}s: {e}")
+            finally:
+                self.runs += 1
+                self.last_duration = time.monotonic() - started
+            await asyncio.sleep(delay)
+
+
+class Scheduler:
+    """Runs named periodic jobs as tasks sharing one event loop.
+
+    Jobs only ever wait with ``asyncio.sleep``, so any number of them, and
+    anything else on the loop, make progress while one is idle.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        retry_delay: Optional[float] = None,
+        initial_delay: float = 0.0,
+    ) -> Job:
+        """Register a periodic job, starting it straight away if the scheduler is running.
+
+        Args:
+            name: Unique job name, used in logs and stats
+            func: Coroutine function run on each tick
+            interval: Seconds to wait after a successful run
+            retry_delay: Seconds to wait after a failed run, defaults to interval
+            initial_delay: Seconds to wait before the first run
+
+        Returns:
+            The registered job
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job {name} is already scheduled")
+        job = Job(name, func, interval, retry_delay, initial_delay)
+        self._jobs[name] = job
+        if self.running:
+            self._start(job)
+        return job
+
+    @property
+    def running(self) -> bool:
+        return any(job.task is not None for job in self._jobs.values())
+
+    def _start(self, job: Job) -> None:
+        job.task = asyncio.create_task(job.run(), name=job.name)
+
+    def start(self) -> None:
+        """Start every registered job that isn't already running."""
+        for job in self._jobs.values():
+            if job.task is None:
+                self._start(job)
+        logger.info(f"Scheduler started jobs: {', '.join(self._jobs)}")
+
+    async def stop(self) -> None:
+        """Cancel every job and wait for them to finish."""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            job.task = None
+
+    async def run_forever(self) -> None:
+        """Start the jobs and wait on them until cancelled."""
+        self.start()
+        try:
+            await asyncio.gather(*(job.task for job in self._jobs.values()))
+        finally:
+            await self.stop()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Runs, failures and last duration per job, for monitoring."""
+        return {
+            name: {
+                "runs": job.runs,
+                "failures": job.failures,
+                "last_duration": round(job.last_duration, 3),
+                "last_error": job.last_error,
+            }
+            for name, job in self._jobs.items()
+        }
@@ -0,0 +1,173 @@
+"""Supervisor running the bot as several worker processes"""
+
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Worker:
+    """Bookkeeping for one supervised process."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.failures = 0
+        self.restart_at: Optional[float] = 0.0
+
+
+class Supervisor:
+    """Starts one process per shard and restarts any that crash.
+
+    A worker that keeps crashing soon after starting, e.g. on a bad config
+    or a missing bots file, will fail the same way however often it is
+    restarted, so the supervisor stops everything and exits non-zero.
+
+    Workers share nothing in memory; they coordinate through the sqlite
+    database (ledger, outbox, dedup index, news store and key usage).
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int, int], None],
+        workers: int,
+        restart_backoff: float = 5.0,
+        max_restart_backoff: float = 300.0,
+        stable_after: float = 60.0,
+        max_fast_failures: int = 5,
+    ):
+        """
+        Args:
+            target: Picklable function run in each worker as target(index, count)
+            workers: Number of worker processes
+            restart_backoff: Delay in seconds before the first restart, doubled
+                on each consecutive crash
+            max_restart_backoff: Upper bound on the restart delay in seconds
+            stable_after: Seconds a worker must run for its crash count to reset
+            max_fast_failures: Crashes in a row, each within stable_after of
+                starting, after which the supervisor gives up
+        """
+        if workers < 1:
+            raise ValueError("The supervisor needs at least one worker")
+        self.target = target
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stable_after = stable_after
+        self.max_fast_failures = max_fast_failures
+        self._exit_code = 0
+        self._workers: Dict[int, _Worker] = {i: _Worker(i) for i in range(workers)}
+        # Spawn rather than fork so no locks or sockets leak into workers
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = threading.Event()
+
+    def _start(self, worker: _Worker) -> None:
+        worker.process = self._context.Process(
+            target=self.target,
+            args=(worker.index, len(self._workers)),
+            name=f"worker-{worker.index}",
+        )
+        worker.process.start()
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+        logger.info(f"Started worker {worker.index} (pid {worker.process.pid})")
+
+    def _check(self, worker: _Worker) -> None:
+        """Start a worker that is due, or schedule a restart for one that died."""
+        now = time.monotonic()
+        if worker.restart_at is not None:
+            if now >= worker.restart_at:
+                if worker.process is not None:
+                    worker.restarts += 1
+                self._start(worker)
+            return
+
+        process = worker.process
+        if process is None or process.is_alive():
+            return
+        if process.exitcode == 0:
+            logger.info(f"Worker {worker.index} exited cleanly")
+            worker.process = None
+            return
+
+        if now - worker.started_at >= self.stable_after:
+            worker.failures = 0
+        worker.failures += 1
+        if worker.failures >= self.max_fast_failures:
+            logger.error(
+                f"Worker {worker.index} died with exit code {process.exitcode}, "
+                f"{worker.failures} times in a row soon after starting; giving up"
+            )
+            worker.process = None
+            self._exit_code = 1
+            self.stop()
+            return
+        delay = min(
+            self.restart_backoff * 2 ** (worker.failures - 1), self.max_restart_backoff
+        )
+        worker.restart_at = now + delay
+        logger.error(
+            f"Worker {worker.index} died with exit code {process.exitcode}, "
+            f"restarting in {delay:.0f}s"
+        )
+
+    def stop(self, *_) -> None:
+        """Ask the supervisor loop to shut the workers down."""
+        self._stopping.set()
+
+    def run(self) -> int:
+        """Supervise until stopped or every worker exits cleanly.
+
+        Returns:
+            Process exit code
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        logger.info(f"Supervising {len(self._workers)} workers")
+        try:
+            while not self._stopping.is_set():
+                for worker in self._workers.values():
+                    self._check(worker)
+                if all(
+                    worker.process is None and worker.restart_at is None
+                    for worker in self._workers.values()
+                ):
+                    return self._exit_code
+                self._stopping.wait(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._shutdown()
+        return self._exit_code
+
+    def _shutdown(self, timeout: float = 10.0) -> None:
+        processes = [
+            worker.process
+            for worker in self._workers.values()
+            if worker.process is not None and worker.process.is_alive()
+        ]
+        for process in processes:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        if processes:
+            logger.info(f"Stopped {len(processes)} workers")
+
+    def get_stats(self) -> Dict[int, Dict[str, object]]:
+        """Pid, liveness and restart counts per worker."""
+        return {
+            worker.index: {
+                "pid": worker.process.pid if worker.process else None,
+                "alive": bool(worker.process and worker.process.is_alive()),
+                "restarts": worker.restarts,
+            }
+            for worker in self._workers.values()
+        }
@@ -0,0 +1,5 @@
+"""Local sqlite persistence shared by the ledger, outbox and caches"""
+
+from .database import connect
+
+__all__ = ["connect"]
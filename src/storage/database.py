@@ -0,0 +1,24 @@
+"""Connection helper for the local sqlite database."""
+
+import sqlite3
+from pathlib import Path
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open a sqlite connection tuned for many small appends.
+
+    WAL lets readers carry on while a batch is being written, and
+    synchronous=NORMAL is durable across process crashes in WAL mode.
+
+    Args:
+        db_path: Path to the sqlite database file
+
+    Returns:
+        An open connection in autocommit mode, usable from executor threads
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
@@ -1,9 +1,44 @@
-"""For accessing news and posting"""
+"""For accessing news and posting
+
+Classes are imported on first access, so e.g. using the outbox doesn't load
+numpy for the article ranker.
+"""
+
+from src.lazy import lazy_exports
+
+_EXPORTS = {
+    "TweeterClient": ".poster",
+    "QueryAgent": ".query",
+    "CrawlResult": ".query",
+    "ActionLedger": ".ledger",
+    "EngagementQueue": ".engagement",
+    "Outbox": ".outbox",
+    "OutboxPublisher": ".outbox",
+    "HttpCache": ".http_cache",
+    "NewsStore": ".news_store",
+    "NewsPoller": ".news_store",
+    "ArticleRanker": ".relevance",
+    "ArticleCondenser": ".condense",
+    "CondensedArticle": ".condense",
+    "PostDeduplicator": ".dedup",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
-from .poster import TweeterClient
-from .query import QueryAgent
 
 __all__ = [
     "TweeterClient",
     "QueryAgent",
+    "CrawlResult",
+    "ActionLedger",
+    "EngagementQueue",
+    "Outbox",
+    "OutboxPublisher",
+    "HttpCache",
+    "NewsStore",
+    "NewsPoller",
+    "ArticleRanker",
+    "ArticleCondenser",
+    "CondensedArticle",
+    "PostDeduplicator",
 ]
@@ -0,0 +1,143 @@
+"""Extractive condensing of news articles to a prompt token budget"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends followed by whitespace and something that can start a sentence
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)]*\s+(?=[\"'“‘(A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]{3,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count, at about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class CondensedArticle:
+    """An article trimmed to a token budget."""
+
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class ArticleCondenser:
+    """Trims articles to their most informative sentences within a token budget.
+
+    Sentences are scored by how many of the article's frequent words they
+    contain, with a bias towards the lead since news puts the key facts
+    first. The best sentences that fit the budget are kept in their original
+    order. Results are cached per article text.
+    """
+
+    def __init__(self, max_tokens: int = 300, lead_weight: float = 1.0, cache_size: int = 256):
+        """
+        Args:
+            max_tokens: Token budget for a condensed article
+            lead_weight: How strongly early sentences are preferred
+            cache_size: Condensed articles kept in memory
+        """
+        self.max_tokens = max_tokens
+        self.lead_weight = lead_weight
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, CondensedArticle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.total_tokens_saved = 0
+
+    def condense(self, text: str) -> CondensedArticle:
+        """Condense an article, reusing the cached result for text seen before."""
+        key = hashlib.sha1(text.encode()).hexdigest()
+        with self._lock:
+            condensed = self._cache.get(key)
+            if condensed is not None:
+                self._cache.move_to_end(key)
+
+        if condensed is None:
+            condensed = self._condense(text)
+            with self._lock:
+                self._cache[key] = condensed
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        with self._lock:
+            self.calls += 1
+            self.total_tokens_saved += condensed.tokens_saved
+        logger.info(
+            f"Condensed article from {condensed.original_tokens} to "
+            f"{condensed.tokens} tokens (saved {condensed.tokens_saved})"
+        )
+        return condensed
+
+    def _condense(self, text: str) -> CondensedArticle:
+        text = text.strip()
+        original_tokens = estimate_tokens(text)
+        if original_tokens <= self.max_tokens:
+            return CondensedArticle(text, original_tokens, original_tokens)
+
+        sentences = self._split_sentences(text)
+        scores = self._score(sentences)
+
+        chosen = []
+        used = 0
+        for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            cost = estimate_tokens(sentences[index]) + 1
+            if used + cost <= self.max_tokens:
+                chosen.append(index)
+                used += cost
+
+        if chosen:
+            condensed = " ".join(sentences[i] for i in sorted(chosen))
+        else:
+            # Not even one sentence fits; cut the lead at a word boundary
+            condensed = text[: self.max_tokens * 4].rsplit(" ", 1)[0]
+        return CondensedArticle(condensed, original_tokens, estimate_tokens(condensed))
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        sentences = []
+        for paragraph in text.splitlines():
+            sentences.extend(
+                sentence.strip()
+                for sentence in _SENTENCE_END.split(paragraph)
+                if sentence.strip()
+            )
+        return sentences
+
+    def _score(self, sentences: List[str]) -> List[float]:
+        """Mean article frequency of each sentence's words, plus a lead bonus."""
+        words = [_WORD.findall(sentence.lower()) for sentence in sentences]
+        frequencies = Counter(word for sentence_words in words for word in set(sentence_words))
+        top = max(frequencies.values(), default=1)
+
+        scores = []
+        for position, sentence_words in enumerate(words):
+            if sentence_words:
+                content = sum(frequencies[word] for word in sentence_words) / (
+                    len(sentence_words) * top
+                )
+            else:
+                content = 0.0
+            lead = self.lead_weight / (1 + position)
+            scores.append(content + lead)
+        return scores
+
+    def get_stats(self) -> Dict[str, int]:
+        """Calls and tokens saved so far, for monitoring."""
+        return {
+            "calls": self.calls,
+            "tokens_saved": self.total_tokens_saved,
+            "cached": len(self._cache),
+        }
@@ -0,0 +1,208 @@
+"""Near-duplicate detection for generated posts"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_BITS = 64
+
+
+def normalise(text: str) -> str:
+    """Lowercase words only, so case, punctuation and spacing don't matter."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of the normalised text, for exact duplicate checks."""
+    return hashlib.sha1(normalise(text).encode()).hexdigest()
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over words and word pairs.
+
+    Texts sharing most of their words get signatures a few bits apart.
+    """
+    words = normalise(text).split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+
+    totals = [0] * _BITS
+    for feature in features:
+        hashed = _feature_hash(feature)
+        for bit in range(_BITS):
+            totals[bit] += 1 if hashed >> bit & 1 else -1
+
+    signature = 0
+    for bit, total in enumerate(totals):
+        if total > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def _to_signed(value: int) -> int:
+    """sqlite integers are signed 64-bit."""
+    return value - (1 << _BITS) if value >= 1 << (_BITS - 1) else value
+
+
+class PostDeduplicator:
+    """Rejects generated posts too similar to recent ones.
+
+    Signatures are kept in a bounded LSH index: each signature is split into
+    bands, and a candidate is only compared against signatures sharing a
+    band. With ``max_distance + 1`` bands, any signature within
+    ``max_distance`` bits must match exactly in at least one of them. The
+    index is written to sqlite so it survives restarts, and signatures added
+    by other worker processes are picked up before every check.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "personas.db",
+        max_distance: int = 6,
+        capacity: int = 10_000,
+    ):
+        """
+        Args:
+            db_path: sqlite database holding the post signatures
+            max_distance: Differing bits at or under which posts count as duplicates
+            capacity: Recent signatures kept in the index, oldest evicted first
+        """
+        self.max_distance = max_distance
+        self.capacity = capacity
+        self._band_count = max_distance + 1
+        self._band_width = _BITS // self._band_count
+        self._bands: List[Dict[int, Set[int]]] = [{} for _ in range(self._band_count)]
+        self._signatures: Dict[int, int] = {}
+        self._order: Deque[int] = deque()
+        self.rejected = 0
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS post_signatures (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                signature  INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        rows = self._conn.execute(
+            "SELECT id, signature FROM post_signatures ORDER BY id DESC LIMIT ?",
+            (capacity,),
+        ).fetchall()
+        for signature_id, signature in reversed(rows):
+            self._index(signature_id, signature)
+        # Rows that fell out of the index are never read again
+        if rows:
+            self._conn.execute("DELETE FROM post_signatures WHERE id < ?", (rows[-1][0],))
+
+    def _band_keys(self, signature: int) -> List[int]:
+        mask = (1 << self._band_width) - 1
+        return [signature >> (band * self._band_width) & mask for band in range(self._band_count)]
+
+    def _index(self, signature_id: int, signature: int) -> None:
+        signature &= (1 << _BITS) - 1
+        self._last_id = max(self._last_id, signature_id)
+        for band, key in zip(self._bands, self._band_keys(signature)):
+            band.setdefault(key, set()).add(signature_id)
+        self._signatures[signature_id] = signature
+        self._order.append(signature_id)
+
+        while len(self._order) > self.capacity:
+            evicted = self._order.popleft()
+            evicted_signature = self._signatures.pop(evicted)
+            for band, key in zip(self._bands, self._band_keys(evicted_signature)):
+                bucket = band[key]
+                bucket.discard(evicted)
+                if not bucket:
+                    del band[key]
+
+    def _nearest(self, signature: int) -> Optional[Tuple[int, int]]:
+        candidates = set()
+        for band, key in zip(self._bands, self._band_keys(signature)):
+            candidates |= band.get(key, set())
+        best = None
+        for candidate in candidates:
+            distance = bin(self._signatures[candidate] ^ signature).count("1")
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (candidate, distance)
+        return best
+
+    def _sync(self) -> None:
+        """Index signatures other processes have added since the last check."""
+        for signature_id, signature in self._conn.execute(
+            "SELECT id, signature FROM post_signatures WHERE id > ? ORDER BY id",
+            (self._last_id,),
+        ).fetchall():
+            self._index(signature_id, signature)
+
+    def is_duplicate(self, text: str) -> bool:
+        """Check whether text is within max_distance of a recent post."""
+        signature = simhash(text)
+        with self._lock:
+            self._sync()
+            return self._nearest(signature) is not None
+
+    def _add(self, signature: int) -> None:
+        cursor = self._conn.execute(
+            "INSERT INTO post_signatures (signature, created_at) VALUES (?, ?)",
+            (_to_signed(signature), time.time()),
+        )
+        self._index(cursor.lastrowid, signature)
+        if len(self._order) == self.capacity and cursor.lastrowid % self.capacity == 0:
+            # Trim evicted rows now and then rather than on every insert
+            self._conn.execute(
+                "DELETE FROM post_signatures WHERE id < ?", (self._order[0],)
+            )
+
+    def check_and_add(self, text: str) -> bool:
+        """Remember a post unless it duplicates a recent one.
+
+        Returns:
+            True if the post is new and was added, False if it was rejected
+        """
+        signature = simhash(text)
+        with self._lock:
+            # The write lock keeps another process from adding a near-copy
+            # between this check and the insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                nearest = self._nearest(signature)
+                if nearest is None:
+                    self._add(signature)
+                self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        if nearest is not None:
+            self.rejected += 1
+            logger.info(f"Rejected post {nearest[1]} bits from an earlier one: {text[:60]!r}")
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Indexed signatures and rejections, for monitoring."""
+        return {"indexed": len(self._signatures), "rejected": self.rejected}
@@ -0,0 +1,86 @@
+"""Posts shared between worker processes so every shard engages with them"""
+
+import logging
+import threading
+import time
+from typing import List, Tuple
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+
+class EngagementQueue:
+    """sqlite log of published posts, read by the other worker processes.
+
+    Under the supervisor each worker only holds its own shard of the
+    accounts, so a post's likes and reposts would otherwise come from one
+    shard alone. The posting worker adds each post here; the others take
+    the posts they haven't seen and fan out with their own accounts.
+    """
+
+    def __init__(self, db_path: str = "personas.db", shard_index: int = 0, retention: float = 86400.0):
+        """
+        Args:
+            db_path: sqlite database holding the queue table
+            shard_index: This worker's shard, whose own posts are skipped
+            retention: Seconds posts are kept for workers that fall behind
+        """
+        self.shard_index = shard_index
+        self.retention = retention
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS engagement_queue (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                post_id    INTEGER NOT NULL,
+                username   TEXT NOT NULL,
+                shard      INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._lock = threading.Lock()
+        # Only posts published after startup; earlier ones were engaged with
+        # when they were new, and the ledger skips anything already done
+        self._last_id = self._conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM engagement_queue"
+        ).fetchone()[0]
+
+    def add(self, post_id: int, username: str) -> None:
+        """Share a post this worker published with the other workers."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO engagement_queue (post_id, username, shard, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (post_id, username, self.shard_index, now),
+            )
+            self._conn.execute(
+                "DELETE FROM engagement_queue WHERE created_at < ?", (now - self.retention,)
+            )
+
+    def take_new(self) -> List[Tuple[int, str]]:
+        """Posts other workers published since the last call, oldest first.
+
+        Returns:
+            (post_id, posting username) pairs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, post_id, username, shard FROM engagement_queue "
+                "WHERE id > ? ORDER BY id",
+                (self._last_id,),
+            ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [
+            (post_id, username)
+            for _, post_id, username, shard in rows
+            if shard != self.shard_index
+        ]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,69 @@
+"""Classifying failures from the Twooter SDK and LLM providers"""
+
+import asyncio
+import random
+from typing import Optional
+
+TIMEOUT = "timeout"
+RATE_LIMITED = "rate_limited"
+AUTH = "auth"
+CONFLICT = "conflict"
+SERVER = "server"
+CLIENT = "client"
+UNKNOWN = "unknown"
+
+# Worth another attempt; the rest will fail the same way again
+RETRYABLE = {TIMEOUT, RATE_LIMITED, AUTH, SERVER, UNKNOWN}
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """Pull the HTTP status out of an SDK exception, if it carries one."""
+    return getattr(error, "status_code", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+
+
+def classify_error(error: BaseException) -> str:
+    """Sort an exception into one of the error classes above."""
+    status = status_code(error)
+    if status is not None:
+        if status == 429:
+            return RATE_LIMITED
+        if status in (401, 403):
+            return AUTH
+        if status == 409:
+            return CONFLICT
+        if status >= 500:
+            return SERVER
+        if status >= 400:
+            return CLIENT
+
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    if isinstance(error, ConnectionError):
+        return SERVER
+
+    # LLM providers only raise plain exceptions, so go by the message
+    message = str(error).lower()
+    if any(hint in message for hint in ("quota", "rate limit", "resource exhausted", "api keys")):
+        return RATE_LIMITED
+    if "timed out" in message or "timeout" in message:
+        return TIMEOUT
+    return UNKNOWN
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is worth another attempt."""
+    return classify_error(error) in RETRYABLE
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Exponential backoff with a little jitter.
+
+    Args:
+        attempt: Attempts made so far, from 1
+        base: Delay in seconds after the first attempt, doubled each time
+        maximum: Upper bound on the delay before jitter
+    """
+    delay = min(base * 2 ** (attempt - 1), maximum)
+    return delay * random.uniform(0.8, 1.2)
@@ -0,0 +1,57 @@
+"""Pulls article links and paragraph text out of news pages with lxml"""
+
+from functools import lru_cache
+from typing import List
+
+_POST_LINKS = '//a[starts-with(@href, "/post")]/@href'
+_PARAGRAPHS = "//p"
+
+
+@lru_cache(maxsize=None)
+def _xpath(path: str):
+    """Compile an XPath once, importing lxml on first use rather than on import."""
+    from lxml import etree
+
+    # lxml builds its tree in C, which is what makes this faster than
+    # BeautifulSoup, but it is still a full parse of the page
+    return etree.XPath(path)
+
+
+def _parse(content: bytes):
+    """Parse a page, preferring UTF-8 and falling back to lxml's own detection."""
+    from lxml import html as lxml_html
+
+    try:
+        return lxml_html.document_fromstring(content.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        # Not UTF-8, or an XML declaration lxml refuses in str input
+        return lxml_html.document_fromstring(content)
+
+
+def extract_post_links(content: bytes, site_url: str) -> List[str]:
+    """Absolute URLs of every link whose href starts with /post, in page order.
+
+    Args:
+        content: Raw HTML of the index page
+        site_url: Base URL prepended to the relative links
+
+    Returns:
+        List of article URLs
+    """
+    if not content.strip():
+        return []
+    return [site_url + href for href in _xpath(_POST_LINKS)(_parse(content))]
+
+
+def extract_article(content: bytes) -> str:
+    """Text of every <p> on a page, each preceded by a newline.
+
+    Args:
+        content: Raw HTML of an article page
+
+    Returns:
+        The article text
+    """
+    if not content.strip():
+        return ""
+    return "".join("\n" + paragraph.text_content() for paragraph in _xpath(_PARAGRAPHS)(_parse(content)))
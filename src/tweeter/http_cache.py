@@ -0,0 +1,163 @@
+"""On-disk HTTP cache for news pages"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """A cached page body with the validators needed to revalidate it."""
+
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def age(self) -> float:
+        """Seconds since the body was fetched or last revalidated."""
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, max_age: Optional[float]) -> bool:
+        """Whether the body can be served without revalidating it."""
+        return max_age is None or self.age() < max_age
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET of this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """sqlite-backed page cache, evicting least recently used pages past a size limit."""
+
+    def __init__(self, db_path: str = "news_cache.db", max_bytes: int = 50_000_000):
+        """
+        Args:
+            db_path: sqlite database holding cached pages
+            max_bytes: Total body size kept before evicting
+        """
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url           TEXT PRIMARY KEY,
+                body          BLOB NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                fetched_at    REAL NOT NULL,
+                accessed_at   REAL NOT NULL,
+                size          INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS http_cache_lru ON http_cache (accessed_at)"
+        )
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM http_cache"
+        ).fetchone()[0]
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[CachedResponse]:
+        """Look up a cached page, marking it recently used.
+
+        Only a fresh page counts as a hit; a stale one is counted as such and
+        becomes a hit if the conditional refetch gets a 304 (see touch).
+
+        Args:
+            url: Page to look up
+            max_age: Seconds the page is fresh for; None means always fresh
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE http_cache SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            cached = CachedResponse(url, *row)
+            if cached.is_fresh(max_age):
+                self.hits += 1
+            else:
+                self.stale += 1
+        return cached
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a page, evicting old pages if the cache is over its size limit."""
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark a page as revalidated, e.g. after a 304."""
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+
+    def _evict(self) -> None:
+        """Drop least recently used pages until under the size limit."""
+        evicted = []
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM http_cache ORDER BY accessed_at"
+        ).fetchall():
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((url,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM http_cache WHERE url = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} pages from the HTTP cache")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/stale/miss counts and current size, for monitoring."""
+        return {
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "bytes": self._total_bytes,
+        }
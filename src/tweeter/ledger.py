@@ -0,0 +1,134 @@
+"""Durable ledger of engagement actions so restarts don't repeat them"""
+
+import logging
+import threading
+import time
+from typing import Dict, Set, Tuple
+
+from src.storage import connect
+
+logger = logging.getLogger(__name__)
+
+LedgerKey = Tuple[str, int, str]
+
+
+class ActionLedger:
+    """Append-only record of (account, post_id, action) triples.
+
+    Writes are buffered in memory and flushed in a single transaction once the
+    batch fills up or the flush interval passes, so the fan-out never waits on
+    a commit per action. Buffered entries are still visible to lookups.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "personas.db",
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+    ):
+        """
+        Args:
+            db_path: sqlite database holding the ledger table
+            batch_size: Pending actions that trigger a flush
+            flush_interval: Seconds after which pending actions are flushed anyway
+        """
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS action_ledger (
+                account    TEXT NOT NULL,
+                post_id    INTEGER NOT NULL,
+                action     TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (post_id, account, action)
+            ) WITHOUT ROWID
+            """
+        )
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: Dict[LedgerKey, float] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get_performed(self, post_id: int) -> Set[Tuple[str, str]]:
+        """Get every (account, action) already recorded for a post.
+
+        Args:
+            post_id: The post being engaged with
+
+        Returns:
+            Set of (account, action) pairs, including unflushed ones
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT account, action FROM action_ledger WHERE post_id = ?",
+                (post_id,),
+            ).fetchall()
+            performed = {(account, action) for account, action in rows}
+            performed.update(
+                (account, action)
+                for account, pending_post_id, action in self._pending
+                if pending_post_id == post_id
+            )
+        return performed
+
+    def has_performed(self, account: str, post_id: int, action: str) -> bool:
+        """Check whether an account already performed an action on a post."""
+        key = (account, post_id, action)
+        with self._lock:
+            if key in self._pending:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM action_ledger WHERE post_id = ? AND account = ? AND action = ?",
+                (post_id, account, action),
+            ).fetchone()
+        return row is not None
+
+    def record(self, account: str, post_id: int, action: str) -> None:
+        """Record a completed action, flushing if the batch is due."""
+        with self._lock:
+            self._pending.setdefault((account, post_id, action), time.time())
+            due = (
+                len(self._pending) >= self._batch_size
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending actions in one transaction.
+
+        Returns:
+            Number of actions written
+        """
+        with self._lock:
+            if not self._pending:
+                self._last_flush = time.monotonic()
+                return 0
+            batch = [
+                (account, post_id, action, created_at)
+                for (account, post_id, action), created_at in self._pending.items()
+            ]
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO action_ledger (account, post_id, action, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.error(f"Failed to flush {len(batch)} ledger entries: {e}")
+                raise
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+
+        logger.debug(f"Flushed {len(batch)} actions to the ledger")
+        return len(batch)
+
+    def close(self) -> None:
+        """Flush anything pending and close the database."""
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,314 @@
+"""Incrementally ingested news articles with a full-text index"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.storage import connect
+from .dedup import content_hash
+from .query import QueryAgent
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w{3,}")
+
+
+def match_any(terms: List[str]) -> str:
+    """An FTS5 match expression for articles containing any word of the terms."""
+    words = dict.fromkeys(_WORD.findall(" ".join(terms).lower()))
+    return " OR ".join(f'"{word}"' for word in words)
+
+
+@dataclass
+class StoredArticle:
+    """An ingested article."""
+
+    id: int
+    url: str
+    body: str
+    fetched_at: float
+    used_at: Optional[float]
+    claimed_at: Optional[float] = None
+
+
+class NewsStore:
+    """sqlite store of every article seen, with an FTS5 index over the text.
+
+    Articles are written once by NewsPoller and read by NewsBot, so picking an
+    article for a post is a local indexed query rather than a scrape. An
+    article is claimed while a post is written from it and only marked used
+    once the post is queued, so a failed generation doesn't use it up.
+    """
+
+    _COLUMNS = "id, url, body, fetched_at, used_at, claimed_at"
+
+    def __init__(self, db_path: str = "personas.db", claim_ttl: float = 600.0):
+        """
+        Args:
+            db_path: sqlite database holding the article tables
+            claim_ttl: Seconds a claim holds before the article can be picked
+                again, e.g. after a crash mid-generation
+        """
+        self.claim_ttl = claim_ttl
+        self._conn = connect(db_path)
+        has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'news_articles_fts'"
+        ).fetchone()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS news_articles (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                url        TEXT NOT NULL UNIQUE,
+                body       TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                used_at    REAL
+            );
+            CREATE TABLE IF NOT EXISTS news_seen_urls (
+                url     TEXT PRIMARY KEY,
+                reason  TEXT NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS news_articles_unused
+                ON news_articles (fetched_at DESC, id) WHERE used_at IS NULL;
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+                body, content='news_articles', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS news_articles_fts_insert
+                AFTER INSERT ON news_articles BEGIN
+                    INSERT INTO news_articles_fts (rowid, body) VALUES (new.id, new.body);
+                END;
+            CREATE TRIGGER IF NOT EXISTS news_articles_fts_delete
+                AFTER DELETE ON news_articles BEGIN
+                    INSERT INTO news_articles_fts (news_articles_fts, rowid, body)
+                    VALUES ('delete', old.id, old.body);
+                END;
+            """
+        )
+        if not has_fts:
+            # Articles stored while the index didn't exist, e.g. by an earlier version
+            self._conn.execute(
+                "INSERT INTO news_articles_fts (news_articles_fts) VALUES ('rebuild')"
+            )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(news_articles)")}
+        if "content_hash" not in columns:
+            self._conn.execute("ALTER TABLE news_articles ADD COLUMN content_hash TEXT")
+        if "claimed_at" not in columns:
+            self._conn.execute("ALTER TABLE news_articles ADD COLUMN claimed_at REAL")
+        # The same story republished under another url is ingested once
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS news_articles_content "
+            "ON news_articles (content_hash)"
+        )
+        self._lock = threading.Lock()
+
+    def filter_new(self, urls: List[str]) -> List[str]:
+        """The subset of urls not yet ingested or rejected, in their original order."""
+        if not urls:
+            return []
+        with self._lock:
+            placeholders = ",".join("?" * len(urls))
+            known = {
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT url FROM news_articles WHERE url IN ({placeholders}) "
+                    f"UNION SELECT url FROM news_seen_urls WHERE url IN ({placeholders})",
+                    urls + urls,
+                )
+            }
+        return [url for url in dict.fromkeys(urls) if url not in known]
+
+    def add_many(self, articles: List[Tuple[str, str]]) -> int:
+        """Ingest a batch of (url, body) pairs in one transaction.
+
+        The batch shares a timestamp, so within it index order is kept.
+
+        Articles with an empty body, or whose content is already stored under
+        another url, are not added but their urls are remembered, so that
+        filter_new doesn't report them as new on every poll.
+
+        Returns:
+            Number of articles added; urls or content already stored are skipped
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for url, body in articles:
+                    if not body:
+                        self._remember_rejected(url, "empty", now)
+                        continue
+                    inserted = self._conn.execute(
+                        "INSERT OR IGNORE INTO news_articles "
+                        "(url, body, fetched_at, content_hash) VALUES (?, ?, ?, ?)",
+                        (url, body, now, content_hash(body)),
+                    ).rowcount
+                    if not inserted:
+                        self._remember_rejected(url, "duplicate", now)
+                    added += inserted
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def _remember_rejected(self, url: str, reason: str, now: float) -> None:
+        """Record a url that was fetched but not stored; call with the lock held."""
+        self._conn.execute(
+            "INSERT OR IGNORE INTO news_seen_urls (url, reason, seen_at) "
+            "SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM news_articles WHERE url = ?)",
+            (url, reason, now, url),
+        )
+
+    def get(self, article_id: int) -> Optional[StoredArticle]:
+        """Look up an article by id."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM news_articles WHERE id = ?", (article_id,)
+            ).fetchone()
+        return StoredArticle(*row) if row else None
+
+    def get_many(self, article_ids: List[int]) -> List[StoredArticle]:
+        """Look up articles by id; ids not stored are left out."""
+        if not article_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM news_articles "
+                f"WHERE id IN ({','.join('?' * len(article_ids))})",
+                article_ids,
+            ).fetchall()
+        return [StoredArticle(*row) for row in rows]
+
+    def is_claimable(self, article: StoredArticle) -> bool:
+        """Whether an article is neither used nor under a live claim."""
+        return article.used_at is None and (
+            article.claimed_at is None or article.claimed_at < time.time() - self.claim_ttl
+        )
+
+    def pick_unused(self) -> Optional[StoredArticle]:
+        """The newest article not used or claimed, in index order within a poll."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM news_articles WHERE used_at IS NULL "
+                "AND (claimed_at IS NULL OR claimed_at < ?) "
+                "ORDER BY fetched_at DESC, id LIMIT 1",
+                (time.time() - self.claim_ttl,),
+            ).fetchone()
+        return StoredArticle(*row) if row else None
+
+    def get_unused_after(self, article_id: int) -> List[StoredArticle]:
+        """Unused articles with an id greater than article_id, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM news_articles "
+                "WHERE id > ? AND used_at IS NULL ORDER BY id",
+                (article_id,),
+            ).fetchall()
+        return [StoredArticle(*row) for row in rows]
+
+    def claim(self, article_id: int) -> bool:
+        """Reserve an article while a post is written from it.
+
+        Returns:
+            False if the article is used or claimed, e.g. by another worker process
+        """
+        now = time.time()
+        with self._lock:
+            return bool(
+                self._conn.execute(
+                    "UPDATE news_articles SET claimed_at = ? WHERE id = ? AND used_at IS NULL "
+                    "AND (claimed_at IS NULL OR claimed_at < ?)",
+                    (now, article_id, now - self.claim_ttl),
+                ).rowcount
+            )
+
+    def release(self, article_id: int) -> None:
+        """Give up a claim, so the article can be picked again."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE news_articles SET claimed_at = NULL WHERE id = ? AND used_at IS NULL",
+                (article_id,),
+            )
+
+    def mark_used(self, article_id: int) -> bool:
+        """Record that an article went into a queued post.
+
+        Returns:
+            False if the article was already used
+        """
+        with self._lock:
+            return bool(
+                self._conn.execute(
+                    "UPDATE news_articles SET used_at = ? WHERE id = ? AND used_at IS NULL",
+                    (time.time(), article_id),
+                ).rowcount
+            )
+
+    def search(
+        self, query: str, limit: int = 10, available_only: bool = False
+    ) -> List[StoredArticle]:
+        """Full-text search over article bodies, best match first.
+
+        Args:
+            query: An FTS5 match expression, e.g. from match_any
+            limit: Maximum articles returned
+            available_only: Leave out articles that are used or claimed
+        """
+        where = "news_articles_fts MATCH ?"
+        params: List[object] = [query]
+        if available_only:
+            where += " AND a.used_at IS NULL AND (a.claimed_at IS NULL OR a.claimed_at < ?)"
+            params.append(time.time() - self.claim_ttl)
+        columns = ", ".join(f"a.{column.strip()}" for column in self._COLUMNS.split(","))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM news_articles_fts "
+                "JOIN news_articles a ON a.id = news_articles_fts.rowid "
+                f"WHERE {where} ORDER BY rank LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        return [StoredArticle(*row) for row in rows]
+
+    def count_unused(self) -> int:
+        """Number of articles not yet used in a post."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM news_articles WHERE used_at IS NULL"
+            ).fetchone()[0]
+
+
+class NewsPoller:
+    """Periodically ingests articles newly linked from the news index."""
+
+    def __init__(self, query_agent: QueryAgent, news_store: NewsStore):
+        """
+        Args:
+            query_agent: Fetches the index and article pages
+            news_store: Where new articles are written
+        """
+        self.query_agent = query_agent
+        self.news_store = news_store
+
+    async def poll_once(self) -> int:
+        """Fetch and store articles not seen before.
+
+        Returns:
+            Number of articles added
+        """
+        links = self.news_store.filter_new(await self.query_agent.get_post_links())
+        if not links:
+            return 0
+
+        results = await self.query_agent.crawl_news(links=links)
+        # Failed fetches are left out so the next poll retries them
+        added = self.news_store.add_many(
+            [(result.url, result.article) for result in results if result.article is not None]
+        )
+        logger.info(
+            f"Ingested {added} new articles ({self.news_store.count_unused()} unused)"
+        )
+        return added
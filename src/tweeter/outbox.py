@@ -0,0 +1,345 @@
+"""Persistent outbox between content generation and publishing"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Collection, List, Optional, Tuple
+
+from src.account_providers import NoAccountAvailable
+from src.storage import connect
+from .errors import backoff_delay, classify_error, is_retryable
+from .poster import TweeterClient
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+@dataclass
+class OutboxEntry:
+    """A generated post or reply waiting to be published."""
+
+    id: int
+    kind: str
+    content: str
+    parent_id: Optional[int]
+    status: str
+    attempts: int
+    next_attempt_at: float
+    last_error: Optional[str]
+    result_id: Optional[int]
+    result_username: Optional[str]
+    # Accounts a reply must never come from, e.g. the parent post's author
+    exclude_accounts: Tuple[str, ...] = ()
+
+
+class Outbox:
+    """sqlite-backed queue of generated content.
+
+    Content is written here as soon as the LLM returns it, so a failed publish
+    or a crash never throws generated text away. Delivery is at-least-once: a
+    crash between the server accepting a post and ``mark_sent`` resends it.
+    """
+
+    _COLUMNS = (
+        "id, kind, content, parent_id, status, attempts, next_attempt_at, "
+        "last_error, result_id, result_username, exclude_accounts"
+    )
+
+    def __init__(self, db_path: str = "personas.db", worker_id: str = "main"):
+        """
+        Args:
+            db_path: sqlite database holding the outbox table
+            worker_id: Name of this process, recorded on the entries it claims
+        """
+        self.worker_id = worker_id
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id              INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind            TEXT NOT NULL,
+                content         TEXT NOT NULL,
+                parent_id       INTEGER,
+                status          TEXT NOT NULL,
+                attempts        INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error      TEXT,
+                result_id       INTEGER,
+                result_username TEXT,
+                created_at      REAL NOT NULL,
+                updated_at      REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "claimed_by" not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN claimed_by TEXT")
+        if "exclude_accounts" not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN exclude_accounts TEXT")
+        self._lock = threading.Lock()
+
+        # Anything this worker was mid-send on when it last died goes back in
+        # the queue; other workers' in-flight entries are left alone
+        recovered = self._conn.execute(
+            "UPDATE outbox SET status = ? WHERE status = ? "
+            "AND (claimed_by = ? OR claimed_by IS NULL)",
+            (PENDING, SENDING, worker_id),
+        ).rowcount
+        if recovered:
+            logger.info(f"Recovered {recovered} in-flight outbox entries")
+
+    def enqueue(
+        self,
+        kind: str,
+        content: str,
+        parent_id: Optional[int] = None,
+        exclude_accounts: Collection[str] = (),
+    ) -> int:
+        """Store generated content for publishing.
+
+        Args:
+            kind: "post" or "reply"
+            content: The generated text
+            parent_id: Post being replied to, for replies
+            exclude_accounts: Usernames a reply must never be sent from,
+                however it ends up being published
+
+        Returns:
+            The outbox entry id
+        """
+        if kind not in ("post", "reply"):
+            raise ValueError(f"Unknown outbox entry kind: {kind}")
+        if kind == "reply" and parent_id is None:
+            raise ValueError("Replies need a parent_id")
+
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (kind, content, parent_id, status, next_attempt_at, "
+                "created_at, updated_at, exclude_accounts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    content,
+                    parent_id,
+                    PENDING,
+                    now,
+                    now,
+                    now,
+                    json.dumps(sorted(exclude_accounts)) if exclude_accounts else None,
+                ),
+            )
+        return cursor.lastrowid
+
+    def get(self, entry_id: int) -> Optional[OutboxEntry]:
+        """Look up a single entry."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM outbox WHERE id = ?", (entry_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        *fields, exclude_accounts = row
+        return OutboxEntry(*fields, tuple(json.loads(exclude_accounts or "[]")))
+
+    def claim(self, entry_id: int) -> Optional[OutboxEntry]:
+        """Mark a pending entry as being sent, regardless of its backoff.
+
+        Returns:
+            The claimed entry, or None if it isn't pending
+        """
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE outbox SET status = ?, claimed_by = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (SENDING, self.worker_id, time.time(), entry_id, PENDING),
+            ).rowcount
+        return self.get(entry_id) if claimed else None
+
+    def claim_due(self, limit: int = 10) -> List[OutboxEntry]:
+        """Claim pending entries whose backoff has expired, oldest first."""
+        now = time.time()
+        with self._lock:
+            ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM outbox WHERE status = ? AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (PENDING, now, limit),
+                )
+            ]
+        return [entry for entry in map(self.claim, ids) if entry]
+
+    def release(self, entry_id: int) -> None:
+        """Put a claimed entry back in the queue without counting an attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (PENDING, time.time(), entry_id, SENDING),
+            )
+
+    def mark_sent(self, entry_id: int, result_id: int, result_username: str) -> None:
+        """Record a successful publish."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, "
+                "result_id = ?, result_username = ?, updated_at = ? WHERE id = ?",
+                (SENT, result_id, result_username, time.time(), entry_id),
+            )
+
+    def mark_failed(
+        self, entry_id: int, error: str, retry_at: Optional[float] = None
+    ) -> None:
+        """Record a failed publish.
+
+        Args:
+            entry_id: The entry that failed
+            error: Description of the failure
+            retry_at: When to try again, or None to give up on the entry
+        """
+        status = PENDING if retry_at is not None else FAILED
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?, "
+                "next_attempt_at = COALESCE(?, next_attempt_at), updated_at = ? WHERE id = ?",
+                (status, error, retry_at, time.time(), entry_id),
+            )
+
+    def count_by_status(self) -> dict:
+        """Get the number of entries in each status, for monitoring."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+
+class OutboxPublisher:
+    """Publishes outbox entries through TweeterClient, retrying with backoff."""
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        tweeter_client: TweeterClient,
+        max_attempts: int = 5,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        Args:
+            outbox: Where generated content is queued
+            tweeter_client: Client used to publish
+            max_attempts: Attempts before an entry is marked failed
+            base_backoff: Delay in seconds after the first failure, doubled each time
+            max_backoff: Upper bound on the retry delay in seconds
+        """
+        self.outbox = outbox
+        self.tweeter_client = tweeter_client
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    async def publish(
+        self, entry_id: int, exclude_accounts: Collection[str] = ()
+    ) -> Tuple[int, str]:
+        """Publish an entry right now, leaving it queued for retry on failure.
+
+        Args:
+            entry_id: The entry to publish
+            exclude_accounts: Usernames a reply must not be sent from
+
+        Returns:
+            (post_id, username) of the published post or reply
+
+        Raises:
+            NoAccountAvailable: If no account could send it; the entry is
+                left pending without counting an attempt
+            Exception: If the entry can't be claimed or the publish fails
+        """
+        entry = self.outbox.claim(entry_id)
+        if entry is None:
+            raise Exception(f"Outbox entry {entry_id} is not pending")
+        return await self._send(entry, exclude_accounts)
+
+    async def drain(
+        self,
+        on_published: Optional[
+            Callable[[OutboxEntry, Tuple[int, str]], Awaitable[None]]
+        ] = None,
+    ) -> int:
+        """Publish every entry that is due.
+
+        Args:
+            on_published: Called with each entry published and its
+                (post_id, username), e.g. to give a late post its replies
+
+        Returns:
+            Number of entries published
+        """
+        published = 0
+        while True:
+            entries = self.outbox.claim_due()
+            if not entries:
+                if published:
+                    logger.info(f"Outbox published {published} queued entries")
+                return published
+            for index, entry in enumerate(entries):
+                try:
+                    result = await self._send(entry)
+                    published += 1
+                except NoAccountAvailable as e:
+                    # Nothing else can be sent either until an account frees up
+                    for unsent in entries[index + 1 :]:
+                        self.outbox.release(unsent.id)
+                    logger.warning(f"Outbox drain stopped, no account to publish with: {e}")
+                    return published
+                except Exception:
+                    # Already logged and rescheduled by _send
+                    continue
+                if on_published is not None:
+                    await on_published(entry, result)
+
+    async def _send(
+        self, entry: OutboxEntry, exclude_accounts: Collection[str] = ()
+    ) -> Tuple[int, str]:
+        """Send a claimed entry and record the outcome."""
+        try:
+            if entry.kind == "reply":
+                result = await self.tweeter_client.send_reply(
+                    reply=entry.content,
+                    post_id=entry.parent_id,
+                    exclude_accounts=set(entry.exclude_accounts) | set(exclude_accounts),
+                )
+            else:
+                result = await self.tweeter_client.make_post(entry.content)
+        except NoAccountAvailable:
+            # Not a failed publish, so it doesn't use up an attempt
+            self.outbox.release(entry.id)
+            raise
+        except Exception as e:
+            attempts = entry.attempts + 1
+            if attempts >= self.max_attempts or not is_retryable(e):
+                logger.error(
+                    f"Outbox entry {entry.id} failed ({classify_error(e)}) "
+                    f"after {attempts} attempts, giving up: {e}"
+                )
+                self.outbox.mark_failed(entry.id, str(e))
+            else:
+                delay = backoff_delay(attempts, self.base_backoff, self.max_backoff)
+                logger.warning(
+                    f"Outbox entry {entry.id} failed (attempt {attempts}), "
+                    f"retrying in {delay:.0f}s: {e}"
+                )
+                self.outbox.mark_failed(entry.id, str(e), retry_at=time.time() + delay)
+            raise
+
+        self.outbox.mark_sent(entry.id, result[0], result[1])
+        return result
@@ -1,17 +1,46 @@
 """Files for the twooter API interface"""
 
-import twooter.sdk
-from twooter import Twooter
 import asyncio
 import functools
 import logging
-from typing import Tuple
+from typing import TYPE_CHECKING, Collection, Optional, Tuple
+from src.account_providers import Account, NoAccountAvailable
+from .errors import AUTH, classify_error, status_code
+from .ledger import ActionLedger
+from src.scheduling import AccountRateLimiter
+
+if TYPE_CHECKING:
+    from twooter import Twooter
 logger = logging.getLogger(__name__)
 
 
+def _is_auth_failure(error: BaseException) -> bool:
+    """Whether the server rejected the account's session."""
+    return classify_error(error) == AUTH
+
+
 class TweeterClient:
-    def __init__(self, account_provider):
+    def __init__(
+        self,
+        account_provider,
+        action_ledger: Optional[ActionLedger] = None,
+        account_limiter: Optional[AccountRateLimiter] = None,
+        action_timeout: float = 15.0,
+        fanout_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            account_provider: Pool of logged in accounts
+            action_ledger: Record of likes and reposts already done
+            account_limiter: Per-account limit on posts and replies
+            action_timeout: Seconds allowed for each like or repost
+            fanout_timeout: Seconds allowed for a whole like/repost fan-out
+        """
         self.account_provider = account_provider
+        self.action_ledger = action_ledger
+        self.account_limiter = account_limiter
+        self.action_timeout = action_timeout
+        self.fanout_timeout = fanout_timeout
         """
         existence_check = tweeter.user_get(name)
         if not existence_check:
@@ -22,55 +51,95 @@ class TweeterClient:
         self, post_id: int, posting_account_username: str
     ):
         """Helper method to auto-like and repost a post with all accounts except the posting account."""
-        accounts = self.account_provider.get_all_accounts()
+        # A lazy provider also logs in a few more of its accounts
+        accounts = await self.account_provider.fanout_accounts()
         logger.info(f"Starting auto-like/repost with {len(accounts)} accounts...")
 
         loop = asyncio.get_event_loop()
         tasks = []
 
-        for i, tweeter_bot in enumerate(accounts):
+        # Skip anything a previous run already did for this post
+        performed = (
+            self.action_ledger.get_performed(post_id) if self.action_ledger else set()
+        )
+        skipped_actions = 0
+
+        for i, account in enumerate(accounts):
             try:
-                bot_info = tweeter_bot.user_me()
-                bot_username = bot_info["data"]["username"]
+                tweeter_bot = account.tweeter
+                bot_username = account.username
 
                 # Always like
-                logger.info(f"Account #{i + 1} ({bot_username}) - QUEUED for like")
-                like_task = asyncio.wait_for(
-                    loop.run_in_executor(None, functools.partial(tweeter_bot.post_like, post_id)),
-                    timeout=15.0,
-                )
-                tasks.append((i, bot_username, "like", like_task))
+                if (bot_username, "like") in performed:
+                    skipped_actions += 1
+                else:
+                    logger.info(f"Account #{i + 1} ({bot_username}) - QUEUED for like")
+                    like_task = asyncio.ensure_future(asyncio.wait_for(
+                        loop.run_in_executor(None, functools.partial(tweeter_bot.post_like, post_id)),
+                        timeout=self.action_timeout,
+                    ))
+                    tasks.append((i, bot_username, "like", like_task))
 
                 # Repost only if not the posting account
-                if bot_username != posting_account_username:
+                if (bot_username, "repost") in performed:
+                    skipped_actions += 1
+                elif bot_username != posting_account_username:
                     logger.info(f"Account #{i + 1} ({bot_username}) - QUEUED for repost")
-                    repost_task = asyncio.wait_for(
+                    repost_task = asyncio.ensure_future(asyncio.wait_for(
                         loop.run_in_executor(None, functools.partial(tweeter_bot.post_repost, post_id)),
-                        timeout=15.0,
-                    )
+                        timeout=self.action_timeout,
+                    ))
                     tasks.append((i, bot_username, "repost", repost_task))
 
             except Exception as e:
                 logger.error(f"Failed to get info for account #{i + 1}: {e}")
 
+        if skipped_actions:
+            logger.info(
+                f"Skipping {skipped_actions} actions already in the ledger for post {post_id}"
+            )
+
         # Execute all tasks with an overall timeout to prevent infinite hanging
         if tasks:
             try:
-                # Add overall timeout for the entire gather operation
+                # Overall timeout for the fan-out; actions that finished by then
+                # are still recorded, so the next run doesn't repeat them
                 logger.info(f"Executing {len(tasks)} like/repost tasks...")
-                results = await asyncio.wait_for(
-                    asyncio.gather(*(t[3] for t in tasks), return_exceptions=True),
-                    timeout=60.0  # Overall timeout for all operations
+                accounts_by_name = {account.username: account for account in accounts}
+                done, pending = await asyncio.wait(
+                    [task for _, _, _, task in tasks], timeout=self.fanout_timeout
                 )
-                
+                if pending:
+                    logger.error(
+                        f"Overall like/repost operation timed out after {self.fanout_timeout:.0f} "
+                        f"seconds for post {post_id}, cancelling {len(pending)} actions"
+                    )
+                    for task in pending:
+                        task.cancel()
+
                 # Log results for each task
                 successful_actions = 0
-                for (i, username, action, _), result in zip(tasks, results):
+                for i, username, action, task in tasks:
+                    if task not in done:
+                        result = asyncio.TimeoutError()
+                    else:
+                        result = task.exception() or task.result()
                     if isinstance(result, Exception):
                         if isinstance(result, asyncio.TimeoutError):
                             logger.warning(
                                 f"Account #{i + 1} ({username}) TIMED OUT {action}ing post {post_id}"
                             )
+                        elif _is_auth_failure(result):
+                            logger.error(
+                                f"Account #{i + 1} ({username}) session REJECTED {action}ing post {post_id}"
+                            )
+                            await self.account_provider.report_auth_failure(accounts_by_name[username])
+                        elif status_code(result) == 409:
+                            # Done by an earlier run that never reached the ledger
+                            logger.info(
+                                f"Account #{i + 1} ({username}) had ALREADY {action}ed post {post_id}"
+                            )
+                            self._record_action(username, post_id, action)
                         else:
                             logger.error(
                                 f"Account #{i + 1} ({username}) FAILED to {action} post {post_id}: {result}"
@@ -79,20 +148,20 @@ class TweeterClient:
                         logger.info(
                             f"Account #{i + 1} ({username}) SUCCESSFULLY {action}ed post {post_id}"
                         )
+                        self._record_action(username, post_id, action)
                         successful_actions += 1
 
+                if self.action_ledger:
+                    try:
+                        self.action_ledger.flush()
+                    except Exception as e:
+                        logger.error(f"Failed to flush action ledger for post {post_id}: {e}")
+
                 logger.info(
                     f"Auto-like/repost complete: {successful_actions}/{len(tasks)} actions completed for post {post_id}"
                 )
                 return successful_actions
-                
-            except asyncio.TimeoutError:
-                logger.error(f"Overall like/repost operation timed out after 60 seconds for post {post_id}")
-                # Cancel any remaining tasks
-                for _, _, _, task in tasks:
-                    if not task.done():
-                        task.cancel()
-                return 0
+
             except Exception as e:
                 logger.error(f"Unexpected error during like/repost for post {post_id}: {e}")
                 return 0
@@ -101,12 +170,49 @@ class TweeterClient:
                 "No eligible accounts for auto-like/repost (all accounts filtered out)"
             )
             return 0
-        
+
+    def _record_action(self, username: str, post_id: int, action: str) -> None:
+        """Add a completed action to the ledger, never failing the fan-out."""
+        if not self.action_ledger:
+            return
+        try:
+            self.action_ledger.record(username, post_id, action)
+        except Exception as e:
+            logger.error(f"Failed to record {action} of post {post_id} by {username}: {e}")
 
 
     async def make_post(self, post: str) -> Tuple[int,str]:
-        tweeter = self.account_provider.get_account()  # handles login and rotation
-        print(tweeter.user_me())
+        # Leased so concurrent pipelines never post from the same account
+        account = await self._lease_for_post()
+        try:
+            return await self._make_post(account, post)
+        finally:
+            await self.account_provider.release(account)
+
+    async def _lease_for_post(self, exclude: Collection[str] = ()) -> Account:
+        """Lease an account with posting budget left, waiting for one to refill.
+
+        Args:
+            exclude: Usernames that must not be leased whatever their budget
+        """
+        while True:
+            exhausted = self.account_limiter.exhausted() if self.account_limiter else set()
+            try:
+                account = await self.account_provider.lease(exhausted | set(exclude))
+            except NoAccountAvailable:
+                # Only worth waiting if a refill could make an account leasable
+                if not exhausted - set(exclude):
+                    raise
+                wait = self.account_limiter.wait_time(exclude)
+                logger.info(f"Every account is at its posting limit, waiting {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+            if self.account_limiter:
+                self.account_limiter.consume(account.username)
+            return account
+
+    async def _make_post(self, account: Account, post: str) -> Tuple[int,str]:
+        tweeter = account.tweeter
         try:
             logger.info(
                 f"Attempting to post ({len(post)} chars): {post[:100]}{'...' if len(post) > 100 else ''}"
@@ -125,9 +231,8 @@ class TweeterClient:
             post_id = response["data"]["id"]
             logger.info(f"Post successful! Post ID: {post_id}")
 
-            # Get posting account info for auto-like logic
-            posting_account_info = tweeter.user_me()
-            posting_username = posting_account_info["data"]["username"]
+            # Posting account for auto-like logic
+            posting_username = account.username
             logger.info(f"Post created by account: {posting_username}")
 
             return (post_id, posting_username)
@@ -140,15 +245,27 @@ class TweeterClient:
             if hasattr(e, "response"):
                 logger.error(f"Response status: {e.response.status_code}")
                 logger.error(f"Response content: {e.response.text}")
+            if _is_auth_failure(e):
+                await self.account_provider.report_auth_failure(account)
             raise
 
-    async def send_reply(self, reply: str, post_id) -> Tuple[int,str]:
-        """Sends a reply to a post"""
+    async def send_reply(
+        self, reply: str, post_id, exclude_accounts: Collection[str] = ()
+    ) -> Tuple[int,str]:
+        """Sends a reply to a post, from an account not in exclude_accounts"""
+        # Replies count against the same per-account limit as posts
+        account = await self._lease_for_post(exclude_accounts)
+        try:
+            return await self._send_reply(account, reply, post_id)
+        finally:
+            await self.account_provider.release(account)
+
+    async def _send_reply(self, account: Account, reply: str, post_id) -> Tuple[int,str]:
         logger.info(
             f"Attempting to reply ({len(reply)} chars): {reply[:100]}{'...' if len(reply) > 100 else ''}"
         )
         try:
-            tweeter: Twooter = self.account_provider.get_account()
+            tweeter: "Twooter" = account.tweeter
             print("sending a reply")
 
             loop = asyncio.get_event_loop()
@@ -162,9 +279,8 @@ class TweeterClient:
             reply_id = response["data"]["id"]
             logger.info(f"Reply successful! Reply ID: {reply_id}")
 
-            # Get replying account info for auto-like logic
-            replying_account_info = tweeter.user_me()
-            replying_username = replying_account_info["data"]["username"]
+            # Replying account for auto-like logic
+            replying_username = account.username
             logger.info(f"Reply created by account: {replying_username}")
 
             return (reply_id, replying_username)
@@ -174,6 +290,8 @@ class TweeterClient:
             if hasattr(e, "response"):
                 logger.error(f"Response status: {e.response.status_code}")
                 logger.error(f"Response content: {e.response.text}")
+            if _is_auth_failure(e):
+                await self.account_provider.report_auth_failure(account)
             raise
 
 
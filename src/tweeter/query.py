@@ -1,75 +1,205 @@
 """A query agent for the new, other people trending topics etc"""
 
-import twooter.sdk
-import requests
-from typing import List
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
 import random
+from .extract import extract_article, extract_post_links
+from .http_cache import HttpCache
 
+if TYPE_CHECKING:
+    import aiohttp
 
-class QueryAgent:
-    def __init__(self, account_provider):
-        self.account_provider = account_provider
-        self.query = self.account_provider.get_account()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of fetching one article page."""
 
-    def get_trending(self):
-        self.query.feed("trending")
+    url: str
+    article: Optional[str]
+    latency: float
+    error: Optional[str] = None
 
-    def get_random_news_article(self) -> str:
-        site_url = "https://kingston-herald.legitreal.com"
-        url = "https://kingston-herald.legitreal.com/index.html"
-        response = requests.get(url)
-        html_content = response.content
-        soup = BeautifulSoup(
-            html_content, "html.parser"
-        )  # Use built-in parser instead of lxml
 
-        # Find all <a> tags where the href attribute starts with "/post"
-        post_links = soup.select('a[href^="/post"]')
-        # Then append it so it gets the full uri not just rel path from website
-        post_links = [site_url + link.get("href") for link in post_links]
+class QueryAgent:
+    def __init__(
+        self,
+        account_provider,
+        site_url: str = "https://kingston-herald.legitreal.com",
+        index_path: str = "/index.html",
+        request_timeout: float = 10.0,
+        max_connections: int = 10,
+        crawl_concurrency: int = 5,
+        http_cache: Optional[HttpCache] = None,
+        index_ttl: float = 60.0,
+    ):
+        """
+        Args:
+            account_provider: Pool the account for feed queries is leased from
+            site_url: Base URL of the news site
+            index_path: Path of the page listing articles
+            request_timeout: Seconds allowed for each HTTP request
+            max_connections: Connections kept open to the news site
+            crawl_concurrency: Article pages fetched at once by get_news
+            http_cache: Cache for pages; articles are kept for good, the index
+                is revalidated once older than index_ttl
+            index_ttl: Seconds the cached index is used without revalidating
+        """
+        self.account_provider = account_provider
+        self.site_url = site_url.rstrip("/")
+        self.index_url = self.site_url + index_path
+        self.request_timeout = request_timeout
+        self.max_connections = max_connections
+        self.crawl_concurrency = crawl_concurrency
+        self.http_cache = http_cache
+        self.index_ttl = index_ttl
+        self._session: Optional["aiohttp.ClientSession"] = None
+        # Set while no fetch is in flight, so close() can wait for them
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def get_trending(self):
+        """The trending feed, read with an account leased from the pool."""
+        async with self.account_provider.leased() as account:
+            return await asyncio.to_thread(account.tweeter.feed, "trending")
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Shared keep-alive session, created on first use inside the event loop."""
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
+
+    async def _fetch(self, url: str, max_age: Optional[float] = None) -> bytes:
+        """GET a page through the pooled session and the cache.
+
+        Args:
+            url: Page to fetch
+            max_age: Seconds a cached copy is served before revalidating it;
+                None means the page never changes once cached
+
+        Raises:
+            aiohttp.ClientResponseError: On a non-2xx response, so an error
+                page is never cached or taken for an article
+        """
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            # The cache is sqlite, so its reads and writes run off the event
+            # loop rather than holding up every other fetch
+            cached = (
+                await asyncio.to_thread(self.http_cache.get, url, max_age)
+                if self.http_cache
+                else None
+            )
+            if cached is not None and cached.is_fresh(max_age):
+                return cached.body
+
+            session = await self._get_session()
+            headers = cached.conditional_headers() if cached is not None else {}
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached is not None:
+                    await asyncio.to_thread(self.http_cache.touch, url)
+                    return cached.body
+                response.raise_for_status()
+                body = await response.read()
+
+            if self.http_cache:
+                await asyncio.to_thread(
+                    self.http_cache.put,
+                    url,
+                    body,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            return body
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session once the fetches in flight have finished."""
+        await self._idle.wait()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def get_post_links(self) -> List[str]:
+        """Article URLs currently linked from the index."""
+        html_content = await self._fetch(self.index_url, max_age=self.index_ttl)
+        # Full uris of every <a> whose href starts with "/post"
+        return extract_post_links(html_content, self.site_url)
+
+    async def _get_article(self, link: str) -> str:
+        # Get the content of each article page
+        article_content = await self._fetch(link)
+        return extract_article(article_content)
+
+    async def get_random_news_article(self) -> str:
+        post_links = await self.get_post_links()
 
         chosen_link_index = random.randint(0, len(post_links) - 1)
         link = post_links[chosen_link_index]
 
         print(link)
-        # Get the content of each article page
-        article_response = requests.get(link)
-        article_soup = BeautifulSoup(article_response.content, "html.parser")
-        paragraphs = article_soup.select("p")
-        article = ""
-        for paragraph in paragraphs:
-            article += "\n" + paragraph.get_text()
-
-        return article
-
-    def get_news(self) -> List[str]:
-        site_url = "https://kingston-herald.legitreal.com"
-        url = "https://kingston-herald.legitreal.com/index.html"
-        response = requests.get(url)
-        html_content = response.content
-        soup = BeautifulSoup(
-            html_content, "html.parser"
-        )  # Use built-in parser instead of lxml
-        articles = []
-
-        # Find all <a> tags where the href attribute starts with "/post"
-        post_links = soup.select('a[href^="/post"]')
-        # Then append it so it gets the full uri not just path
-        post_links = [site_url + link.get("href") for link in post_links]
-
-        for link in post_links:
-            print(link)
-            # Get the content of each article page
-            article_response = requests.get(link)
-            article_soup = BeautifulSoup(article_response.content, "html.parser")
-            paragraphs = article_soup.select("p")
-            article = ""
-            for paragraph in paragraphs:
-                article += "\n" + paragraph.get_text()
-            articles.append(article.strip())
-
-        return articles
+        return await self._get_article(link)
+
+    async def crawl_news(
+        self, links: Optional[List[str]] = None, concurrency: Optional[int] = None
+    ) -> List[CrawlResult]:
+        """Fetch articles in parallel.
+
+        Args:
+            links: Article URLs to fetch, defaults to everything on the index
+            concurrency: Pages fetched at once, defaults to crawl_concurrency
+
+        Returns:
+            One result per link, in the same order; pages that failed or
+            timed out have article set to None
+        """
+        import aiohttp
+
+        post_links = await self.get_post_links() if links is None else links
+        semaphore = asyncio.Semaphore(concurrency or self.crawl_concurrency)
+
+        async def crawl(link: str) -> CrawlResult:
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    article = await self._get_article(link)
+                except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                    latency = time.perf_counter() - start_time
+                    logger.warning(f"Failed to fetch {link} after {latency:.2f}s: {e!r}")
+                    return CrawlResult(link, None, latency, repr(e))
+                latency = time.perf_counter() - start_time
+                logger.info(f"Fetched {link} in {latency:.2f}s")
+                return CrawlResult(link, article.strip(), latency)
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(crawl(link) for link in post_links))
+        elapsed = time.perf_counter() - start_time
+
+        fetched = [result for result in results if result.article is not None]
+        slowest = max((result.latency for result in results), default=0.0)
+        logger.info(
+            f"Crawled {len(fetched)}/{len(results)} articles in {elapsed:.2f}s "
+            f"(slowest page {slowest:.2f}s)"
+        )
+        return results
+
+    async def get_news(self) -> List[str]:
+        """Every article linked from the index, skipping pages that failed."""
+        results = await self.crawl_news()
+        return [result.article for result in results if result.article is not None]
 
 
 """
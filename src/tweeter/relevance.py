@@ -0,0 +1,193 @@
+"""Ranks ingested news articles by relevance to the bot topics"""
+
+import logging
+import random
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .news_store import NewsStore, StoredArticle
+
+logger = logging.getLogger(__name__)
+
+# Words of three or more characters; shorter ones are mostly stopwords
+_TOKEN = re.compile(r"[a-z0-9]{3,}")
+
+
+class HashedTfidfIndex:
+    """Dense matrix of hashed term frequencies with IDF applied at query time.
+
+    Terms are hashed into a fixed number of signed buckets, so memory is
+    ``dim`` floats per document whatever the vocabulary, and a query is one
+    matrix-vector product over every document.
+    """
+
+    def __init__(self, dim: int = 512):
+        """
+        Args:
+            dim: Hash buckets per document vector
+        """
+        self.dim = dim
+        self._vectors = np.zeros((64, dim), dtype=np.float32)
+        self._doc_freq = np.zeros(dim, dtype=np.float32)
+        self._ids: List[int] = []
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _hash(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sublinear term frequencies of a text, as (buckets, weights)."""
+        counts = Counter(_TOKEN.findall(text.lower()))
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        buckets = np.empty(len(counts), dtype=np.int64)
+        weights = np.empty(len(counts), dtype=np.float32)
+        for i, token in enumerate(counts):
+            digest = zlib.crc32(token.encode())
+            buckets[i] = digest % self.dim
+            # A sign bit keeps colliding terms from only ever adding up
+            weights[i] = 1.0 if digest & 0x80000000 else -1.0
+        frequencies = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return buckets, weights * (1.0 + np.log(frequencies))
+
+    def _vector(self, text: str) -> np.ndarray:
+        buckets, weights = self._hash(text)
+        return np.bincount(buckets, weights=weights, minlength=self.dim).astype(np.float32)
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Index a document; re-adding an id is ignored."""
+        if doc_id in self._rows:
+            return
+        if len(self._ids) == len(self._vectors):
+            grown = np.zeros((len(self._vectors) * 2, self.dim), dtype=np.float32)
+            grown[: len(self._vectors)] = self._vectors
+            self._vectors = grown
+
+        vector = self._vector(text)
+        row = len(self._ids)
+        self._vectors[row] = vector
+        self._doc_freq += vector != 0
+        self._ids.append(doc_id)
+        self._rows[doc_id] = row
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document by moving the last row into its place."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        self._doc_freq -= self._vectors[row] != 0
+        last = len(self._ids) - 1
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = self._ids[last]
+            self._rows[self._ids[row]] = row
+        self._vectors[last] = 0
+        self._ids.pop()
+
+    def rank(self, query: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """Documents most similar to the query by TF-IDF cosine similarity.
+
+        Returns:
+            Up to top_k (doc_id, score) pairs, best first
+        """
+        count = len(self._ids)
+        if count == 0:
+            return []
+
+        idf = np.log((1.0 + count) / (1.0 + self._doc_freq)) + 1.0
+        idf_squared = idf * idf
+        query_vector = self._vector(query)
+        query_norm = np.sqrt(np.dot(query_vector * query_vector, idf_squared))
+        if query_norm == 0:
+            return []
+
+        # Cosine of the idf-weighted vectors, without materialising the
+        # weighted matrix: (V*idf)·(q*idf) = V·(q*idf²), |V*idf|² = Σ V²·idf²
+        vectors = self._vectors[:count]
+        norms = np.sqrt(np.einsum("ij,ij,j->i", vectors, vectors, idf_squared))
+        norms[norms == 0] = 1.0
+        scores = (vectors @ (query_vector * idf_squared)) / (norms * query_norm)
+
+        top_k = min(top_k, count)
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(self._ids[row], float(scores[row])) for row in best]
+
+
+class ArticleRanker:
+    """Keeps unused articles from the NewsStore indexed and hands out the most relevant.
+
+    Articles stay indexed until they are used, so one released after a failed
+    generation, or claimed by another worker that gives it up, is ranked again.
+    """
+
+    def __init__(
+        self,
+        news_store: NewsStore,
+        topics: List[str],
+        dim: int = 512,
+        top_k: int = 3,
+    ):
+        """
+        Args:
+            news_store: Source of ingested articles
+            topics: Topic descriptions articles are scored against
+            dim: Hash buckets per article vector
+            top_k: Pick randomly among this many best articles, for variety
+        """
+        self.news_store = news_store
+        self.query = " ".join(topics)
+        self.top_k = top_k
+        self._index = HashedTfidfIndex(dim=dim)
+        self._last_id = 0
+
+    def refresh(self) -> int:
+        """Index unused articles ingested since the last refresh.
+
+        Returns:
+            Number of articles added to the index
+        """
+        articles = self.news_store.get_unused_after(self._last_id)
+        for article in articles:
+            self._index.add(article.id, article.body)
+            self._last_id = max(self._last_id, article.id)
+        if articles:
+            logger.debug(f"Indexed {len(articles)} articles ({len(self._index)} unused)")
+        return len(articles)
+
+    def pick(self) -> Optional[StoredArticle]:
+        """One of the most relevant articles that is neither used nor claimed."""
+        self.refresh()
+        wanted = self.top_k
+        while True:
+            ranked = self._index.rank(self.query, top_k=wanted)
+            if not ranked:
+                return None
+            scores = dict(ranked)
+            articles = {article.id: article for article in self.news_store.get_many(list(scores))}
+            candidates = []
+            for article_id, score in ranked:
+                article = articles.get(article_id)
+                if article is None or article.used_at is not None:
+                    # Used by another worker process since it was indexed
+                    self._index.remove(article_id)
+                elif self.news_store.is_claimable(article):
+                    candidates.append(article)
+            # Look further down the ranking while the best are all claimed
+            if len(candidates) >= self.top_k or len(ranked) < wanted:
+                break
+            wanted *= 2
+
+        if not candidates:
+            return None
+        article = random.choice(candidates[: self.top_k])
+        logger.info(f"Picked article {article.url} (relevance {scores[article.id]:.3f})")
+        return article
+
+    def discard(self, article_id: int) -> None:
+        """Drop an article that has been used from the index."""
+        self._index.remove(article_id)
@@ -0,0 +1,7 @@
+"""Puts the repo root and src on sys.path, as run.py does"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
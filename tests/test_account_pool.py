@@ -0,0 +1,262 @@
+"""AccountProvider lease/release, without logging in to anything"""
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from src.account_providers import Account, AccountProvider
+from src.config.schemas import BotAccount
+
+
+def make_provider(*usernames: str) -> AccountProvider:
+    """A provider whose accounts are already logged in."""
+    provider = AccountProvider()
+    provider._accounts = [
+        Account(
+            username=name,
+            bot=BotAccount(user_name=name, password="secret", display_name=name),
+            tweeter=object(),
+        )
+        for name in usernames
+    ]
+    provider._activation_locks = {name: asyncio.Lock() for name in usernames}
+    provider._idle = OrderedDict((account.username, account) for account in provider._accounts)
+    return provider
+
+
+async def settle() -> None:
+    """Let every runnable task get as far as it can."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_lease_takes_least_recently_released():
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        alice = await provider.lease()
+        bob = await provider.lease()
+        await provider.release(bob)
+        await provider.release(alice)
+        assert (await provider.lease()).username == "bob"
+
+    asyncio.run(scenario())
+
+
+def test_lease_skips_excluded_accounts():
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        assert (await provider.lease(exclude={"alice"})).username == "bob"
+
+    asyncio.run(scenario())
+
+
+def test_lease_raises_when_only_excluded_accounts_remain():
+    async def scenario():
+        provider = make_provider("alice")
+        with pytest.raises(RuntimeError):
+            await provider.lease(exclude={"alice"})
+
+    asyncio.run(scenario())
+
+
+def test_release_wakes_a_waiter_that_can_take_the_account():
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        alice = await provider.lease()
+        await provider.lease()
+
+        # Queued first, so a single notify would only wake this one
+        filtered = asyncio.create_task(provider.lease(exclude={"alice"}))
+        await settle()
+        unfiltered = asyncio.create_task(provider.lease())
+        await settle()
+
+        await provider.release(alice)
+        leased = await asyncio.wait_for(unfiltered, timeout=1)
+        assert leased.username == "alice"
+        assert not filtered.done()
+        assert list(provider._idle) == []
+        filtered.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_release_tracks_utilisation():
+    async def scenario():
+        provider = make_provider("alice")
+        async with provider.leased() as account:
+            assert account.in_use
+            assert provider.get_pool_stats()["alice"]["in_use"]
+        stats = provider.get_pool_stats()["alice"]
+        assert not stats["in_use"]
+        assert stats["lease_count"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_lease_for_post_waits_for_an_exhausted_account_to_refill(monkeypatch):
+    from src.scheduling import AccountRateLimiter
+    from src.tweeter import TweeterClient
+    from src.tweeter import poster
+
+    async def scenario():
+        provider = make_provider("alice")
+        limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+        limiter.consume("alice")
+        # An account with tokens that the pool can't lease
+        limiter._bucket("bob")
+        client = TweeterClient(provider, account_limiter=limiter)
+
+        waits = []
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            limiter._bucket("alice").tokens = 1
+
+        monkeypatch.setattr(poster.asyncio, "sleep", fake_sleep)
+        account = await client._lease_for_post()
+        assert account.username == "alice"
+        assert len(waits) == 1 and waits[0] > 50
+
+    asyncio.run(scenario())
+
+
+def test_replies_count_against_the_account_limit():
+    from src.scheduling import AccountRateLimiter
+    from src.tweeter import TweeterClient
+
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+        limiter.consume("alice")
+        client = TweeterClient(provider, account_limiter=limiter)
+
+        account = await client._lease_for_post(exclude={"carol"})
+        assert account.username == "bob"
+        assert limiter.exhausted() == {"alice", "bob"}
+        await provider.release(account)
+
+        # Nothing can refill into a leasable account
+        with pytest.raises(RuntimeError):
+            await client._lease_for_post(exclude={"alice", "bob"})
+
+    asyncio.run(scenario())
+
+
+def test_fanout_logs_in_a_few_more_accounts_each_time():
+    async def scenario():
+        provider = make_provider("alice", "bob", "carol", "dave")
+        provider.fanout_activations = 1
+        for account in provider._accounts[1:]:
+            account.tweeter = None
+
+        async def fake_login(bot, invite_code):
+            return object()
+
+        provider._login_bot = fake_login
+        assert [a.username for a in await provider.fanout_accounts()] == ["alice", "bob"]
+        assert [a.username for a in await provider.fanout_accounts()] == ["alice", "bob", "carol"]
+
+    asyncio.run(scenario())
+
+
+def test_restored_sessions_stay_out_of_the_shared_token_file(tmp_path):
+    import os
+    import time
+    from types import SimpleNamespace
+
+    from src.account_providers import SessionStore
+
+    store = SessionStore(str(tmp_path / "personas.db"), str(tmp_path / ".session_key"))
+    store.save("alice", "token-1", "Bearer", int(time.time()) + 3600)
+    provider = AccountProvider(session_store=store)
+    tokens_dir = provider._tokens_dir
+    assert os.path.isdir(tokens_dir)
+
+    saved = []
+    tweeter = SimpleNamespace(
+        _client=SimpleNamespace(tokens=SimpleNamespace(save=lambda *args: saved.append(args))),
+        use_agent=lambda username: None,
+    )
+    assert provider._restore_session(tweeter, "alice")
+    assert saved[0][:2] == ("alice", "token-1")
+
+    provider.close()
+    assert not os.path.exists(tokens_dir)
+
+
+def test_trending_feed_is_read_with_a_leased_account():
+    from types import SimpleNamespace
+
+    from src.tweeter import QueryAgent
+
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        readers = []
+        for account in provider._accounts:
+            account.tweeter = SimpleNamespace(
+                feed=lambda name, username=account.username: readers.append(username) or name
+            )
+        agent = QueryAgent(provider)
+
+        assert await agent.get_trending() == "trending"
+        assert await agent.get_trending() == "trending"
+        assert readers == ["alice", "bob"]
+        assert not any(account.in_use for account in provider._accounts)
+
+    asyncio.run(scenario())
+
+
+def test_account_rejected_while_logging_in_is_not_leased():
+    async def scenario():
+        provider = make_provider("alice", "bob")
+        alice = provider._accounts[0]
+        alice.tweeter = None
+        logging_in = asyncio.Event()
+        finish_login = asyncio.Event()
+
+        async def slow_login(bot, invite_code):
+            logging_in.set()
+            await finish_login.wait()
+            return object()
+
+        provider._login_bot = slow_login
+        leasing = asyncio.create_task(provider.lease())
+        await logging_in.wait()
+
+        await provider.report_auth_failure(alice)
+        relogin = provider._relogin_tasks["alice"]
+        assert "alice" not in provider._idle
+        finish_login.set()
+        assert (await asyncio.wait_for(leasing, timeout=1)).username == "bob"
+
+        # The re-login brings alice back once it succeeds
+        await asyncio.wait_for(relogin, timeout=1)
+        assert alice.healthy and "alice" in provider._idle
+
+    asyncio.run(scenario())
+
+
+def test_failed_relogin_is_retried_with_backoff():
+    async def scenario():
+        provider = make_provider("alice")
+        provider.login_backoff_base = 0.001
+        alice = provider._accounts[0]
+        results = [None, None, object()]
+
+        async def flaky_login(bot, invite_code):
+            tweeter = results.pop(0)
+            if tweeter is None:
+                provider.quarantined[bot.user_name] = "rejected"
+            return tweeter
+
+        provider._login_bot = flaky_login
+        await provider.report_auth_failure(alice)
+        await asyncio.wait_for(provider._relogin_tasks["alice"], timeout=1)
+
+        assert results == []
+        assert alice.healthy and "alice" not in provider.quarantined
+        assert (await provider.lease()).username == "alice"
+
+    asyncio.run(scenario())
@@ -0,0 +1,50 @@
+"""Condensing articles to a token budget"""
+
+from src.tweeter.condense import ArticleCondenser, estimate_tokens
+
+ARTICLE = (
+    "The council approved the new budget for the election on Tuesday. "
+    "Weather was mild across the city all week. "
+    "The budget funds extra polling stations for the election. "
+    "A local bakery won a prize for its bread. "
+    "Critics said the election budget was still too small."
+)
+
+
+def test_short_articles_are_left_alone():
+    condensed = ArticleCondenser(max_tokens=300).condense("  A short article.  ")
+    assert condensed.text == "A short article."
+    assert condensed.tokens_saved == 0
+
+
+def test_long_articles_keep_the_lead_and_key_sentences_in_order():
+    condensed = ArticleCondenser(max_tokens=40).condense(ARTICLE)
+
+    assert condensed.tokens <= 40
+    assert condensed.tokens_saved > 0
+    assert condensed.text == (
+        "The council approved the new budget for the election on Tuesday. "
+        "The budget funds extra polling stations for the election."
+    )
+
+
+def test_lead_is_cut_at_a_word_when_no_sentence_fits():
+    condensed = ArticleCondenser(max_tokens=5).condense(ARTICLE)
+
+    assert ARTICLE.startswith(condensed.text)
+    assert ARTICLE[len(condensed.text)] == " "
+    assert estimate_tokens(condensed.text) <= 5
+
+
+def test_repeated_articles_come_from_the_cache():
+    condenser = ArticleCondenser(max_tokens=40, cache_size=1)
+    first = condenser.condense(ARTICLE)
+    assert condenser.condense(ARTICLE) is first
+
+    condenser.condense("Another article.")
+    assert condenser.condense(ARTICLE) is not first
+    assert condenser.get_stats() == {
+        "calls": 4,
+        "tokens_saved": 3 * first.tokens_saved,
+        "cached": 1,
+    }
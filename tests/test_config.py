@@ -0,0 +1,99 @@
+"""Validating and loading env.json and bots.json"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.config.loader import ConfigWatcher, SnapshotLoader, load_bot_accounts
+from src.config.schemas import BotAccount, PostingConfig
+
+
+def test_max_rate_below_the_target_is_rejected():
+    with pytest.raises(ValidationError, match="max_posts_per_hour"):
+        PostingConfig(target_posts_per_hour=90.0, max_posts_per_hour=60.0)
+
+
+def test_max_rate_equal_to_the_target_is_allowed():
+    config = PostingConfig(target_posts_per_hour=60.0, max_posts_per_hour=60.0)
+
+    assert config.max_posts_per_hour == config.target_posts_per_hour
+
+
+@pytest.mark.parametrize("field", ["burst", "account_burst", "account_posts_per_hour"])
+def test_limits_must_be_positive(field):
+    with pytest.raises(ValidationError, match=field):
+        PostingConfig(**{field: 0})
+
+
+@pytest.mark.parametrize("data", [[{"user_name": "alice"}], {"bots": {"alice": {}}}])
+def test_bots_file_of_the_wrong_shape_is_rejected(tmp_path, data):
+    bots_path = tmp_path / "bots.json"
+    bots_path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError, match="bots"):
+        load_bot_accounts(bots_path)
+
+
+def test_bot_accounts_missing_fields_are_skipped(tmp_path):
+    bots_path = tmp_path / "bots.json"
+    bots_path.write_text(json.dumps({"bots": [
+        {"user_name": "alice", "password": "secret", "display_name": "Alice", "persona": "calm"},
+        {"user_name": "bob", "password": "secret"},
+        {"user_name": "", "password": "secret", "display_name": "Nobody"},
+        "carol",
+    ]}))
+
+    bots = load_bot_accounts(bots_path)
+    assert [bot.user_name for bot in bots] == ["alice"]
+    # Extra fields are kept, the password stays out of logs
+    assert bots[0].persona == "calm"
+    assert "secret" not in repr(bots[0])
+
+
+def test_bot_accounts_are_immutable():
+    bot = BotAccount(user_name="alice", password="secret", display_name="Alice")
+    with pytest.raises(ValidationError):
+        bot.password = "changed"
+
+
+def write_config(tmp_path, bots) -> SnapshotLoader:
+    bots_path = tmp_path / "bots.json"
+    bots_path.write_text(json.dumps({"bots": bots}))
+    config_path = tmp_path / "env.json"
+    config_path.write_text(json.dumps({
+        "llm": {"api_keys": ["test-key"]},
+        "accounts": {"bots_path": str(bots_path)},
+    }))
+    return SnapshotLoader(str(config_path))
+
+
+def test_snapshot_is_reread_only_when_a_file_changes(tmp_path):
+    loader = write_config(tmp_path, [])
+    first = loader.load()
+    assert loader.load() is first
+
+    alice = {"user_name": "alice", "password": "secret", "display_name": "Alice"}
+    (tmp_path / "bots.json").write_text(json.dumps({"bots": [alice]}))
+    reloaded = loader.load()
+    assert reloaded is not first
+    assert [bot.user_name for bot in reloaded.bots] == ["alice"]
+    assert loader.load() is reloaded
+
+
+def test_watcher_keeps_the_running_config_on_a_bad_bots_file(tmp_path):
+    loader = write_config(tmp_path, [])
+    bots_path = tmp_path / "bots.json"
+    running = loader.load()
+    applied = []
+
+    async def on_change(snapshot):
+        applied.append(snapshot)
+
+    watcher = ConfigWatcher(on_change, loader)
+    bots_path.write_text(json.dumps(["not", "an", "object"]))
+
+    assert asyncio.run(watcher.check()) is None
+    assert applied == []
+    assert loader._snapshot is running
@@ -0,0 +1,116 @@
+"""Container config reloads, without any network or LLM access"""
+
+import asyncio
+
+from src.config import AppConfig, get_container
+from src.scheduling import AccountRateLimiter, PostRateController
+from src.tweeter import HttpCache, QueryAgent
+
+
+def make_config(tmp_path, posting=None, **news) -> AppConfig:
+    return AppConfig(
+        llm={"api_keys": ["test-key"]},
+        storage={"database_path": str(tmp_path / "personas.db")},
+        news={"cache_path": str(tmp_path / "cache.db"), **news},
+        scheduler={"retired_close_delay_seconds": 0.05},
+        posting=posting or {},
+    )
+
+
+class FakeQueryAgent:
+    def __init__(self, closed):
+        self.closed = closed
+
+    async def close(self):
+        self.closed.append("QueryAgent")
+
+
+def test_reload_closes_replaced_services_after_a_delay(tmp_path):
+    async def scenario():
+        container = get_container()()
+        await container.set_config(make_config(tmp_path))
+
+        closed = []
+        cache = container.get(HttpCache)
+        cache_close = cache.close
+        cache.close = lambda: (closed.append("HttpCache"), cache_close())
+        container._instances[QueryAgent] = FakeQueryAgent(closed)
+        container._dependents[HttpCache] = {QueryAgent}
+
+        changed = await container.apply_config(make_config(tmp_path, index_ttl_seconds=5.0))
+        assert changed == {"news.index_ttl_seconds"}
+        assert QueryAgent not in container._instances
+        assert HttpCache not in container._instances
+        # Work already holding the old instances can still use them
+        assert closed == []
+        cache.get("https://x/")
+
+        await asyncio.gather(*container._retiring)
+        assert closed == ["QueryAgent", "HttpCache"]
+
+    asyncio.run(scenario())
+
+
+def test_query_agent_close_waits_for_fetches_in_flight():
+    async def scenario():
+        agent = QueryAgent(account_provider=None)
+        agent._in_flight = 1
+        agent._idle.clear()
+        closing = asyncio.create_task(agent.close())
+        await asyncio.sleep(0)
+        assert not closing.done()
+
+        agent._in_flight = 0
+        agent._idle.set()
+        await asyncio.wait_for(closing, timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_close_shuts_down_current_and_retiring_services(tmp_path):
+    async def scenario():
+        container = get_container()()
+        config = make_config(tmp_path)
+        config.scheduler.retired_close_delay_seconds = 3600
+        await container.set_config(config)
+
+        closed = []
+        container._instances[QueryAgent] = FakeQueryAgent(closed)
+        container._dependents[HttpCache] = {QueryAgent}
+        container.get(HttpCache)
+
+        reload = make_config(tmp_path, index_ttl_seconds=5.0)
+        reload.scheduler.retired_close_delay_seconds = 3600
+        await container.apply_config(reload)
+        container._instances[QueryAgent] = FakeQueryAgent(closed)
+
+        await asyncio.wait_for(container.close(), timeout=1)
+        assert closed == ["QueryAgent", "QueryAgent"]
+        assert not container._instances
+
+    asyncio.run(scenario())
+
+
+def test_posting_changes_update_the_rate_limits_in_place(tmp_path):
+    async def scenario():
+        container = get_container()()
+        await container.set_config(make_config(tmp_path))
+        controller = container.get(PostRateController)
+        limiter = container.get(AccountRateLimiter)
+        controller.record_published()
+        limiter.consume("alice")
+        limiter.consume("alice")
+
+        changed = await container.apply_config(make_config(
+            tmp_path, posting={"target_posts_per_hour": 30.0, "account_burst": 1}
+        ))
+        assert changed == {"posting.target_posts_per_hour", "posting.account_burst"}
+        assert container.get(PostRateController) is controller
+        assert container.get(AccountRateLimiter) is limiter
+        assert controller.get_stats()["target_per_hour"] == 30.0
+        assert controller.get_stats()["published_in_window"] == 1
+        # The drained bucket is not refilled by the reload
+        assert limiter.exhausted() == {"alice"}
+        assert limiter._buckets["alice"].capacity == 1
+
+    asyncio.run(scenario())
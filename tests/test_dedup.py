@@ -0,0 +1,52 @@
+"""Near-duplicate post detection, against a throwaway database"""
+
+import pytest
+
+from src.tweeter import PostDeduplicator
+
+POST = (
+    "The city council approved a new budget for public transport on Tuesday, "
+    "adding three bus routes and extending night service across the northern districts."
+)
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "personas.db")
+
+
+def test_exact_and_near_copies_are_rejected(db_path):
+    dedup = PostDeduplicator(db_path)
+    assert dedup.check_and_add(POST)
+    assert not dedup.check_and_add(POST.upper())
+    assert not dedup.check_and_add(POST.replace("Tuesday", "Monday"))
+    assert dedup.get_stats() == {"indexed": 1, "rejected": 2}
+
+
+def test_unrelated_posts_are_kept(db_path):
+    dedup = PostDeduplicator(db_path)
+    assert dedup.check_and_add(POST)
+    assert dedup.check_and_add(
+        "Scientists found water ice near the lunar south pole in a crater that never sees sunlight."
+    )
+    assert not dedup.is_duplicate("Local bakery wins national award for its sourdough bread.")
+
+
+def test_signatures_survive_restarts_and_are_shared_between_processes(db_path):
+    first = PostDeduplicator(db_path)
+    second = PostDeduplicator(db_path)
+    first.check_and_add(POST)
+
+    assert second.is_duplicate(POST)
+    first.close()
+    assert PostDeduplicator(db_path).is_duplicate(POST)
+
+
+def test_oldest_signatures_are_evicted_past_capacity(db_path):
+    dedup = PostDeduplicator(db_path, capacity=2)
+    posts = [POST, "Local bakery wins national award for its sourdough bread.", "Storm closes the harbour."]
+    for post in posts:
+        assert dedup.check_and_add(post)
+    assert not dedup.is_duplicate(POST)
+    assert dedup.is_duplicate(posts[2])
+    assert PostDeduplicator(db_path, capacity=2).get_stats()["indexed"] == 2
@@ -0,0 +1,38 @@
+"""Engagement shared between supervised worker processes"""
+
+import asyncio
+
+from src.providers import APIKeyManager, KeyUsageStore
+from src.tweeter import EngagementQueue
+
+
+def test_workers_take_each_others_posts_once(tmp_path):
+    db_path = str(tmp_path / "personas.db")
+    first = EngagementQueue(db_path, shard_index=0)
+    second = EngagementQueue(db_path, shard_index=1)
+
+    first.add(101, "alice")
+    second.add(102, "bob")
+
+    assert first.take_new() == [(102, "bob")]
+    assert second.take_new() == [(101, "alice")]
+    assert first.take_new() == []
+
+
+def test_posts_from_before_startup_are_skipped(tmp_path):
+    db_path = str(tmp_path / "personas.db")
+    EngagementQueue(db_path, shard_index=0).add(101, "alice")
+    assert EngagementQueue(db_path, shard_index=1).take_new() == []
+
+
+def test_shared_key_usage_is_balanced_across_managers(tmp_path):
+    store = KeyUsageStore(str(tmp_path / "personas.db"))
+    managers = [
+        APIKeyManager(["key-a", "key-b"], max_usage_per_key=10, usage_store=store)
+        for _ in range(2)
+    ]
+
+    async def scenario():
+        return [await manager.get_available_key() for manager in managers * 2]
+
+    assert sorted(asyncio.run(scenario())) == ["key-a", "key-a", "key-b", "key-b"]
@@ -0,0 +1,33 @@
+"""Error classification and retry backoff"""
+
+import asyncio
+
+import pytest
+
+from src.tweeter.errors import AUTH, CLIENT, RATE_LIMITED, TIMEOUT, backoff_delay, classify_error
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (HttpError(429), RATE_LIMITED),
+        (HttpError(401), AUTH),
+        (HttpError(400), CLIENT),
+        (asyncio.TimeoutError(), TIMEOUT),
+        (Exception("Quota exceeded for this key"), RATE_LIMITED),
+    ],
+)
+def test_errors_are_classified(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_backoff_doubles_up_to_the_maximum_with_jitter():
+    assert 8 <= backoff_delay(1, base=10, maximum=60) <= 12
+    assert 16 <= backoff_delay(2, base=10, maximum=60) <= 24
+    assert 48 <= backoff_delay(10, base=10, maximum=60) <= 72
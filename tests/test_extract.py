@@ -0,0 +1,23 @@
+"""lxml link and paragraph extraction"""
+
+from src.tweeter.extract import extract_article, extract_post_links
+
+PAGE = b"""<html><body>
+<a href="/post/1">One</a><a href="/about">About</a><a href="/post/2">Two</a>
+<p>First paragraph.</p><div><p>Second <b>bold</b> paragraph.</p></div>
+</body></html>"""
+
+
+def test_post_links_are_made_absolute_in_page_order():
+    assert extract_post_links(PAGE, "https://x") == ["https://x/post/1", "https://x/post/2"]
+
+
+def test_article_is_every_paragraph_on_its_own_line():
+    assert extract_article(PAGE) == "\nFirst paragraph.\nSecond bold paragraph."
+
+
+def test_non_utf8_and_empty_pages():
+    latin1 = "<html><body><p>Café</p></body></html>".encode("latin-1")
+    assert extract_article(latin1).strip().startswith("Caf")
+    assert extract_article(b"  ") == ""
+    assert extract_post_links(b"", "https://x") == []
@@ -0,0 +1,49 @@
+"""HttpCache hit accounting, against a throwaway database"""
+
+import pytest
+
+from src.tweeter import HttpCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> HttpCache:
+    return HttpCache(db_path=str(tmp_path / "cache.db"))
+
+
+def stats(cache):
+    return {key: cache.get_stats()[key] for key in ("hits", "stale", "misses")}
+
+
+def test_only_fresh_pages_count_as_hits(cache):
+    assert cache.get("https://x/") is None
+    cache.put("https://x/", b"page")
+    assert cache.get("https://x/", max_age=60).body == b"page"
+    assert stats(cache) == {"hits": 1, "stale": 0, "misses": 1}
+
+
+def test_stale_pages_are_hits_only_once_revalidated(cache):
+    cache.put("https://x/", b"page")
+    cached = cache.get("https://x/", max_age=-1)
+    assert not cached.is_fresh(-1)
+    assert stats(cache) == {"hits": 0, "stale": 1, "misses": 0}
+
+    # The conditional refetch got a 304
+    cache.touch("https://x/")
+    assert stats(cache) == {"hits": 1, "stale": 1, "misses": 0}
+
+
+def test_query_agent_reads_the_cache_off_the_event_loop(cache):
+    import asyncio
+    import threading
+
+    from src.tweeter import QueryAgent
+
+    cache.put("https://x/post/1", b"<p>Cached</p>")
+    agent = QueryAgent(account_provider=None, http_cache=cache)
+    lookups = []
+    cache_get = cache.get
+    cache.get = lambda *args: (lookups.append(threading.get_ident()), cache_get(*args))[1]
+
+    assert asyncio.run(agent._get_article("https://x/post/1")) == "\nCached"
+    assert lookups and lookups[0] != threading.get_ident()
+    assert agent._idle.is_set()
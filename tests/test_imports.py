@@ -0,0 +1,8 @@
+"""Heavy dependencies stay unloaded until they are used"""
+
+from benchmarks.import_time import profile
+
+
+def test_importing_main_loads_no_heavy_dependencies():
+    _, _, heavy = profile("main")
+    assert heavy == []
@@ -0,0 +1,169 @@
+"""NewsStore ingestion and NewsPoller, against a throwaway database"""
+
+import asyncio
+
+import pytest
+
+from src.tweeter.news_store import NewsPoller, NewsStore
+from src.tweeter.query import CrawlResult
+
+
+@pytest.fixture
+def store(tmp_path) -> NewsStore:
+    return NewsStore(db_path=str(tmp_path / "news.db"))
+
+
+def test_added_articles_are_no_longer_new(store):
+    assert store.add_many([("https://x/post/1", "First story")]) == 1
+    assert store.filter_new(["https://x/post/1", "https://x/post/2"]) == ["https://x/post/2"]
+
+
+def test_republished_content_is_stored_once_and_not_refetched(store):
+    store.add_many([("https://x/post/1", "Same story.")])
+    assert store.add_many([("https://x/post/2", "same STORY")]) == 0
+    assert store.filter_new(["https://x/post/2"]) == []
+    assert store.count_unused() == 1
+
+
+def test_empty_articles_are_not_refetched(store):
+    assert store.add_many([("https://x/post/1", "")]) == 0
+    assert store.filter_new(["https://x/post/1"]) == []
+    assert store.pick_unused() is None
+
+
+def test_mark_used_only_once(store):
+    store.add_many([("https://x/post/1", "A story")])
+    article = store.pick_unused()
+    assert store.mark_used(article.id)
+    assert not store.mark_used(article.id)
+    assert store.pick_unused() is None
+
+
+class FakeQueryAgent:
+    def __init__(self, pages):
+        self.pages = pages
+        self.crawled = []
+
+    async def get_post_links(self):
+        return list(self.pages)
+
+    async def crawl_news(self, links):
+        self.crawled.append(links)
+        return [CrawlResult(link, self.pages[link], 0.0) for link in links]
+
+
+def test_poller_only_retries_failed_fetches(store):
+    agent = FakeQueryAgent(
+        {
+            "https://x/post/1": "A story",
+            "https://x/post/2": "a story!",
+            "https://x/post/3": "",
+            "https://x/post/4": None,
+        }
+    )
+    poller = NewsPoller(agent, store)
+
+    assert asyncio.run(poller.poll_once()) == 1
+    assert asyncio.run(poller.poll_once()) == 0
+    assert agent.crawled[1] == ["https://x/post/4"]
+
+
+def test_claimed_articles_are_not_picked_until_released(store):
+    store.add_many([("https://x/post/1", "A story")])
+    article = store.pick_unused()
+    assert store.claim(article.id)
+    assert not store.claim(article.id)
+    assert store.pick_unused() is None
+
+    store.release(article.id)
+    assert store.pick_unused().id == article.id
+
+
+def test_expired_claims_can_be_taken_over(store):
+    store.claim_ttl = -1
+    store.add_many([("https://x/post/1", "A story")])
+    article = store.pick_unused()
+    assert store.claim(article.id)
+    assert store.claim(article.id)
+
+
+class FakeLLM:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    async def invoke(self, messages):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_news_bot(store, *responses):
+    from src.bots import NewsBot
+
+    return NewsBot(llm_provider=FakeLLM(*responses), query_agent=None, news_store=store)
+
+
+def test_article_is_only_used_once_its_post_is_queued(store):
+    store.add_many([("https://x/post/1", "A story")])
+    bot = make_news_bot(store, "A post")
+
+    post = asyncio.run(bot.run_bot())
+    assert store.pick_unused() is None
+    assert store.count_unused() == 1
+
+    bot.post_queued(post)
+    assert store.count_unused() == 0
+
+
+def test_article_is_released_when_generation_fails_or_is_dropped(store):
+    store.add_many([("https://x/post/1", "A story")])
+    bot = make_news_bot(store, RuntimeError("LLM down"), "A post")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(bot.run_bot())
+    assert store.pick_unused() is not None
+
+    bot.post_dropped(asyncio.run(bot.run_bot()))
+    assert store.pick_unused() is not None
+
+
+def test_full_text_search_skips_used_and_claimed_articles(store):
+    from src.tweeter.news_store import match_any
+
+    store.add_many(
+        [
+            ("https://x/post/1", "Castillo promises tax cuts"),
+            ("https://x/post/2", "Castillo visits the harbour"),
+            ("https://x/post/3", "Local bakery wins an award"),
+        ]
+    )
+    query = match_any(["Castillo tax cuts"])
+    assert [article.url for article in store.search(query)] == [
+        "https://x/post/1",
+        "https://x/post/2",
+    ]
+
+    first, second = store.search(query)
+    store.mark_used(first.id)
+    store.claim(second.id)
+    assert store.search(query, available_only=True) == []
+
+
+def test_news_bot_without_a_ranker_prefers_on_topic_articles(store):
+    store.add_many(
+        [
+            ("https://x/post/1", "Local bakery wins an award"),
+            ("https://x/post/2", "Hawthorne backs carbon taxes"),
+        ]
+    )
+    bot = make_news_bot(store, "A post")
+    assert bot._claim_article().url == "https://x/post/2"
+
+
+def test_index_is_rebuilt_for_databases_without_it(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    NewsStore(db_path=db_path).add_many([("https://x/post/1", "Castillo promises tax cuts")])
+    NewsStore(db_path=db_path)._conn.execute("DROP TABLE news_articles_fts")
+
+    assert len(NewsStore(db_path=db_path).search('"castillo"')) == 1
@@ -0,0 +1,158 @@
+"""Outbox claim/retry and the reply thread's publishing, with a fake client"""
+
+import asyncio
+
+import pytest
+
+from src.account_providers import NoAccountAvailable
+from src.bots.reply_thread import ReplyThreadOrchestrator
+from src.tweeter import Outbox, OutboxPublisher
+from src.tweeter.outbox import FAILED, PENDING, SENT
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Fails with each queued error in turn, then succeeds."""
+
+    def __init__(self, *errors, usernames=("alice", "bob")):
+        self.errors = list(errors)
+        self.usernames = usernames
+        self.excluded = []
+
+    async def make_post(self, content):
+        return self._next(())
+
+    async def send_reply(self, reply, post_id, exclude_accounts=()):
+        self.excluded.append(set(exclude_accounts))
+        return self._next(exclude_accounts)
+
+    def _next(self, exclude):
+        if self.errors:
+            raise self.errors.pop(0)
+        free = [name for name in self.usernames if name not in exclude]
+        if not free:
+            raise NoAccountAvailable("all excluded")
+        return (len(self.excluded) + 100, free[0])
+
+
+@pytest.fixture
+def outbox(tmp_path) -> Outbox:
+    return Outbox(db_path=str(tmp_path / "personas.db"))
+
+
+def test_publish_marks_sent(outbox):
+    publisher = OutboxPublisher(outbox, FakeClient())
+    entry_id = outbox.enqueue("post", "hello")
+    assert asyncio.run(publisher.publish(entry_id)) == (100, "alice")
+    assert outbox.get(entry_id).status == SENT
+    assert outbox.claim(entry_id) is None
+
+
+def test_retryable_failure_is_rescheduled(outbox):
+    publisher = OutboxPublisher(outbox, FakeClient(HttpError(503)), base_backoff=60)
+    entry_id = outbox.enqueue("post", "hello")
+    with pytest.raises(HttpError):
+        asyncio.run(publisher.publish(entry_id))
+    entry = outbox.get(entry_id)
+    assert (entry.status, entry.attempts) == (PENDING, 1)
+    # Backing off, so not due yet
+    assert outbox.claim_due() == []
+
+
+def test_non_retryable_failure_gives_up_at_once(outbox):
+    publisher = OutboxPublisher(outbox, FakeClient(HttpError(400)), max_attempts=5)
+    entry_id = outbox.enqueue("post", "hello")
+    with pytest.raises(HttpError):
+        asyncio.run(publisher.publish(entry_id))
+    assert outbox.get(entry_id).status == FAILED
+
+
+def test_no_account_does_not_use_an_attempt(outbox):
+    publisher = OutboxPublisher(outbox, FakeClient(NoAccountAvailable("busy")))
+    entry_id = outbox.enqueue("post", "hello")
+    with pytest.raises(NoAccountAvailable):
+        asyncio.run(publisher.publish(entry_id))
+    entry = outbox.get(entry_id)
+    assert (entry.status, entry.attempts) == (PENDING, 0)
+
+
+def test_drain_stops_when_no_account_is_free(outbox):
+    client = FakeClient(NoAccountAvailable("busy"))
+    publisher = OutboxPublisher(outbox, client)
+    first = outbox.enqueue("post", "one")
+    second = outbox.enqueue("post", "two")
+    assert asyncio.run(publisher.drain()) == 0
+    assert outbox.get(first).status == PENDING
+    assert outbox.get(second).status == PENDING
+    assert asyncio.run(publisher.drain()) == 2
+
+
+class FakeResponseBot:
+    def __init__(self):
+        self.count = 0
+
+    async def run_bot(self, content):
+        self.count += 1
+        return f"reply {self.count} to {content}"
+
+
+def test_replies_fall_back_to_repeats_but_never_the_poster(outbox):
+    client = FakeClient()
+    orchestrator = ReplyThreadOrchestrator(
+        FakeResponseBot(),
+        outbox,
+        OutboxPublisher(outbox, client),
+        replies_per_post=2,
+        cadence=0,
+    )
+    published = asyncio.run(orchestrator.run("a post", post_id=1, username="alice"))
+    assert [username for _, username in published] == ["bob", "bob"]
+    assert client.excluded == [{"alice"}, {"alice", "bob"}, {"alice"}]
+
+
+def test_drained_reply_is_never_sent_from_the_post_author(outbox):
+    client = FakeClient(HttpError(503))
+    publisher = OutboxPublisher(outbox, client, base_backoff=0)
+    entry_id = outbox.enqueue("reply", "a reply", parent_id=1, exclude_accounts={"alice"})
+    with pytest.raises(HttpError):
+        asyncio.run(publisher.publish(entry_id, exclude_accounts={"alice", "carol"}))
+
+    assert asyncio.run(publisher.drain()) == 1
+    assert client.excluded[-1] == {"alice"}
+    assert outbox.get(entry_id).result_username == "bob"
+
+
+def test_drain_hands_back_each_published_entry(outbox):
+    publisher = OutboxPublisher(outbox, FakeClient())
+    post = outbox.enqueue("post", "a post")
+    resumed = []
+
+    async def on_published(entry, result):
+        resumed.append((entry.id, entry.kind, result[1]))
+
+    assert asyncio.run(publisher.drain(on_published=on_published)) == 1
+    assert resumed == [(post, "post", "alice")]
+
+
+def test_duplicate_replies_are_not_queued(outbox, tmp_path):
+    from src.tweeter import PostDeduplicator
+
+    class RepeatingBot:
+        async def run_bot(self, content):
+            return f"the same reply to {content}"
+
+    orchestrator = ReplyThreadOrchestrator(
+        RepeatingBot(),
+        outbox,
+        OutboxPublisher(outbox, FakeClient()),
+        dedup=PostDeduplicator(str(tmp_path / "personas.db")),
+        replies_per_post=2,
+        cadence=0,
+    )
+    published = asyncio.run(orchestrator.run("a post", post_id=1, username="alice"))
+    assert len(published) == 1
@@ -0,0 +1,133 @@
+"""Pipeline stages and resizing their worker pools"""
+
+import asyncio
+
+from src.scheduling import Pipeline, Stage
+
+
+class Gate:
+    """Handler that holds every item until opened."""
+
+    def __init__(self):
+        self.opened = asyncio.Event()
+
+    async def __call__(self, item):
+        await self.opened.wait()
+        return item
+
+
+def running(stage):
+    return [task for task in stage._tasks if not task.done()]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_items_pass_through_every_stage():
+    async def scenario():
+        seen = []
+
+        async def double(item):
+            return item * 2
+
+        async def record(item):
+            seen.append(item)
+
+        pipeline = Pipeline([Stage("double", double), Stage("record", record)])
+        pipeline.start()
+        for item in range(3):
+            await pipeline.submit(item)
+        await pipeline.join()
+        await pipeline.stop()
+        return seen
+
+    assert asyncio.run(scenario()) == [0, 2, 4]
+
+
+def test_resize_up_runs_more_items_at_once():
+    async def scenario():
+        gate = Gate()
+        stage = Stage("generate", gate, workers=1, queue_size=3)
+        stage.start()
+        stage.resize(3)
+        for item in range(3):
+            await stage.queue.put(item)
+        await settle()
+        assert stage.busy == 3
+        assert len(running(stage)) == 3
+
+        gate.opened.set()
+        await stage.queue.join()
+        await stage.stop()
+
+    asyncio.run(scenario())
+
+
+def test_resize_down_retires_workers_after_their_current_item():
+    async def scenario():
+        gate = Gate()
+        stage = Stage("generate", gate, workers=3, queue_size=3)
+        stage.start()
+        for item in range(3):
+            await stage.queue.put(item)
+        await settle()
+
+        stage.resize(1)
+        # Nothing is interrupted mid-item
+        assert stage.busy == 3
+        assert len(running(stage)) == 3
+
+        gate.opened.set()
+        await stage.queue.join()
+        await settle()
+        assert stage.processed == 3
+        assert len(running(stage)) == 1
+        assert stage.workers == 1
+        await stage.stop()
+
+    asyncio.run(scenario())
+
+
+def test_resize_up_cancels_pending_retirements_first():
+    async def scenario():
+        gate = Gate()
+        stage = Stage("generate", gate, workers=3, queue_size=3)
+        stage.start()
+        for item in range(3):
+            await stage.queue.put(item)
+        await settle()
+
+        stage.resize(1)
+        stage.resize(2)
+        assert len(stage._tasks) == 3
+
+        gate.opened.set()
+        await stage.queue.join()
+        await settle()
+        assert len(running(stage)) == 2
+        await stage.stop()
+
+    asyncio.run(scenario())
+
+
+def test_items_can_join_part_way_through():
+    async def scenario():
+        seen = []
+
+        async def skipped(item):
+            seen.append(("skipped", item))
+            return item
+
+        async def record(item):
+            seen.append(("record", item))
+
+        pipeline = Pipeline([Stage("skipped", skipped), Stage("record", record)])
+        pipeline.start()
+        await pipeline.submit(1, stage="record")
+        await pipeline.join()
+        await pipeline.stop()
+        return seen
+
+    assert asyncio.run(scenario()) == [("record", 1)]
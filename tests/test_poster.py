@@ -0,0 +1,124 @@
+"""Like/repost fan-out and the action ledger, with fake accounts"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.account_providers import Account
+from src.config.schemas import BotAccount
+from src.tweeter import ActionLedger, TweeterClient
+
+
+class Conflict(Exception):
+    status_code = 409
+
+
+class FakeTweeter:
+    """Records likes and reposts, optionally blocking until released."""
+
+    def __init__(self, done, blocked=None, error=None):
+        self.done = done
+        self.blocked = blocked
+        self.error = error
+
+    def _act(self, action, post_id):
+        if self.blocked is not None:
+            self.blocked.wait()
+        if self.error is not None:
+            raise self.error
+        self.done.append(action)
+
+    def post_like(self, post_id):
+        self._act("like", post_id)
+
+    def post_repost(self, post_id):
+        self._act("repost", post_id)
+
+
+class FakeProvider:
+    def __init__(self, tweeters):
+        self.accounts = [
+            Account(
+                username=name,
+                bot=BotAccount(user_name=name, password="secret", display_name=name),
+                tweeter=tweeter,
+            )
+            for name, tweeter in tweeters.items()
+        ]
+
+    async def fanout_accounts(self):
+        return self.accounts
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "personas.db")
+
+
+def test_ledger_sees_actions_before_they_are_flushed(db_path):
+    ledger = ActionLedger(db_path, batch_size=100, flush_interval=3600)
+    ledger.record("alice", 1, "like")
+
+    assert ledger.has_performed("alice", 1, "like")
+    assert not ledger.has_performed("alice", 1, "repost")
+    assert ledger.get_performed(1) == {("alice", "like")}
+    assert ActionLedger(db_path).get_performed(1) == set()
+
+    ledger.close()
+    assert ActionLedger(db_path).get_performed(1) == {("alice", "like")}
+
+
+def test_ledger_flushes_once_the_batch_fills(db_path):
+    ledger = ActionLedger(db_path, batch_size=2, flush_interval=3600)
+    ledger.record("alice", 1, "like")
+    ledger.record("alice", 1, "like")
+    assert ActionLedger(db_path).get_performed(1) == set()
+
+    ledger.record("bob", 1, "like")
+    assert ActionLedger(db_path).get_performed(1) == {("alice", "like"), ("bob", "like")}
+    assert ledger.flush() == 0
+
+
+def test_actions_already_in_the_ledger_are_skipped(db_path):
+    alice_done, bob_done = [], []
+    provider = FakeProvider({"alice": FakeTweeter(alice_done), "bob": FakeTweeter(bob_done)})
+    ledger = ActionLedger(db_path)
+    ledger.record("alice", 1, "like")
+    client = TweeterClient(provider, action_ledger=ledger)
+
+    # bob wrote the post, so it only likes it
+    assert asyncio.run(client.like_and_retweet_with_all_accounts(1, "bob")) == 2
+    assert alice_done == ["repost"]
+    assert bob_done == ["like"]
+    assert ledger.get_performed(1) == {("alice", "like"), ("alice", "repost"), ("bob", "like")}
+
+
+def test_conflicts_are_recorded_as_already_done(db_path):
+    provider = FakeProvider({"alice": FakeTweeter([], error=Conflict("already liked"))})
+    ledger = ActionLedger(db_path)
+    client = TweeterClient(provider, action_ledger=ledger)
+
+    assert asyncio.run(client.like_and_retweet_with_all_accounts(1, "carol")) == 0
+    assert ActionLedger(db_path).get_performed(1) == {("alice", "like"), ("alice", "repost")}
+
+
+def test_actions_finished_before_the_fanout_timeout_are_recorded(db_path):
+    done = []
+    blocked = threading.Event()
+    provider = FakeProvider({"alice": FakeTweeter(done), "bob": FakeTweeter(done, blocked)})
+    ledger = ActionLedger(db_path, batch_size=100, flush_interval=3600)
+    client = TweeterClient(provider, action_ledger=ledger, fanout_timeout=0.2)
+
+    async def scenario():
+        try:
+            return await client.like_and_retweet_with_all_accounts(1, "carol")
+        finally:
+            # Let bob's threads finish so the loop can shut down
+            blocked.set()
+
+    assert asyncio.run(scenario()) == 2
+
+    # Flushed, so a restart skips them
+    performed = ActionLedger(db_path).get_performed(1)
+    assert performed == {("alice", "like"), ("alice", "repost")}
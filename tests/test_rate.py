@@ -0,0 +1,184 @@
+"""Token buckets, the per-account posting limit and rate-targeted posting"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.scheduling import AccountRateLimiter, PostRateController, TokenBucket
+from src.scheduling import rate
+
+
+class FakeClock:
+    """Stands in for the time module, moved on by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate, "time", clock)
+    monkeypatch.setattr(rate, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def test_bucket_starts_full_and_allows_a_burst(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    assert [bucket.try_consume() for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=0.5, capacity=2)
+    bucket.try_consume()
+    bucket.try_consume()
+    assert bucket.wait_time() == pytest.approx(2.0)
+
+    clock.now += 2.0
+    assert bucket.try_consume()
+    assert not bucket.try_consume()
+
+    clock.now += 100.0
+    bucket.wait_time()
+    assert bucket.tokens == 2
+
+
+def test_bucket_rate_change_keeps_its_tokens(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    bucket.try_consume()
+    bucket.try_consume()
+    bucket.try_consume()
+    clock.now += 1.0
+
+    bucket.update_rate(rate=0.5, capacity=2)
+    assert bucket.tokens == pytest.approx(1.0)
+    bucket.try_consume()
+    assert bucket.wait_time() == pytest.approx(2.0)
+
+
+def test_limiter_reports_exhausted_accounts(clock):
+    limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+    limiter.consume("alice")
+    limiter.consume("bob")
+    clock.now += 30
+    assert limiter.exhausted() == {"alice", "bob"}
+    clock.now += 30
+    assert limiter.exhausted() == set()
+
+
+def test_limiter_wait_ignores_accounts_with_tokens(clock):
+    limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+    limiter.consume("alice")
+    # Seen, with tokens left, but e.g. quarantined so it can't be leased
+    limiter._bucket("bob")
+    assert limiter.exhausted() == {"alice"}
+    assert limiter.wait_time() == pytest.approx(60.0)
+
+
+def test_limiter_wait_skips_excluded_accounts(clock):
+    limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+    limiter.consume("alice")
+    clock.now += 50
+    limiter.consume("bob")
+    assert limiter.wait_time() == pytest.approx(10.0)
+    assert limiter.wait_time(exclude={"alice"}) == pytest.approx(60.0)
+
+
+def test_limiter_overdraws_rather_than_refusing(clock):
+    limiter = AccountRateLimiter(rate=1 / 60, capacity=1)
+    limiter.consume("alice")
+    limiter.consume("alice")
+    assert limiter.wait_time() == pytest.approx(120.0)
+
+
+def take_turns(controller, turns):
+    async def scenario():
+        for _ in range(turns):
+            await controller.wait_turn()
+
+    asyncio.run(scenario())
+
+
+def test_controller_paces_posts_at_the_target_rate(clock):
+    controller = PostRateController(target_per_hour=60, max_per_hour=3600)
+    take_turns(controller, 3)
+    assert clock.slept == [pytest.approx(60.0), pytest.approx(60.0)]
+
+
+def test_controller_makes_up_at_most_a_burst_after_a_stall(clock):
+    controller = PostRateController(target_per_hour=60, max_per_hour=3600, burst=2)
+    take_turns(controller, 1)
+    clock.now += 1000
+
+    take_turns(controller, 2)
+    assert clock.slept == []
+    # Then back on the schedule, which the global limit briefly holds up
+    take_turns(controller, 2)
+    assert clock.slept == [pytest.approx(1.0), pytest.approx(59.0)]
+
+
+def test_controller_never_exceeds_the_global_limit(clock):
+    controller = PostRateController(target_per_hour=3600, max_per_hour=60, burst=1)
+    take_turns(controller, 2)
+    assert sum(clock.slept) == pytest.approx(60.0)
+
+
+def test_controller_rate_change_keeps_the_schedule(clock):
+    controller = PostRateController(target_per_hour=60, max_per_hour=3600)
+    take_turns(controller, 2)
+    controller.record_published()
+
+    controller.update_rates(target_per_hour=120, max_per_hour=3600, burst=3)
+    # The post already scheduled keeps its slot, later ones follow the new rate
+    take_turns(controller, 2)
+    assert clock.slept == [pytest.approx(60.0), pytest.approx(60.0), pytest.approx(30.0)]
+    assert controller.get_stats()["published_in_window"] == 1
+
+
+def test_controller_measures_the_achieved_rate(clock):
+    controller = PostRateController(target_per_hour=10, max_per_hour=60, window=3600)
+    for _ in range(3):
+        clock.now += 600
+        controller.record_published()
+    assert controller.achieved_per_hour() == pytest.approx(6.0)
+
+    clock.now += 3601
+    assert controller.achieved_per_hour() == 0.0
+
+
+class FakeStage:
+    def __init__(self, name, ewma_service, workers=1):
+        self.name = name
+        self.ewma_service = ewma_service
+        self.workers = workers
+
+    def resize(self, workers):
+        self.workers = workers
+
+
+def test_controller_sizes_stages_by_their_latency(clock):
+    controller = PostRateController(target_per_hour=360, max_per_hour=3600)
+    slow = FakeStage("generate", 20.0)
+    fast = FakeStage("post", 0.5, workers=3)
+    unmeasured = FakeStage("condense", 0.0, workers=2)
+    pipeline = SimpleNamespace(stages=[slow, fast, unmeasured])
+
+    controller.adapt_workers(pipeline, {"post": 2}, max_workers=8)
+    # 0.1 posts/s x 20s x 1.2 headroom
+    assert slow.workers == 3
+    assert fast.workers == 2
+    assert unmeasured.workers == 2
+
+    slow.ewma_service = 200.0
+    controller.adapt_workers(pipeline, {}, max_workers=8)
+    assert slow.workers == 8
@@ -0,0 +1,63 @@
+"""ArticleRanker picks over a throwaway NewsStore"""
+
+import asyncio
+
+import pytest
+
+from src.tweeter import ArticleRanker, NewsStore
+
+ARTICLES = [
+    ("https://x/post/1", "Castillo promises tax cuts and a tourism boom for Kingston"),
+    ("https://x/post/2", "Hawthorne backs carbon taxes and an offshore drilling ban"),
+    ("https://x/post/3", "Local bakery wins an award for its sourdough"),
+]
+
+
+@pytest.fixture
+def store(tmp_path) -> NewsStore:
+    store = NewsStore(db_path=str(tmp_path / "news.db"))
+    store.add_many(ARTICLES)
+    return store
+
+
+def make_ranker(store, top_k=1):
+    return ArticleRanker(store, topics=["Castillo tax cuts tourism"], dim=256, top_k=top_k)
+
+
+def test_most_relevant_article_is_picked(store):
+    assert make_ranker(store).pick().url == "https://x/post/1"
+
+
+def test_claimed_articles_are_skipped_until_released(store):
+    ranker = make_ranker(store)
+    best = ranker.pick()
+    assert store.claim(best.id)
+    assert ranker.pick().url != best.url
+
+    store.release(best.id)
+    assert ranker.pick().id == best.id
+
+
+def test_released_article_is_ranked_again_for_the_news_bot(store):
+    from src.bots import NewsBot
+
+    class FailingLLM:
+        async def invoke(self, messages):
+            raise RuntimeError("LLM down")
+
+    ranker = make_ranker(store)
+    bot = NewsBot(llm_provider=FailingLLM(), query_agent=None, news_store=store, ranker=ranker)
+    with pytest.raises(RuntimeError):
+        asyncio.run(bot.run_bot())
+    assert ranker.pick().url == "https://x/post/1"
+
+
+def test_used_articles_leave_the_index(store):
+    ranker = make_ranker(store, top_k=3)
+    picked = ranker.pick()
+    store.mark_used(picked.id)
+    ranker.discard(picked.id)
+
+    other = make_ranker(store, top_k=3)
+    for _ in range(10):
+        assert other.pick().id != picked.id
@@ -0,0 +1,88 @@
+"""Periodic jobs on the asyncio scheduler, with short real intervals"""
+
+import asyncio
+
+import pytest
+
+from src.scheduling.scheduler import Scheduler
+
+
+def test_jobs_run_side_by_side_until_stopped():
+    async def scenario():
+        scheduler = Scheduler()
+        ticks = {"fast": 0, "slow": 0}
+
+        async def fast():
+            ticks["fast"] += 1
+
+        async def slow():
+            ticks["slow"] += 1
+            await asyncio.sleep(0.05)
+
+        scheduler.add_job("fast", fast, interval=0.01)
+        scheduler.add_job("slow", slow, interval=1.0)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        assert not scheduler.running
+        # The slow job's run didn't hold the fast one up
+        assert ticks["slow"] == 1
+        assert ticks["fast"] >= 5
+
+        stopped_at = dict(ticks)
+        await asyncio.sleep(0.05)
+        assert ticks == stopped_at
+
+    asyncio.run(scenario())
+
+
+def test_failed_runs_wait_the_retry_delay_and_are_counted():
+    async def scenario():
+        scheduler = Scheduler()
+
+        async def broken():
+            raise RuntimeError("feed unavailable")
+
+        scheduler.add_job("poll", broken, interval=3600, retry_delay=0.01)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler.get_stats()["poll"]
+
+    stats = asyncio.run(scenario())
+    assert stats["runs"] > 1
+    assert stats["failures"] == stats["runs"]
+    assert stats["last_error"] == "feed unavailable"
+
+
+def test_jobs_added_while_running_start_after_their_initial_delay():
+    async def scenario():
+        scheduler = Scheduler()
+        ran = asyncio.Event()
+
+        async def idle():
+            pass
+
+        async def job():
+            ran.set()
+
+        scheduler.add_job("idle", idle, interval=3600)
+        scheduler.start()
+        scheduler.add_job("late", job, interval=3600, initial_delay=0.05)
+        await asyncio.sleep(0.02)
+        assert not ran.is_set()
+        await asyncio.wait_for(ran.wait(), timeout=1)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_job_names_are_unique():
+    async def job():
+        pass
+
+    scheduler = Scheduler()
+    scheduler.add_job("poll", job, interval=1)
+    with pytest.raises(ValueError, match="already scheduled"):
+        scheduler.add_job("poll", job, interval=1)
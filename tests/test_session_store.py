@@ -0,0 +1,54 @@
+"""Encrypted session storage, with the key file in a temporary directory"""
+
+import sqlite3
+import stat
+
+import pytest
+
+from src.account_providers import SessionStore
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    monkeypatch.delenv("SESSION_KEY", raising=False)
+
+    def make(key_name=".session_key") -> SessionStore:
+        return SessionStore(str(tmp_path / "personas.db"), str(tmp_path / key_name))
+
+    return make
+
+
+def test_sessions_survive_a_restart_encrypted_at_rest(tmp_path, make_store):
+    make_store().save("alice", "secret-token", "Bearer", 1234)
+
+    session = make_store().load("alice")
+    assert (session.token, session.token_type, session.expires_at) == ("secret-token", "Bearer", 1234)
+    raw = sqlite3.connect(tmp_path / "personas.db").execute("SELECT token FROM sessions").fetchone()
+    assert b"secret-token" not in raw[0]
+
+
+def test_generated_key_is_private_to_the_user(tmp_path, make_store):
+    make_store()
+
+    mode = (tmp_path / ".session_key").stat().st_mode
+    assert stat.S_IMODE(mode) == 0o600
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith(".session_key")] == [
+        ".session_key"
+    ]
+
+
+def test_session_written_under_another_key_is_discarded(make_store):
+    make_store().save("alice", "secret-token", None, None)
+
+    store = make_store(".other_key")
+    assert store.load("alice") is None
+    # Dropped, so the original key can't bring it back either
+    assert make_store().load("alice") is None
+
+
+def test_deleted_session_is_gone(make_store):
+    store = make_store()
+    store.save("alice", "secret-token", None, None)
+    store.delete("alice")
+
+    assert store.load("alice") is None
@@ -0,0 +1,51 @@
+"""Splitting accounts and API keys between supervised worker processes"""
+
+import asyncio
+
+import pytest
+
+from src.account_providers import AccountProvider
+from src.config.schemas import BotAccount
+from src.providers.key_usage import KeyUsageStore
+
+BOTS = tuple(
+    BotAccount(user_name=name, password="secret", display_name=name)
+    for name in ["alice", "bob", "carol", "dave", "erin"]
+)
+
+
+def start_shard(shard_index: int, shard_count: int, bots=BOTS) -> AccountProvider:
+    provider = AccountProvider(
+        bots, invite_code="invite", shard_index=shard_index, shard_count=shard_count
+    )
+
+    async def login(bot, invite_code):
+        return object()
+
+    provider._login_bot = login
+    asyncio.run(provider.initialize())
+    return provider
+
+
+def test_each_account_belongs_to_exactly_one_shard():
+    shards = [start_shard(index, 2) for index in range(2)]
+
+    owned = [[account.username for account in shard._accounts] for shard in shards]
+    assert owned == [["alice", "carol", "erin"], ["bob", "dave"]]
+
+
+def test_shard_without_accounts_fails_to_start():
+    with pytest.raises(ValueError, match="No bot accounts left for shard 2"):
+        start_shard(2, 3, bots=BOTS[:2])
+
+
+def test_workers_balance_one_set_of_api_keys(tmp_path):
+    db_path = str(tmp_path / "personas.db")
+    first, second = KeyUsageStore(db_path), KeyUsageStore(db_path)
+    keys = ["key-a", "key-b"]
+
+    picked = [store.acquire(keys, max_usage=2) for store in (first, second, first, second)]
+    assert sorted(picked) == ["key-a", "key-a", "key-b", "key-b"]
+    # Every key is at its limit, so the counts start over
+    assert second.acquire(keys, max_usage=2) in keys
+    assert first.acquire([], max_usage=2) is None
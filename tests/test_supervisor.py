@@ -0,0 +1,25 @@
+"""Supervisor restarts, with real worker processes"""
+
+import sys
+
+from src.scheduling import Supervisor
+
+
+def crash(index, count):
+    sys.exit(3)
+
+
+def finish(index, count):
+    pass
+
+
+def test_workers_that_exit_cleanly_end_the_run():
+    supervisor = Supervisor(finish, workers=2)
+    assert supervisor.run() == 0
+    assert all(stats["restarts"] == 0 for stats in supervisor.get_stats().values())
+
+
+def test_gives_up_on_a_worker_that_keeps_crashing_at_startup():
+    supervisor = Supervisor(crash, workers=1, restart_backoff=0, max_fast_failures=2)
+    assert supervisor.run() == 1
+    assert supervisor.get_stats()[0]["restarts"] == 1
@@ -0,0 +1,70 @@
+"""LLM self-test at startup, cached in sqlite between restarts"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.providers.warmup import LLMWarmup
+
+
+class FakeProvider:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.invocations = 0
+
+    async def warm_up(self):
+        pass
+
+    async def health_check(self):
+        return self.healthy
+
+    async def invoke(self, messages):
+        self.invocations += 1
+        return "Hello there, nice to meet"
+
+
+@pytest.fixture
+def make_warmup(tmp_path):
+    warmups = []
+
+    def make(provider, **kwargs) -> LLMWarmup:
+        warmup = LLMWarmup(provider, "fake:model", db_path=str(tmp_path / "warmup.db"), **kwargs)
+        warmups.append(warmup)
+        return warmup
+
+    yield make
+    for warmup in warmups:
+        warmup.close()
+
+
+def test_cached_pass_still_needs_healthy_keys(make_warmup):
+    asyncio.run(make_warmup(FakeProvider()).run())
+
+    warmup = make_warmup(FakeProvider(healthy=False))
+    with pytest.raises(RuntimeError, match="no healthy API keys"):
+        asyncio.run(warmup.run())
+    assert not warmup.ready
+
+
+def test_recent_pass_skips_the_generation(make_warmup):
+    asyncio.run(make_warmup(FakeProvider()).run())
+
+    provider = FakeProvider()
+    warmup = make_warmup(provider)
+    asyncio.run(warmup.run())
+    assert warmup.ready
+    assert provider.invocations == 0
+
+
+def test_expired_pass_runs_the_generation_again(make_warmup, monkeypatch):
+    asyncio.run(make_warmup(FakeProvider(), ttl=60).run())
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    provider = FakeProvider()
+    warmup = make_warmup(provider, ttl=60)
+    asyncio.run(warmup.run())
+    assert warmup.ready
+    assert provider.invocations == 1
+    assert warmup.last_latency is not None